@@ -14,6 +14,7 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 from django.core.asgi import get_asgi_application
 
 from pars_vid_bir.routing import websocket_urlpatterns
+from video_merge.presentation.middleware import MultipartUploadLimit
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pars_vid_bir.settings')
 
@@ -21,7 +22,7 @@ django_asgi_application = get_asgi_application()
 
 application = ProtocolTypeRouter(
     {
-        "http": django_asgi_application,
+        "http": MultipartUploadLimit(django_asgi_application),
         "websocket": AuthMiddlewareStack(URLRouter(websocket_urlpatterns)),
     }
 )
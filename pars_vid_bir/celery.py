@@ -1,12 +1,63 @@
 from __future__ import annotations
 
+import logging
 import os
 
 from celery import Celery
+from celery.exceptions import WorkerShutdown
+from celery.signals import before_task_publish, worker_init, worker_process_init, worker_process_shutdown
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pars_vid_bir.settings")
 
+logger = logging.getLogger(__name__)
+
 app = Celery("pars_vid_bir")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
+
+@worker_init.connect
+def warm_up_worker(**kwargs) -> None:
+    # Runs in the main worker process before the pool starts. Signal dispatch swallows ordinary
+    # exceptions, so an unusable ffmpeg is turned into WorkerShutdown (a SystemExit) to stop boot.
+    from video_merge.domain.exceptions import FFmpegUnavailableError
+    from video_merge.infrastructure.container import warm_up_worker_container
+
+    try:
+        warm_up_worker_container()
+    except FFmpegUnavailableError as exc:
+        logger.critical("Worker baslatilamadi: %s", exc)
+        raise WorkerShutdown(1) from exc
+
+
+@worker_process_init.connect
+def warm_up_worker_process(**kwargs) -> None:
+    # Each forked pool process builds its own bundle; the ffmpeg probe result is inherited.
+    from video_merge.infrastructure.container import warm_up_worker_container
+
+    warm_up_worker_container()
+
+
+@worker_process_shutdown.connect
+def flush_worker_events(**kwargs) -> None:
+    # Status events are buffered per process; send the last ones before the process exits.
+    from video_merge.infrastructure.event_publisher import close_event_publisher
+
+    close_event_publisher()
+
+
+@worker_process_shutdown.connect
+def flush_worker_spans(**kwargs) -> None:
+    from video_merge.infrastructure.tracing import flush_spans
+
+    flush_spans()
+
+
+@before_task_publish.connect
+def inject_trace_context(headers=None, **kwargs) -> None:
+    # The consumer side (TracedTask) reads this header and parents the task span on the publisher.
+    from video_merge.infrastructure.tracing import TRACEPARENT_HEADER, current_traceparent
+
+    traceparent = current_traceparent()
+    if headers is not None and traceparent:
+        headers[TRACEPARENT_HEADER] = traceparent
@@ -5,5 +5,8 @@ def feature_flags(request):  # noqa: ARG001
     return {
         "REALTIME_UPDATES_ENABLED": settings.REALTIME_UPDATES_ENABLED,
         "USE_REDIS": settings.USE_REDIS,
+        "CHUNKED_UPLOAD_ENABLED": settings.CHUNKED_UPLOAD_ENABLED,
+        "CHUNKED_UPLOAD_PARALLELISM": settings.CHUNKED_UPLOAD_PARALLELISM,
+        "CHUNKED_UPLOAD_CHUNK_SIZE": settings.CHUNKED_UPLOAD_CHUNK_SIZE,
     }
 
@@ -57,6 +57,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'video_merge.presentation.middleware.TracingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -140,16 +141,43 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# "" streams downloads through Django; "x-accel-redirect" (nginx) or "x-sendfile"
+# (Apache/lighttpd) hands the transfer to the front proxy after the permission check.
+DOWNLOAD_OFFLOAD_MODE = os.getenv('DOWNLOAD_OFFLOAD_MODE', '')
+DOWNLOAD_ACCEL_REDIRECT_PREFIX = os.getenv('DOWNLOAD_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'video_merge:dashboard'
 LOGOUT_REDIRECT_URL = 'login'
 
 FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+FFPROBE_BINARY = os.getenv('FFPROBE_BINARY', 'ffprobe')
+FFMPEG_NORMALIZE_WORKERS = int(os.getenv('FFMPEG_NORMALIZE_WORKERS', str(os.cpu_count() or 2)))
+FFMPEG_LOG_DIR = os.getenv('FFMPEG_LOG_DIR', '')
+MERGE_PROGRESS_INTERVAL_SECONDS = float(os.getenv('MERGE_PROGRESS_INTERVAL_SECONDS', '1.0'))
+MERGE_OUTPUT_CACHE_ENABLED = os.getenv('MERGE_OUTPUT_CACHE_ENABLED', '1') == '1'
+MERGE_OUTPUT_CACHE_MAX_BYTES = int(os.getenv('MERGE_OUTPUT_CACHE_MAX_BYTES', str(50 * 1024 ** 3)))
+MERGE_BATCH_MAX_JOBS = int(os.getenv('MERGE_BATCH_MAX_JOBS', '100'))
+# Jobs whose clips add up to at least this many bytes go to the bulk queue.
+MERGE_BULK_THRESHOLD_BYTES = int(os.getenv('MERGE_BULK_THRESHOLD_BYTES', str(2 * 1024 ** 3)))
+MERGE_FAST_QUEUE = os.getenv('MERGE_FAST_QUEUE', 'merge_fast')
+MERGE_BULK_QUEUE = os.getenv('MERGE_BULK_QUEUE', 'merge_bulk')
+MERGE_MAX_RUNNING_PER_USER = int(os.getenv('MERGE_MAX_RUNNING_PER_USER', '2')) or None
+MERGE_USER_SLOT_RETRY_SECONDS = int(os.getenv('MERGE_USER_SLOT_RETRY_SECONDS', '15'))
+# About a day of waiting for a free slot; after that the job is failed instead of retried forever.
+MERGE_USER_SLOT_MAX_RETRIES = int(
+    os.getenv('MERGE_USER_SLOT_MAX_RETRIES', str(24 * 3600 // max(1, MERGE_USER_SLOT_RETRY_SECONDS)))
+)
+# Jobs with more clips than this are merged as ranges of this many clips on separate workers (0 = never split).
+MERGE_SPLIT_RANGE_CLIPS = int(os.getenv('MERGE_SPLIT_RANGE_CLIPS', '40')) or None
 
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TASK_TRACK_STARTED = True
+CELERY_TASK_DEFAULT_QUEUE = MERGE_FAST_QUEUE
+# A long bulk merge must not hold prefetched fast jobs hostage in the same worker.
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
 CELERY_TASK_TIME_LIMIT = int(os.getenv("CELERY_TASK_TIME_LIMIT", "7200"))
 CELERY_TASK_SOFT_TIME_LIMIT = int(os.getenv("CELERY_TASK_SOFT_TIME_LIMIT", "6900"))
 CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "1" if not USE_REDIS else "0") == "1"
@@ -163,6 +191,15 @@ else:
     CELERY_RESULT_BACKEND = "cache+memory://"
 
 REALTIME_UPDATES_ENABLED = os.getenv("REALTIME_UPDATES_ENABLED", "1" if USE_REDIS else "0") == "1"
+# Job events are buffered per process and sent at most this often, newest event per job only.
+REALTIME_EVENT_FLUSH_SECONDS = float(os.getenv("REALTIME_EVENT_FLUSH_SECONDS", "0.25"))
+
+# Spans are appended to this file as OTLP/JSON lines; empty disables tracing.
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+TRACE_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "pars-vid-bir")
+
+# When set, /metrics requires "Authorization: Bearer <token>"; it only exposes aggregate job counts.
+METRICS_BEARER_TOKEN = os.getenv("METRICS_BEARER_TOKEN", "")
 
 default_channels_backend = "inmemory"
 if USE_REDIS and REALTIME_UPDATES_ENABLED and "test" not in sys.argv:
@@ -188,6 +225,25 @@ else:
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024 * 1024
 FILE_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024
+# Under ASGI Django spools the request body to a temp file above FILE_UPLOAD_MAX_MEMORY_SIZE before the upload
+# handlers see it; capping multipart uploads at that size keeps the form path to a single disk write.
+MULTIPART_UPLOAD_MAX_BYTES = int(os.getenv("MULTIPART_UPLOAD_MAX_BYTES", str(FILE_UPLOAD_MAX_MEMORY_SIZE)))
+CHUNKED_UPLOAD_ENABLED = os.getenv("CHUNKED_UPLOAD_ENABLED", "1") == "1"
+CHUNKED_UPLOAD_PARALLELISM = int(os.getenv("CHUNKED_UPLOAD_PARALLELISM", "3"))
+CHUNKED_UPLOAD_CHUNK_SIZE = int(os.getenv("CHUNKED_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+CHUNKED_UPLOAD_WRITE_LEASE_SECONDS = float(os.getenv("CHUNKED_UPLOAD_WRITE_LEASE_SECONDS", "300"))
+CHUNKED_UPLOAD_EXPIRE_SECONDS = float(os.getenv("CHUNKED_UPLOAD_EXPIRE_SECONDS", str(24 * 3600)))
+CHUNKED_UPLOAD_SWEEP_INTERVAL_SECONDS = float(os.getenv("CHUNKED_UPLOAD_SWEEP_INTERVAL_SECONDS", "3600"))
+CELERY_BEAT_SCHEDULE = {
+    "sweep-expired-uploads": {
+        "task": "video_merge.sweep_expired_uploads",
+        "schedule": CHUNKED_UPLOAD_SWEEP_INTERVAL_SECONDS,
+    },
+}
+FILE_UPLOAD_HANDLERS = [
+    "video_merge.infrastructure.upload_handlers.HashingMemoryFileUploadHandler",
+    "video_merge.infrastructure.upload_handlers.StagingTemporaryFileUploadHandler",
+]
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
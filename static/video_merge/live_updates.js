@@ -42,6 +42,72 @@
         return value.slice(0, maxLength - 3) + "...";
     }
 
+    function formatDuration(totalSeconds) {
+        var seconds = Math.max(0, Math.round(Number(totalSeconds) || 0));
+        var hours = Math.floor(seconds / 3600);
+        var minutes = Math.floor((seconds % 3600) / 60);
+        var rest = seconds % 60;
+        var parts = [];
+        if (hours > 0) {
+            parts.push(hours + "s");
+        }
+        if (hours > 0 || minutes > 0) {
+            parts.push(minutes + "dk");
+        }
+        parts.push(rest + "sn");
+        return parts.join(" ");
+    }
+
+    function progressText(payload) {
+        var parts = [];
+        if (payload.percent !== null && payload.percent !== undefined) {
+            parts.push("%" + Number(payload.percent).toFixed(1));
+        } else {
+            parts.push(formatDuration(payload.out_time_seconds) + " islendi");
+        }
+        if (payload.speed) {
+            parts.push(Number(payload.speed).toFixed(1) + "x");
+        }
+        if (payload.eta_seconds !== null && payload.eta_seconds !== undefined) {
+            parts.push("Kalan: " + formatDuration(payload.eta_seconds));
+        }
+        return parts.join(" | ");
+    }
+
+    function updateProgress(payload) {
+        var text = progressText(payload);
+        var hasPercent = payload.percent !== null && payload.percent !== undefined;
+        var targets = document.querySelectorAll(
+            '[data-job-card-id="' + payload.job_id + '"], [data-job-detail-id="' + payload.job_id + '"]'
+        );
+
+        Array.prototype.forEach.call(targets, function (root) {
+            setStatusBadge(root.querySelector("[data-job-status]"), payload.status);
+
+            var textElement = root.querySelector("[data-job-progress-text]");
+            if (textElement) {
+                textElement.textContent = text;
+            }
+            setHidden(textElement, false);
+
+            var barElement = root.querySelector("[data-job-progress-bar]");
+            if (barElement && hasPercent) {
+                barElement.value = Number(payload.percent);
+            }
+            setHidden(barElement, !hasPercent);
+        });
+    }
+
+    function clearProgress(payload) {
+        var targets = document.querySelectorAll(
+            '[data-job-card-id="' + payload.job_id + '"], [data-job-detail-id="' + payload.job_id + '"]'
+        );
+        Array.prototype.forEach.call(targets, function (root) {
+            setHidden(root.querySelector("[data-job-progress-text]"), true);
+            setHidden(root.querySelector("[data-job-progress-bar]"), true);
+        });
+    }
+
     function updateDashboardCard(payload) {
         var card = document.querySelector('[data-job-card-id="' + payload.job_id + '"]');
         if (!card) {
@@ -94,6 +160,13 @@
         if (!payload || !payload.job_id) {
             return;
         }
+        if (payload.event === "progress") {
+            updateProgress(payload);
+            return;
+        }
+        if (payload.status !== "running") {
+            clearProgress(payload);
+        }
         updateDashboardCard(payload);
         updateJobDetail(payload);
     }
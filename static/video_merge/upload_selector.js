@@ -408,8 +408,241 @@
         });
     });
 
-    form.addEventListener("submit", function () {
+    var chunkedJobUrl = form.getAttribute("data-chunked-upload-url");
+    var uploadParallelism = Math.max(1, Number(form.getAttribute("data-upload-parallelism")) || 3);
+    var uploadChunkSize = Math.max(256 * 1024, Number(form.getAttribute("data-upload-chunk-size")) || 8 * 1024 * 1024);
+    var maxChunkRetries = 8;
+    var isUploading = false;
+
+    function csrfToken() {
+        var input = form.querySelector("input[name='csrfmiddlewaretoken']");
+        return input ? input.value : "";
+    }
+
+    function wait(ms) {
+        return new Promise(function (resolve) {
+            window.setTimeout(resolve, ms);
+        });
+    }
+
+    function encodeMetadataValue(value) {
+        var bytes = new TextEncoder().encode(String(value));
+        var binary = "";
+        bytes.forEach(function (byte) {
+            binary += String.fromCharCode(byte);
+        });
+        return window.btoa(binary);
+    }
+
+    function uploadMetadata(values) {
+        return Object.keys(values).map(function (key) {
+            return key + " " + encodeMetadataValue(values[key]);
+        }).join(",");
+    }
+
+    function readError(response) {
+        return response.json()
+            .then(function (data) {
+                return data.error || ("HTTP " + response.status);
+            })
+            .catch(function () {
+                return "HTTP " + response.status;
+            });
+    }
+
+    function createUpload(jobInfo, file, order) {
+        return fetch(jobInfo.uploads_url, {
+            method: "POST",
+            credentials: "same-origin",
+            headers: {
+                "X-CSRFToken": csrfToken(),
+                "Tus-Resumable": "1.0.0",
+                "Upload-Length": String(file.size),
+                "Upload-Metadata": uploadMetadata({ job_id: jobInfo.job_id, order: order, filename: file.name })
+            }
+        }).then(function (response) {
+            if (response.status !== 201) {
+                return readError(response).then(function (message) {
+                    throw new Error(file.name + ": " + message);
+                });
+            }
+            return response.headers.get("Location");
+        });
+    }
+
+    function fetchOffset(uploadUrl) {
+        return fetch(uploadUrl, {
+            method: "HEAD",
+            credentials: "same-origin",
+            headers: { "Tus-Resumable": "1.0.0" }
+        }).then(function (response) {
+            if (!response.ok) {
+                throw new Error("HTTP " + response.status);
+            }
+            return Number(response.headers.get("Upload-Offset"));
+        });
+    }
+
+    function sendChunks(uploadUrl, file, offset, onProgress, attempt) {
+        if (offset >= file.size) {
+            return Promise.resolve();
+        }
+
+        return fetch(uploadUrl, {
+            method: "PATCH",
+            credentials: "same-origin",
+            headers: {
+                "X-CSRFToken": csrfToken(),
+                "Tus-Resumable": "1.0.0",
+                "Upload-Offset": String(offset),
+                "Content-Type": "application/offset+octet-stream"
+            },
+            body: file.slice(offset, Math.min(offset + uploadChunkSize, file.size))
+        }).then(function (response) {
+            if (response.status === 204) {
+                var nextOffset = Number(response.headers.get("Upload-Offset"));
+                onProgress(nextOffset);
+                return sendChunks(uploadUrl, file, nextOffset, onProgress, 0);
+            }
+            if (response.status === 409 || response.status >= 500) {
+                throw new Error("HTTP " + response.status);
+            }
+            return readError(response).then(function (message) {
+                var fatal = new Error(file.name + ": " + message);
+                fatal.fatal = true;
+                throw fatal;
+            });
+        }).catch(function (error) {
+            if (error.fatal || attempt >= maxChunkRetries) {
+                throw error;
+            }
+            // Connection dropped or offset conflict: ask the server where to resume.
+            return wait(Math.min(30000, 1000 * Math.pow(2, attempt)))
+                .then(function () {
+                    return fetchOffset(uploadUrl);
+                })
+                .then(function (serverOffset) {
+                    onProgress(serverOffset);
+                    return sendChunks(uploadUrl, file, serverOffset, onProgress, attempt + 1);
+                }, function () {
+                    return sendChunks(uploadUrl, file, offset, onProgress, attempt + 1);
+                });
+        });
+    }
+
+    function runWithParallelism(tasks, limit) {
+        var nextIndex = 0;
+
+        function worker() {
+            if (nextIndex >= tasks.length) {
+                return Promise.resolve();
+            }
+            var task = tasks[nextIndex];
+            nextIndex += 1;
+            return task().then(worker);
+        }
+
+        var workers = [];
+        for (var index = 0; index < Math.min(limit, tasks.length); index += 1) {
+            workers.push(worker());
+        }
+        return Promise.all(workers);
+    }
+
+    function uploadInChunks() {
+        var files = selectedFiles.slice();
+        var totalBytes = files.reduce(function (sum, file) {
+            return sum + file.size;
+        }, 0);
+        var uploadedByIndex = files.map(function () {
+            return 0;
+        });
+        var completedCount = 0;
+
+        function renderUploadProgress() {
+            var uploaded = uploadedByIndex.reduce(function (sum, value) {
+                return sum + value;
+            }, 0);
+            var percent = totalBytes > 0 ? Math.floor((uploaded / totalBytes) * 100) : 100;
+            fileCount.textContent = "Yukleniyor: %" + percent + " (" + completedCount + "/" + files.length + " dosya)";
+        }
+
+        var body = new FormData();
+        body.append("name", (form.querySelector("input[name='name']") || {}).value || "");
+        body.append("output_mode", (form.querySelector("select[name='output_mode']") || {}).value || "");
+
+        return fetch(chunkedJobUrl, {
+            method: "POST",
+            credentials: "same-origin",
+            headers: { "X-CSRFToken": csrfToken() },
+            body: body
+        }).then(function (response) {
+            if (response.status !== 201) {
+                return readError(response).then(function (message) {
+                    throw new Error(message);
+                });
+            }
+            return response.json();
+        }).then(function (jobInfo) {
+            renderUploadProgress();
+            var tasks = files.map(function (file, index) {
+                return function () {
+                    return createUpload(jobInfo, file, index + 1).then(function (uploadUrl) {
+                        return sendChunks(uploadUrl, file, 0, function (offset) {
+                            uploadedByIndex[index] = offset;
+                            renderUploadProgress();
+                        }, 0);
+                    }).then(function () {
+                        completedCount += 1;
+                        renderUploadProgress();
+                    });
+                };
+            });
+
+            return runWithParallelism(tasks, uploadParallelism).then(function () {
+                return fetch(jobInfo.finalize_url, {
+                    method: "POST",
+                    credentials: "same-origin",
+                    headers: { "X-CSRFToken": csrfToken() }
+                });
+            });
+        }).then(function (response) {
+            if (!response.ok) {
+                return readError(response).then(function (message) {
+                    throw new Error(message);
+                });
+            }
+            return response.json();
+        }).then(function (result) {
+            window.location.assign(result.redirect_url);
+        });
+    }
+
+    form.addEventListener("submit", function (event) {
         syncInputFiles();
+
+        if (!chunkedJobUrl || typeof window.fetch !== "function" || selectedFiles.length === 0) {
+            return;
+        }
+
+        event.preventDefault();
+        if (isUploading) {
+            return;
+        }
+
+        isUploading = true;
+        var submitButton = form.querySelector("button[type='submit']");
+        if (submitButton) {
+            submitButton.disabled = true;
+        }
+
+        uploadInChunks().catch(function (error) {
+            isUploading = false;
+            if (submitButton) {
+                submitButton.disabled = false;
+            }
+            fileCount.textContent = "Yukleme basarisiz: " + error.message;
+        });
     });
 
     if (nativeInputWrapper) {
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from video_merge.models import MergeClip, MergeJob
+from video_merge.models import ClipBlob, MergeClip, MergeJob
 
 
 class MergeClipInline(admin.TabularInline):
@@ -16,3 +16,10 @@ class MergeJobAdmin(admin.ModelAdmin):
     search_fields = ("name", "owner__username", "id")
     readonly_fields = ("id", "created_at", "updated_at")
     inlines = [MergeClipInline]
+
+
+@admin.register(ClipBlob)
+class ClipBlobAdmin(admin.ModelAdmin):
+    list_display = ("sha256", "size", "created_at")
+    search_fields = ("sha256",)
+    readonly_fields = ("sha256", "file", "size", "created_at")
@@ -1,48 +1,289 @@
 from __future__ import annotations
 
+import hashlib
+import shutil
+import time
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from uuid import UUID
+from typing import AsyncIterator, Iterator
+from uuid import UUID, uuid4
 
 from video_merge.domain.constants import SUPPORTED_VIDEO_EXTENSIONS
-from video_merge.domain.entities import JobStatus, MergeJob
-from video_merge.domain.exceptions import InvalidInputError, JobNotFoundError, QueueUnavailableError
-from video_merge.domain.interfaces import MergeJobQueue, MergeJobRepository, VideoMerger
+from video_merge.domain.entities import (
+    ClipRange,
+    ClipUploadSession,
+    JobLane,
+    JobMetrics,
+    JobPage,
+    JobStatus,
+    MergeJob,
+    MergeJobDraft,
+    MergeProgress,
+    OutputMode,
+    QueuedJob,
+    VideoClip,
+)
+from video_merge.domain.exceptions import (
+    InvalidInputError,
+    JobNotFoundError,
+    QueueUnavailableError,
+    StaleTaskError,
+    UserConcurrencyLimitError,
+)
+from video_merge.domain.interfaces import (
+    ClipUploadStore,
+    MergeJobQueue,
+    MergeJobRepository,
+    MergeOutputCache,
+    ProgressCallback,
+    VideoMerger,
+)
+
+
+def merge_cache_key(clips: list[VideoClip], merger_fingerprint: str, output_suffix: str) -> str | None:
+    """Digest of the ordered clip contents plus merge settings; None when a clip has no content hash."""
+    if not clips or any(not clip.content_hash for clip in clips):
+        return None
+
+    hasher = hashlib.sha256()
+    hasher.update(f"{merger_fingerprint}|{output_suffix}".encode())
+    for clip in clips:
+        hasher.update(b"|")
+        hasher.update(clip.content_hash.encode())
+    return hasher.hexdigest()
+
+
+def split_clip_ranges(clips: list[VideoClip], range_size: int) -> list[ClipRange]:
+    return [
+        ClipRange(first_order=chunk[0].order, last_order=chunk[-1].order)
+        for chunk in (clips[start : start + range_size] for start in range(0, len(clips), range_size))
+    ]
+
+
+def split_part_path(owner_id: int, job_id: UUID, clip_range: ClipRange, content_key: str | None) -> Path:
+    """Where a range's partial output lives; the content key makes a finished part reusable on retry."""
+    name = f"{clip_range.first_order:05d}-{clip_range.last_order:05d}"
+    if content_key:
+        name = f"{name}-{content_key[:16]}"
+    return Path("merged_outputs") / f"user_{owner_id}" / f"{job_id}_parts" / f"{name}.mp4"
+
+
+def output_size_bytes(output_path: Path) -> int:
+    """Bytes on disk of a merged output; an HLS playlist counts with every segment beside it."""
+    if output_path.suffix == ".m3u8":
+        return sum(path.stat().st_size for path in output_path.parent.iterdir() if path.is_file())
+    return output_path.stat().st_size if output_path.exists() else 0
+
+
+@contextmanager
+def _merge_window(repository: MergeJobRepository, job_id: UUID) -> Iterator[None]:
+    # Recorded for failed merges too, so a slow ffmpeg run that ends in an error still shows up.
+    started_at = datetime.now(timezone.utc)
+    try:
+        yield
+    finally:
+        repository.record_merge_window(job_id, started_at, datetime.now(timezone.utc))
+
+
+def _complete_job(
+    repository: MergeJobRepository,
+    owner_id: int,
+    job_id: UUID,
+    output_relative: Path,
+    clips: list[VideoClip],
+    media_root: Path,
+) -> MergeJob:
+    repository.set_output_file(
+        job_id,
+        output_relative.as_posix(),
+        merged_through_order=clips[-1].order,
+        output_bytes=output_size_bytes(media_root / output_relative),
+    )
+    repository.set_status(job_id, JobStatus.COMPLETED, error_message="")
+
+    completed_job = repository.get_user_job(owner_id, job_id, include_clips=True)
+    if completed_job is None:
+        raise JobNotFoundError("Islem tamamlandi ancak kayit bulunamadi.")
+    return completed_job
+
+
+def _require_current_task(repository: MergeJobRepository, owner_id: int, job_id: UUID, task_id: str) -> MergeJob:
+    job = repository.get_user_job(owner_id, job_id, include_clips=False)
+    if job is None:
+        raise JobNotFoundError("Is bulunamadi.")
+    if job.status != JobStatus.RUNNING or job.task_id != task_id:
+        raise StaleTaskError(f"Gorev {task_id} artik bu isin guncel gorevi degil.")
+    return job
+
+
+class ThrottledProgressReporter:
+    """Forwards merge progress at most once per interval, always letting completion through."""
+
+    def __init__(self, callback: ProgressCallback, min_interval_seconds: float = 1.0) -> None:
+        self._callback = callback
+        self._min_interval = min_interval_seconds
+        self._last_sent_at: float | None = None
+
+    def __call__(self, progress: MergeProgress) -> None:
+        now = time.monotonic()
+        is_final = progress.percent is not None and progress.percent >= 100
+        if not is_final and self._last_sent_at is not None and now - self._last_sent_at < self._min_interval:
+            return
+
+        self._last_sent_at = now
+        self._callback(progress)
+
+
+def select_lane(total_bytes: int, bulk_threshold_bytes: int | None) -> JobLane:
+    """Stored clip bytes are the cost estimate: big merges go to the bulk lane so short ones never wait behind them."""
+    if bulk_threshold_bytes is not None and total_bytes >= bulk_threshold_bytes:
+        return JobLane.BULK
+    return JobLane.FAST
+
+
+def _normalize_job_name(name: str) -> str:
+    normalized_name = name.strip() if name else ""
+    return normalized_name or "Video Birlestirme"
+
+
+def _validate_extension(filename: str) -> None:
+    extension = Path(filename).suffix.lower()
+    if extension not in SUPPORTED_VIDEO_EXTENSIONS:
+        raise InvalidInputError(f"Desteklenmeyen dosya uzantisi: {extension}")
+
+
+def _validate_uploaded_files(uploaded_files: list[object]) -> list[tuple[object, str]]:
+    if not uploaded_files:
+        raise InvalidInputError("En az bir video dosyasi yuklenmelidir.")
+
+    validated_files: list[tuple[object, str]] = []
+    for index, uploaded_file in enumerate(uploaded_files, start=1):
+        filename = getattr(uploaded_file, "name", f"clip_{index}.mp4")
+        _validate_extension(filename)
+        validated_files.append((uploaded_file, filename))
+    return validated_files
 
 
 class CreateMergeJobUseCase:
     def __init__(self, repository: MergeJobRepository) -> None:
         self._repository = repository
 
-    def execute(self, owner_id: int, name: str, uploaded_files: list[object]) -> MergeJob:
-        if not uploaded_files:
-            raise InvalidInputError("En az bir video dosyasi yuklenmelidir.")
+    def execute(
+        self,
+        owner_id: int,
+        name: str,
+        uploaded_files: list[object],
+        output_mode: OutputMode = OutputMode.MP4,
+    ) -> MergeJob:
+        validated_files = _validate_uploaded_files(uploaded_files)
 
-        normalized_name = name.strip() if name else ""
-        if not normalized_name:
-            normalized_name = "Video Birlestirme"
+        job = self._repository.create_job(
+            owner_id=owner_id,
+            name=_normalize_job_name(name),
+            output_mode=output_mode,
+        )
 
-        validated_files: list[tuple[object, str]] = []
-        for index, uploaded_file in enumerate(uploaded_files, start=1):
-            filename = getattr(uploaded_file, "name", f"clip_{index}.mp4")
-            extension = Path(filename).suffix.lower()
-            if extension not in SUPPORTED_VIDEO_EXTENSIONS:
-                raise InvalidInputError(f"Desteklenmeyen dosya uzantisi: {extension}")
-            validated_files.append((uploaded_file, filename))
+        clips = self._repository.add_clips(job_id=job.id, uploads=validated_files, first_order=1)
+        return replace(job, clips=tuple(clips))
 
-        job = self._repository.create_job(owner_id=owner_id, name=normalized_name)
 
-        for index, (uploaded_file, filename) in enumerate(validated_files, start=1):
-            self._repository.add_clip(
-                job_id=job.id,
-                uploaded_file=uploaded_file,
-                order=index,
-                original_name=filename,
-            )
+class CreateUploadJobUseCase:
+    """Creates an empty job whose clips arrive later through resumable uploads."""
+
+    def __init__(self, repository: MergeJobRepository) -> None:
+        self._repository = repository
+
+    def execute(self, owner_id: int, name: str, output_mode: OutputMode = OutputMode.MP4) -> MergeJob:
+        return self._repository.create_job(
+            owner_id=owner_id,
+            name=_normalize_job_name(name),
+            output_mode=output_mode,
+        )
+
+
+class CreateClipUploadUseCase:
+    def __init__(self, repository: MergeJobRepository, upload_store: ClipUploadStore) -> None:
+        self._repository = repository
+        self._upload_store = upload_store
+
+    def execute(self, owner_id: int, job_id: UUID, order: int, original_name: str, length: int) -> ClipUploadSession:
+        _validate_extension(original_name)
+        if length <= 0:
+            raise InvalidInputError("Yukleme boyutu sifirdan buyuk olmalidir.")
+        if order <= 0:
+            raise InvalidInputError("Video sirasi pozitif olmalidir.")
+
+        job = self._repository.get_user_job(owner_id, job_id, include_clips=True)
+        if job is None:
+            raise JobNotFoundError("Yukleme yapilacak is bulunamadi.")
+        if job.status == JobStatus.RUNNING:
+            raise InvalidInputError("Is islenirken video eklenemez.")
+
+        taken_orders = {clip.order for clip in job.clips}
+        taken_orders.update(upload.order for upload in self._upload_store.list_job_uploads(job_id))
+        if order in taken_orders:
+            raise InvalidInputError(f"Bu sira zaten kullaniliyor: {order}")
+
+        return self._upload_store.create_upload(job_id, order, original_name, length)
+
 
-        persisted_job = self._repository.get_user_job(owner_id, job.id, include_clips=True)
-        if persisted_job is None:
-            raise JobNotFoundError("Olusturulan is geri okunamadi.")
-        return persisted_job
+class GetClipUploadUseCase:
+    def __init__(self, upload_store: ClipUploadStore) -> None:
+        self._upload_store = upload_store
+
+    def execute(self, owner_id: int, upload_id: UUID) -> ClipUploadSession | None:
+        return self._upload_store.get_upload(owner_id, upload_id)
+
+
+class WriteUploadChunkUseCase:
+    def __init__(self, upload_store: ClipUploadStore) -> None:
+        self._upload_store = upload_store
+
+    def execute(self, owner_id: int, upload_id: UUID, offset: int, chunks: Iterator[bytes]) -> ClipUploadSession:
+        upload = self._upload_store.get_upload(owner_id, upload_id)
+        if upload is None:
+            raise JobNotFoundError("Yukleme bulunamadi.")
+        return self._upload_store.write_chunk(upload_id, offset, chunks)
+
+
+class SweepExpiredUploadsUseCase:
+    def __init__(self, upload_store: ClipUploadStore, expire_seconds: float) -> None:
+        self._upload_store = upload_store
+        self._expire_seconds = expire_seconds
+
+    def execute(self) -> int:
+        return self._upload_store.sweep_expired(datetime.now(timezone.utc) - timedelta(seconds=self._expire_seconds))
+
+
+class FinalizeUploadedJobUseCase:
+    def __init__(self, repository: MergeJobRepository, upload_store: ClipUploadStore) -> None:
+        self._repository = repository
+        self._upload_store = upload_store
+
+    def execute(self, owner_id: int, job_id: UUID) -> MergeJob:
+        job = self._repository.get_user_job(owner_id, job_id, include_clips=True)
+        if job is None:
+            raise JobNotFoundError("Is bulunamadi.")
+
+        unfinished = [upload for upload in self._upload_store.list_job_uploads(job_id) if not upload.is_complete]
+        if unfinished:
+            names = ", ".join(upload.original_name for upload in unfinished)
+            raise InvalidInputError(f"Yuklemesi tamamlanmayan videolar var: {names}")
+        if not job.clips:
+            raise InvalidInputError("En az bir video dosyasi yuklenmelidir.")
+        return job
+
+
+class AbandonWaitingJobUseCase:
+    """Fails a job whose task gave up waiting for a free slot; a newer run of the job is left alone."""
+
+    def __init__(self, repository: MergeJobRepository) -> None:
+        self._repository = repository
+
+    def execute(self, job_id: UUID, task_id: str | None, reason: str) -> bool:
+        return self._repository.set_status(job_id, JobStatus.FAILED, error_message=reason, task_id=task_id)
 
 
 class ProcessMergeJobUseCase:
@@ -51,49 +292,316 @@ class ProcessMergeJobUseCase:
         repository: MergeJobRepository,
         merger: VideoMerger,
         media_root: Path,
+        progress_interval_seconds: float = 1.0,
+        output_cache: MergeOutputCache | None = None,
+        max_running_per_user: int | None = None,
+        queue: MergeJobQueue | None = None,
+        split_range_clips: int | None = None,
+        running_stale_seconds: float | None = None,
     ) -> None:
         self._repository = repository
         self._merger = merger
         self._media_root = media_root
+        self._progress_interval_seconds = progress_interval_seconds
+        self._output_cache = output_cache
+        self._max_running_per_user = max_running_per_user
+        self._queue = queue
+        self._split_range_clips = split_range_clips
+        self._running_stale_seconds = running_stale_seconds
 
-    def execute(self, owner_id: int, job_id: UUID) -> MergeJob:
+    def execute(self, owner_id: int, job_id: UUID, task_id: str | None = None) -> MergeJob:
         job = self._repository.get_user_job(owner_id, job_id, include_clips=True)
         if job is None:
             raise JobNotFoundError("Is bulunamadi.")
+        # Cheap early exit for superseded tasks; start_job re-checks atomically before ffmpeg runs.
+        if task_id is not None and job.task_id != task_id:
+            raise StaleTaskError(f"Gorev {task_id} artik bu isin guncel gorevi degil.")
 
         clips = self._repository.list_job_clips(job_id)
         if not clips:
             message = "Birlestirme icin video bulunamadi."
-            self._repository.set_status(job_id, JobStatus.FAILED, error_message=message)
+            self._repository.set_status(job_id, JobStatus.FAILED, error_message=message, task_id=task_id)
             raise InvalidInputError(message)
 
-        self._repository.set_status(job_id, JobStatus.RUNNING, error_message="")
+        if job.output_mode == OutputMode.HLS:
+            return self._execute_segmented(owner_id, job_id, clips, task_id)
 
         output_relative = Path("merged_outputs") / f"user_{owner_id}" / f"{job_id}.mp4"
         output_absolute = self._media_root / output_relative
 
+        # Even a cache hit must win the task compare-and-set, or duplicate deliveries both complete the job.
+        self._claim_slot(owner_id, job_id, task_id)
+
+        cache_key = None
+        if self._output_cache is not None:
+            cache_key = merge_cache_key(clips, self._merger.parameters_fingerprint, output_relative.suffix)
+        if cache_key and self._output_cache.fetch(cache_key, output_absolute):
+            return self._complete(owner_id, job_id, output_relative, clips)
+
+        if self._should_split(job, clips):
+            return self._dispatch_split(job, clips, task_id)
+
+        progress_reporter = self._progress_reporter(owner_id, job_id)
+
+        try:
+            with _merge_window(self._repository, job_id):
+                appended = self._try_append(job, clips, output_absolute, progress_reporter)
+                if not appended:
+                    self._merger.merge(
+                        clip_paths=[clip.file_path for clip in clips],
+                        output_path=output_absolute,
+                        progress_callback=progress_reporter,
+                    )
+        except Exception as exc:
+            self._repository.set_status(job_id, JobStatus.FAILED, error_message=str(exc), task_id=task_id)
+            raise
+
+        if cache_key:
+            self._output_cache.store(cache_key, output_absolute)
+        return self._complete(owner_id, job_id, output_relative, clips)
+
+    def _execute_segmented(
+        self,
+        owner_id: int,
+        job_id: UUID,
+        clips: list[VideoClip],
+        task_id: str | None,
+    ) -> MergeJob:
+        playlist_relative = Path("merged_outputs") / f"user_{owner_id}" / f"{job_id}_hls" / "index.m3u8"
+
+        self._claim_slot(owner_id, job_id, task_id)
+        # Publish the playlist up front so finished segments can be watched during the merge.
+        self._repository.set_output_file(job_id, playlist_relative.as_posix())
+
         try:
-            self._merger.merge(
-                clip_paths=[clip.file_path for clip in clips],
-                output_path=output_absolute,
+            with _merge_window(self._repository, job_id):
+                self._merger.merge_segmented(
+                    clip_paths=[clip.file_path for clip in clips],
+                    playlist_path=self._media_root / playlist_relative,
+                    progress_callback=self._progress_reporter(owner_id, job_id),
+                )
+        except Exception as exc:
+            self._repository.set_status(job_id, JobStatus.FAILED, error_message=str(exc), task_id=task_id)
+            raise
+
+        return self._complete(owner_id, job_id, playlist_relative, clips)
+
+    def _should_split(self, job: MergeJob, clips: list[VideoClip]) -> bool:
+        if self._queue is None or not self._split_range_clips or len(clips) <= self._split_range_clips:
+            return False
+        # Appending a few clips to an existing output is cheaper than any split.
+        return not (job.output_file_name and job.merged_through_order > 0)
+
+    def _dispatch_split(self, job: MergeJob, clips: list[VideoClip], task_id: str | None) -> MergeJob:
+        ranges = split_clip_ranges(clips, self._split_range_clips)
+        try:
+            # One format for the whole job: parts each picking their own could not be stream-copied together.
+            target = self._merger.plan_target([clip.file_path for clip in clips])
+        except Exception as exc:
+            self._repository.set_status(job.id, JobStatus.FAILED, error_message=str(exc), task_id=task_id)
+            raise
+        try:
+            self._queue.enqueue_split_merge(
+                owner_id=job.owner_id,
+                job_id=job.id,
+                task_id=task_id if task_id is not None else job.task_id,
+                ranges=ranges,
+                lane=job.lane,
+                target=target,
+            )
+        except QueueUnavailableError as exc:
+            self._repository.set_status(job.id, JobStatus.FAILED, error_message=str(exc), task_id=task_id)
+            raise
+        return replace(job, status=JobStatus.RUNNING)
+
+    def _claim_slot(self, owner_id: int, job_id: UUID, task_id: str | None) -> None:
+        running_since = None
+        if self._running_stale_seconds:
+            running_since = datetime.now(timezone.utc) - timedelta(seconds=self._running_stale_seconds)
+        claimed = self._repository.start_job(
+            owner_id,
+            job_id,
+            task_id=task_id,
+            max_running=self._max_running_per_user,
+            running_since=running_since,
+        )
+        if not claimed:
+            raise UserConcurrencyLimitError(
+                f"Ayni anda en fazla {self._max_running_per_user} is calistirilabilir; is sirada bekliyor."
             )
+
+    def _progress_reporter(self, owner_id: int, job_id: UUID) -> ThrottledProgressReporter:
+        return ThrottledProgressReporter(
+            lambda progress: self._repository.publish_progress(owner_id, job_id, progress),
+            min_interval_seconds=self._progress_interval_seconds,
+        )
+
+    def _try_append(
+        self,
+        job: MergeJob,
+        clips: list[VideoClip],
+        output_absolute: Path,
+        progress_callback: ProgressCallback,
+    ) -> bool:
+        if not job.output_file_name or job.merged_through_order <= 0:
+            return False
+
+        base_path = self._media_root / job.output_file_name
+        new_clips = [clip for clip in clips if clip.order > job.merged_through_order]
+        if not new_clips or not base_path.exists():
+            return False
+
+        return self._merger.append(
+            base_path=base_path,
+            clip_paths=[clip.file_path for clip in new_clips],
+            output_path=output_absolute,
+            progress_callback=progress_callback,
+        )
+
+    def _complete(self, owner_id: int, job_id: UUID, output_relative: Path, clips: list[VideoClip]) -> MergeJob:
+        return _complete_job(self._repository, owner_id, job_id, output_relative, clips, self._media_root)
+
+
+class MergeClipRangeUseCase:
+    """Merges one contiguous clip range of a split job into a partial MP4."""
+
+    def __init__(self, repository: MergeJobRepository, merger: VideoMerger, media_root: Path) -> None:
+        self._repository = repository
+        self._merger = merger
+        self._media_root = media_root
+
+    def execute(self, owner_id: int, job_id: UUID, task_id: str, clip_range: ClipRange, target: str = "") -> str:
+        _require_current_task(self._repository, owner_id, job_id, task_id)
+
+        clips = [
+            clip
+            for clip in self._repository.list_job_clips(job_id)
+            if clip_range.first_order <= clip.order <= clip_range.last_order
+        ]
+        if not clips:
+            raise InvalidInputError(f"{clip_range.first_order}-{clip_range.last_order} araliginda video yok.")
+
+        # The target is part of the key: a part rendered for another job-wide format is not reusable.
+        content_key = merge_cache_key(clips, f"{self._merger.parameters_fingerprint}|{target}", ".mp4")
+        part_relative = split_part_path(owner_id, job_id, clip_range, content_key)
+        part_absolute = self._media_root / part_relative
+        # merge() renders next to the output path and renames it in, so an existing part is complete.
+        if content_key and part_absolute.exists():
+            return part_relative.as_posix()
+
+        try:
+            with _merge_window(self._repository, job_id):
+                self._merger.merge(
+                    clip_paths=[clip.file_path for clip in clips],
+                    output_path=part_absolute,
+                    target=target,
+                )
         except Exception as exc:
-            self._repository.set_status(job_id, JobStatus.FAILED, error_message=str(exc))
+            message = f"Video {clip_range.first_order}-{clip_range.last_order}: {exc}"
+            # Guarded by task id: a range of a superseded split must not fail the job's newer run.
+            # Finished sibling parts stay on disk so a retry only re-renders the ranges that are missing.
+            self._repository.set_status(job_id, JobStatus.FAILED, error_message=message, task_id=task_id)
             raise
+        return part_relative.as_posix()
+
+
+class CompleteSplitMergeUseCase:
+    """Concatenates the finished parts of a split job into its final output."""
+
+    def __init__(
+        self,
+        repository: MergeJobRepository,
+        merger: VideoMerger,
+        media_root: Path,
+        progress_interval_seconds: float = 1.0,
+        output_cache: MergeOutputCache | None = None,
+    ) -> None:
+        self._repository = repository
+        self._merger = merger
+        self._media_root = media_root
+        self._progress_interval_seconds = progress_interval_seconds
+        self._output_cache = output_cache
+
+    def execute(self, owner_id: int, job_id: UUID, task_id: str, part_names: list[str]) -> MergeJob:
+        _require_current_task(self._repository, owner_id, job_id, task_id)
+        if not part_names or not all(part_names):
+            raise StaleTaskError("Parcalardan biri eski bir gorev tarafindan atlandi.")
+
+        clips = self._repository.list_job_clips(job_id)
+        output_relative = Path("merged_outputs") / f"user_{owner_id}" / f"{job_id}.mp4"
+        output_absolute = self._media_root / output_relative
+        progress_reporter = ThrottledProgressReporter(
+            lambda progress: self._repository.publish_progress(owner_id, job_id, progress),
+            min_interval_seconds=self._progress_interval_seconds,
+        )
+
+        try:
+            # Parts agree on codecs whenever their ranges did, so this is normally a stream copy.
+            with _merge_window(self._repository, job_id):
+                self._merger.merge(
+                    clip_paths=[self._media_root / name for name in part_names],
+                    output_path=output_absolute,
+                    progress_callback=progress_reporter,
+                )
+        except Exception as exc:
+            self._repository.set_status(job_id, JobStatus.FAILED, error_message=str(exc), task_id=task_id)
+            raise
+
+        if self._output_cache is not None:
+            cache_key = merge_cache_key(clips, self._merger.parameters_fingerprint, output_relative.suffix)
+            if cache_key:
+                self._output_cache.store(cache_key, output_absolute)
+        shutil.rmtree((self._media_root / part_names[0]).parent, ignore_errors=True)
+        return _complete_job(self._repository, owner_id, job_id, output_relative, clips, self._media_root)
+
+
+class AppendClipsUseCase:
+    def __init__(self, repository: MergeJobRepository) -> None:
+        self._repository = repository
+
+    def execute(self, owner_id: int, job_id: UUID, uploaded_files: list[object]) -> MergeJob:
+        validated_files = _validate_uploaded_files(uploaded_files)
+
+        job = self._repository.get_user_job(owner_id, job_id, include_clips=True)
+        if job is None:
+            raise JobNotFoundError("Video eklenecek is bulunamadi.")
+        if job.status == JobStatus.RUNNING:
+            raise InvalidInputError("Is islenirken video eklenemez.")
 
-        self._repository.set_output_file(job_id, output_relative.as_posix())
-        self._repository.set_status(job_id, JobStatus.COMPLETED, error_message="")
+        next_order = max((clip.order for clip in job.clips), default=0) + 1
+        clips = self._repository.add_clips(job_id=job_id, uploads=validated_files, first_order=next_order)
+        self._repository.set_status(job_id, JobStatus.PENDING, error_message="")
 
-        completed_job = self._repository.get_user_job(owner_id, job_id, include_clips=True)
-        if completed_job is None:
-            raise JobNotFoundError("Islem tamamlandi ancak kayit bulunamadi.")
-        return completed_job
+        return replace(job, status=JobStatus.PENDING, error_message="", clips=(*job.clips, *clips))
+
+
+class StreamMergedJobUseCase:
+    def __init__(self, repository: MergeJobRepository, merger: VideoMerger) -> None:
+        self._repository = repository
+        self._merger = merger
+
+    def execute(self, owner_id: int, job_id: UUID) -> tuple[MergeJob, AsyncIterator[bytes]]:
+        job = self._repository.get_user_job(owner_id, job_id, include_clips=False)
+        if job is None:
+            raise JobNotFoundError("Is bulunamadi.")
+
+        clips = self._repository.list_job_clips(job_id)
+        if not clips:
+            raise InvalidInputError("Birlestirme icin video bulunamadi.")
+
+        return job, self._merger.stream([clip.file_path for clip in clips])
 
 
 class EnqueueMergeJobUseCase:
-    def __init__(self, repository: MergeJobRepository, queue: MergeJobQueue) -> None:
+    def __init__(
+        self,
+        repository: MergeJobRepository,
+        queue: MergeJobQueue,
+        bulk_threshold_bytes: int | None = None,
+    ) -> None:
         self._repository = repository
         self._queue = queue
+        self._bulk_threshold_bytes = bulk_threshold_bytes
 
     def execute(self, owner_id: int, job_id: UUID) -> str:
         job = self._repository.get_user_job(owner_id, job_id, include_clips=False)
@@ -105,22 +613,97 @@ class EnqueueMergeJobUseCase:
         if job.status == JobStatus.COMPLETED and job.output_file_name:
             raise InvalidInputError("Bu is zaten tamamlanmis.")
 
-        self._repository.set_status(job_id, JobStatus.PENDING, error_message="")
+        total_bytes = self._repository.job_sizes([job_id]).get(job_id, 0)
+        queued = QueuedJob(
+            job_id=job_id,
+            task_id=str(uuid4()),
+            lane=select_lane(total_bytes, self._bulk_threshold_bytes),
+            previous_task_id=job.task_id,
+        )
+        # The task id is stored before the message is published, so the task always finds itself current.
+        if job_id not in self._repository.mark_enqueued([queued]):
+            # Another request re-enqueued the job, or a worker started it, since it was read above.
+            current = self._repository.get_user_job(owner_id, job_id, include_clips=False)
+            if current is None:
+                raise JobNotFoundError("Kuyruga alinacak is bulunamadi.")
+            if current.status in {JobStatus.PENDING, JobStatus.RUNNING} and current.task_id:
+                return current.task_id
+            raise InvalidInputError("Is ayni anda baska bir istekle guncellendi, tekrar deneyin.")
+
         try:
-            task_id = self._queue.enqueue_process_job(owner_id=owner_id, job_id=job_id)
+            return self._queue.enqueue_process_job(owner_id=owner_id, queued=queued)
         except QueueUnavailableError as exc:
             self._repository.set_status(job_id, JobStatus.FAILED, error_message=str(exc))
             raise
 
-        return task_id
+
+class CreateJobBatchUseCase:
+    def __init__(
+        self,
+        repository: MergeJobRepository,
+        queue: MergeJobQueue,
+        max_jobs: int = 100,
+        bulk_threshold_bytes: int | None = None,
+    ) -> None:
+        self._repository = repository
+        self._queue = queue
+        self._max_jobs = max_jobs
+        self._bulk_threshold_bytes = bulk_threshold_bytes
+
+    def execute(self, owner_id: int, drafts: list[MergeJobDraft]) -> list[tuple[MergeJob, str]]:
+        if not drafts:
+            raise InvalidInputError("En az bir is tanimlanmalidir.")
+        if len(drafts) > self._max_jobs:
+            raise InvalidInputError(f"Tek istekte en fazla {self._max_jobs} is olusturulabilir.")
+        if any(not draft.clip_hashes for draft in drafts):
+            raise InvalidInputError("Her is en az bir video icermelidir.")
+
+        drafts = [replace(draft, name=_normalize_job_name(draft.name)) for draft in drafts]
+        # One unit: a failure before the jobs are marked pending leaves neither rows nor clip links behind.
+        with self._repository.atomic():
+            jobs = self._repository.create_jobs_from_blobs(owner_id, drafts)
+            sizes = self._repository.job_sizes([job.id for job in jobs])
+            queued_jobs = [
+                QueuedJob(
+                    job_id=job.id,
+                    task_id=str(uuid4()),
+                    lane=select_lane(sizes.get(job.id, 0), self._bulk_threshold_bytes),
+                )
+                for job in jobs
+            ]
+            self._repository.mark_enqueued(queued_jobs)
+        # Enqueue only after the rows are committed, so no worker can pick up a job it cannot see.
+        try:
+            task_ids = self._queue.enqueue_process_jobs(owner_id=owner_id, queued_jobs=queued_jobs)
+        except QueueUnavailableError as exc:
+            for job in jobs:
+                self._repository.set_status(job.id, JobStatus.FAILED, error_message=str(exc))
+            raise
+
+        return list(zip(jobs, task_ids))
 
 
 class ListUserJobsUseCase:
     def __init__(self, repository: MergeJobRepository) -> None:
         self._repository = repository
 
-    def execute(self, user_id: int) -> list[MergeJob]:
-        return self._repository.list_user_jobs(user_id)
+    def execute(
+        self,
+        user_id: int,
+        status: JobStatus | None = None,
+        cursor: str | None = None,
+        limit: int = 25,
+    ) -> JobPage:
+        return self._repository.list_user_jobs(user_id, status=status, cursor=cursor, limit=limit)
+
+    async def aexecute(
+        self,
+        user_id: int,
+        status: JobStatus | None = None,
+        cursor: str | None = None,
+        limit: int = 25,
+    ) -> JobPage:
+        return await self._repository.alist_user_jobs(user_id, status=status, cursor=cursor, limit=limit)
 
 
 class GetUserJobUseCase:
@@ -129,3 +712,25 @@ class GetUserJobUseCase:
 
     def execute(self, user_id: int, job_id: UUID, include_clips: bool = True) -> MergeJob | None:
         return self._repository.get_user_job(user_id=user_id, job_id=job_id, include_clips=include_clips)
+
+    async def aexecute(self, user_id: int, job_id: UUID, include_clips: bool = True) -> MergeJob | None:
+        return await self._repository.aget_user_job(user_id=user_id, job_id=job_id, include_clips=include_clips)
+
+
+STAGE_DURATION_BOUNDS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0, 7200.0)
+JOB_BYTE_BOUNDS = tuple(4**power * 1024 * 1024 for power in range(9))  # 1 MiB .. 64 GiB
+
+
+class GetJobMetricsUseCase:
+    def __init__(
+        self,
+        repository: MergeJobRepository,
+        duration_bounds: tuple[float, ...] = STAGE_DURATION_BOUNDS,
+        byte_bounds: tuple[int, ...] = JOB_BYTE_BOUNDS,
+    ) -> None:
+        self._repository = repository
+        self._duration_bounds = duration_bounds
+        self._byte_bounds = byte_bounds
+
+    def execute(self) -> JobMetrics:
+        return self._repository.collect_metrics(self._duration_bounds, self._byte_bounds)
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class VideoMergeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'video_merge'
+
+    def ready(self) -> None:
+        from django.core.signals import setting_changed
+
+        from video_merge import signals  # noqa: F401
+        from video_merge.infrastructure.container import build_use_case_bundle, reset_use_case_bundle
+
+        setting_changed.connect(reset_use_case_bundle, dispatch_uid="video_merge.reset_use_case_bundle")
+        # Building is cheap and touches neither the database nor ffmpeg; doing it here means the
+        # first request does not pay for it. Workers additionally probe ffmpeg at boot.
+        build_use_case_bundle()
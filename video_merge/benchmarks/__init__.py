@@ -0,0 +1 @@
+"""Merge throughput benchmarks on synthetic footage generated with ffmpeg's lavfi sources."""
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import itertools
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+# Encoder arguments per codec; every clip also gets a stereo AAC tone so the audio path is exercised.
+VIDEO_CODEC_ARGS = {
+    "h264": ("-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p"),
+    "hevc": ("-c:v", "libx265", "-preset", "ultrafast", "-pix_fmt", "yuv420p", "-tag:v", "hvc1"),
+    "mpeg4": ("-c:v", "mpeg4", "-q:v", "5", "-pix_fmt", "yuv420p"),
+}
+CODEC_ENCODERS = {"h264": "libx264", "hevc": "libx265", "mpeg4": "mpeg4"}
+
+
+@dataclass(frozen=True, slots=True)
+class ClipSpec:
+    codec: str
+    width: int
+    height: int
+    duration_seconds: float
+    fps: int = 30
+    # Distinct variants differ in their audio tone, so clips are distinct files (no blob dedup, no shared page cache).
+    variant: int = 0
+
+    @property
+    def resolution(self) -> str:
+        return f"{self.width}x{self.height}"
+
+    @property
+    def file_name(self) -> str:
+        return f"{self.codec}_{self.resolution}_{self.fps}fps_{self.duration_seconds:g}s_v{self.variant}.mp4"
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    name: str
+    clips: tuple[ClipSpec, ...]
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(clip.duration_seconds for clip in self.clips)
+
+
+def parse_resolution(value: str) -> tuple[int, int]:
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height)
+
+
+def build_scenarios(
+    codecs: Sequence[str],
+    resolutions: Sequence[str],
+    clip_counts: Sequence[int],
+    durations: Sequence[float],
+    include_mixed: bool = True,
+) -> list[Scenario]:
+    """Cross product of the given axes, plus mixed-resolution runs that force the normalize path."""
+    scenarios = []
+    for codec, resolution, clip_count, duration in itertools.product(codecs, resolutions, clip_counts, durations):
+        width, height = parse_resolution(resolution)
+        clips = tuple(
+            ClipSpec(codec=codec, width=width, height=height, duration_seconds=duration, variant=index)
+            for index in range(clip_count)
+        )
+        scenarios.append(Scenario(name=f"{codec}-{resolution}-{clip_count}x{duration:g}s", clips=clips))
+
+    if include_mixed and len(resolutions) > 1:
+        codec = codecs[0]
+        for clip_count, duration in itertools.product(clip_counts, durations):
+            sizes = [parse_resolution(resolution) for resolution in resolutions]
+            clips = tuple(
+                ClipSpec(codec=codec, width=width, height=height, duration_seconds=duration, variant=index)
+                for index, (width, height) in zip(range(clip_count), itertools.cycle(sizes))
+            )
+            scenarios.append(Scenario(name=f"{codec}-mixed-{clip_count}x{duration:g}s", clips=clips))
+    return scenarios
+
+
+def generate_clip(spec: ClipSpec, output_path: Path, ffmpeg_binary: str = "ffmpeg") -> Path:
+    """Render a test pattern with a sine tone; existing files are reused across runs."""
+    if output_path.exists():
+        return output_path
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = output_path.with_name(f".{output_path.name}.partial.mp4")
+    command = [
+        ffmpeg_binary,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-y",
+        "-f",
+        "lavfi",
+        "-i",
+        f"testsrc2=size={spec.resolution}:rate={spec.fps}:duration={spec.duration_seconds:g}",
+        "-f",
+        "lavfi",
+        "-i",
+        f"sine=frequency={440 + 10 * spec.variant}:sample_rate=48000:duration={spec.duration_seconds:g}",
+        *VIDEO_CODEC_ARGS[spec.codec],
+        "-g",
+        str(spec.fps * 2),
+        "-c:a",
+        "aac",
+        "-ac",
+        "2",
+        "-shortest",
+        str(partial_path),
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        partial_path.unlink(missing_ok=True)
+        raise RuntimeError(f"{spec.file_name} uretilemedi: {result.stderr.strip()}")
+    partial_path.replace(output_path)
+    return output_path
+
+
+def generate_footage(
+    specs: Iterable[ClipSpec],
+    footage_dir: Path,
+    ffmpeg_binary: str = "ffmpeg",
+) -> dict[ClipSpec, Path]:
+    return {spec: generate_clip(spec, footage_dir / spec.file_name, ffmpeg_binary) for spec in set(specs)}
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import multiprocessing
+import resource
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+PROC_IO_PATH = Path("/proc/self/io")
+
+
+@dataclass(frozen=True, slots=True)
+class Measurement:
+    wall_seconds: float
+    cpu_user_seconds: float
+    cpu_system_seconds: float
+    # Peak resident set of the largest ffmpeg/ffprobe child and of the Python process itself.
+    peak_child_rss_bytes: int
+    peak_python_rss_bytes: int
+    # Storage-level and syscall-level IO of this process plus its reaped children; None where
+    # /proc/self/io is unavailable (macOS, hardened containers).
+    read_bytes: int | None
+    write_bytes: int | None
+    read_chars: int | None
+    write_chars: int | None
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+def _maxrss_bytes(usage: resource.struct_rusage) -> int:
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+def _read_proc_io() -> dict[str, int]:
+    try:
+        lines = PROC_IO_PATH.read_text().splitlines()
+    except OSError:
+        return {}
+    counters = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        counters[name.strip()] = int(value)
+    return counters
+
+
+def measure(run: Callable[[], object]) -> Measurement:
+    """Run in the current process; child counters include every ffmpeg the run waited for."""
+    io_before = _read_proc_io()
+    self_before = resource.getrusage(resource.RUSAGE_SELF)
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    started = time.perf_counter()
+
+    run()
+
+    wall_seconds = time.perf_counter() - started
+    self_after = resource.getrusage(resource.RUSAGE_SELF)
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    io_after = _read_proc_io()
+
+    def io_delta(name: str) -> int | None:
+        if name not in io_before or name not in io_after:
+            return None
+        return io_after[name] - io_before[name]
+
+    return Measurement(
+        wall_seconds=wall_seconds,
+        cpu_user_seconds=(self_after.ru_utime - self_before.ru_utime)
+        + (children_after.ru_utime - children_before.ru_utime),
+        cpu_system_seconds=(self_after.ru_stime - self_before.ru_stime)
+        + (children_after.ru_stime - children_before.ru_stime),
+        peak_child_rss_bytes=_maxrss_bytes(children_after),
+        peak_python_rss_bytes=_maxrss_bytes(self_after),
+        read_bytes=io_delta("read_bytes"),
+        write_bytes=io_delta("write_bytes"),
+        read_chars=io_delta("rchar"),
+        write_chars=io_delta("wchar"),
+    )
+
+
+def _measure_child(prepare: Callable[[], Callable[[], object]], connection) -> None:
+    try:
+        run = prepare()
+        outcome: list[object] = []
+        measurement = measure(lambda: outcome.append(run()))
+        connection.send(("ok", measurement.to_dict(), outcome[0]))
+    except BaseException as exc:  # noqa: BLE001
+        connection.send(("error", f"{type(exc).__name__}: {exc}", None))
+    finally:
+        connection.close()
+
+
+def measure_isolated(prepare: Callable[[], Callable[[], object]]) -> tuple[Measurement, object]:
+    """Run prepare() unmeasured, then measure the callable it returns, in a forked process.
+
+    Forking keeps peak RSS per run instead of a process-lifetime high-water mark. Returns the
+    measurement and whatever the run returned (it must be picklable). Callers using the database
+    must close their connections before calling this.
+    """
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_measure_child, args=(prepare, sender))
+    process.start()
+    sender.close()
+    try:
+        outcome, payload, result = receiver.recv()
+    except EOFError:
+        outcome, payload, result = "error", None, None
+    process.join()
+    receiver.close()
+
+    if outcome != "ok":
+        raise RuntimeError(payload or f"Olcum sureci beklenmedik sekilde kapandi (exit code {process.exitcode}).")
+    return Measurement(**payload), result
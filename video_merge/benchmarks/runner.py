@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Sequence
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import connections
+from django.test.utils import override_settings
+
+from video_merge.application.use_cases import CreateMergeJobUseCase, ProcessMergeJobUseCase
+from video_merge.benchmarks.footage import Scenario
+from video_merge.benchmarks.measure import Measurement, measure_isolated
+from video_merge.infrastructure.ffmpeg_merger import FFmpegVideoMerger
+from video_merge.infrastructure.repositories import DjangoMergeJobRepository
+
+RESULTS_SCHEMA_VERSION = 1
+TARGET_MERGER = "merger"
+TARGET_USE_CASE = "use_case"
+TARGETS = (TARGET_MERGER, TARGET_USE_CASE)
+BENCH_USERNAME_PREFIX = "merge-bench-"
+COMPARED_METRICS = ("wall_seconds", "cpu_seconds", "peak_child_rss_bytes")
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkResult:
+    scenario: str
+    target: str
+    repeat: int
+    clip_count: int
+    media_seconds: float
+    input_bytes: int
+    output_bytes: int
+    measurement: Measurement
+
+    @property
+    def key(self) -> str:
+        return f"{self.scenario}/{self.target}"
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "scenario": self.scenario,
+            "target": self.target,
+            "repeat": self.repeat,
+            "clip_count": self.clip_count,
+            "media_seconds": self.media_seconds,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+            **self.measurement.to_dict(),
+        }
+
+
+def _prepare_merger_run(merger: FFmpegVideoMerger, clip_paths: list[Path], work_dir: Path) -> Callable[[], int]:
+    output_path = work_dir / "merged.mp4"
+
+    def run() -> int:
+        merger.merge(clip_paths, output_path)
+        return output_path.stat().st_size
+
+    return run
+
+
+def _prepare_use_case_run(
+    merger: FFmpegVideoMerger,
+    clip_paths: list[Path],
+    media_root: Path,
+    username: str,
+) -> Callable[[], int]:
+    # Uploading the clips is setup, not part of the measured merge.
+    repository = DjangoMergeJobRepository()
+    owner = get_user_model().objects.create_user(username=username)
+    handles = [path.open("rb") for path in clip_paths]
+    try:
+        uploads = [File(handle, name=path.name) for handle, path in zip(handles, clip_paths)]
+        job = CreateMergeJobUseCase(repository).execute(owner.id, "benchmark", uploads)
+    finally:
+        for handle in handles:
+            handle.close()
+    process = ProcessMergeJobUseCase(repository, merger, media_root)
+
+    def run() -> int:
+        completed = process.execute(owner.id, job.id)
+        return (media_root / completed.output_file_name).stat().st_size
+
+    return run
+
+
+def run_benchmarks(
+    scenarios: Sequence[Scenario],
+    footage: dict,
+    targets: Sequence[str],
+    repeat: int,
+    merger: FFmpegVideoMerger,
+    on_result: Callable[[BenchmarkResult], None] | None = None,
+) -> list[BenchmarkResult]:
+    results = []
+    for scenario in scenarios:
+        clip_paths = [footage[spec] for spec in scenario.clips]
+        input_bytes = sum(path.stat().st_size for path in clip_paths)
+        for target in targets:
+            for repeat_index in range(repeat):
+                measurement, output_bytes = _run_once(target, merger, clip_paths)
+                result = BenchmarkResult(
+                    scenario=scenario.name,
+                    target=target,
+                    repeat=repeat_index,
+                    clip_count=len(clip_paths),
+                    media_seconds=scenario.total_seconds,
+                    input_bytes=input_bytes,
+                    output_bytes=int(output_bytes),
+                    measurement=measurement,
+                )
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+    return results
+
+
+def _run_once(target: str, merger: FFmpegVideoMerger, clip_paths: list[Path]) -> tuple[Measurement, object]:
+    work_dir = Path(tempfile.mkdtemp(prefix="merge-bench-"))
+    username = f"{BENCH_USERNAME_PREFIX}{uuid4().hex[:12]}"
+    try:
+        if target == TARGET_MERGER:
+            return measure_isolated(lambda: _prepare_merger_run(merger, clip_paths, work_dir))
+
+        with override_settings(MEDIA_ROOT=str(work_dir), REALTIME_UPDATES_ENABLED=False):
+            # The forked child opens its own connection; sharing the parent's socket/file handle is unsafe.
+            connections.close_all()
+            try:
+                return measure_isolated(lambda: _prepare_use_case_run(merger, clip_paths, work_dir, username))
+            finally:
+                get_user_model().objects.filter(username=username).delete()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def summarize(results: Sequence[BenchmarkResult]) -> dict[str, dict[str, float]]:
+    """Median wall/CPU time and worst peak RSS per scenario/target, the numbers compared across runs."""
+    grouped: dict[str, list[BenchmarkResult]] = {}
+    for result in results:
+        grouped.setdefault(result.key, []).append(result)
+
+    summary = {}
+    for key, runs in grouped.items():
+        measurements = [run.measurement for run in runs]
+        wall = statistics.median(m.wall_seconds for m in measurements)
+        summary[key] = {
+            "runs": len(runs),
+            "wall_seconds": wall,
+            "cpu_seconds": statistics.median(m.cpu_user_seconds + m.cpu_system_seconds for m in measurements),
+            "peak_child_rss_bytes": max(m.peak_child_rss_bytes for m in measurements),
+            "media_seconds_per_wall_second": runs[0].media_seconds / wall if wall else 0.0,
+        }
+    return summary
+
+
+def build_report(
+    results: Sequence[BenchmarkResult],
+    ffmpeg_version: str,
+    parameters: dict[str, object],
+) -> dict[str, object]:
+    return {
+        "schema": RESULTS_SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "ffmpeg": ffmpeg_version,
+        "parameters": parameters,
+        "results": [result.to_dict() for result in results],
+        "summary": summarize(results),
+    }
+
+
+def compare_reports(
+    current: dict[str, object],
+    baseline: dict[str, object],
+    tolerance: float,
+) -> tuple[list[str], list[str]]:
+    """Return (report lines, regression lines) for metrics present in both summaries."""
+    lines, regressions = [], []
+    baseline_summary = baseline.get("summary", {})
+    for key, metrics in current["summary"].items():
+        previous = baseline_summary.get(key)
+        if previous is None:
+            lines.append(f"{key}: referansta yok")
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = previous.get(metric), metrics.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            line = f"{key} {metric}: {before:.3f} -> {after:.3f} ({change:+.1%})"
+            lines.append(line)
+            if change > tolerance:
+                regressions.append(line)
+    return lines, regressions
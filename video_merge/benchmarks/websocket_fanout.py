@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Sequence
+from uuid import uuid4
+
+from channels import DEFAULT_CHANNEL_LAYER
+from channels.layers import channel_layers
+from asgiref.testing import ApplicationCommunicator
+from django.test.utils import override_settings
+
+from video_merge.infrastructure.event_publisher import CoalescingEventPublisher, set_event_publisher
+from video_merge.infrastructure.repositories import _publish_job_update
+from video_merge.models import MergeJob as MergeJobModel
+from video_merge.presentation.consumers import JobStatusConsumer
+
+PROC_STATM_PATH = Path("/proc/self/statm")
+LAYER_INMEMORY = "inmemory"
+LAYER_REDIS = "redis"
+LAYERS = (LAYER_INMEMORY, LAYER_REDIS)
+RECEIVE_TIMEOUT_SECONDS = 3600.0
+
+
+@dataclass(frozen=True, slots=True)
+class BenchUser:
+    """Stands in for request.user in the socket scope; the consumer only reads id and is_anonymous."""
+
+    id: int
+    is_anonymous: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class FanoutResult:
+    connections: int
+    users: int
+    rate_per_second: float
+    duration_seconds: float
+    publishes: int
+    expected_deliveries: int
+    deliveries: int
+    connect_seconds: float
+    latency_p50_ms: float | None
+    latency_p99_ms: float | None
+    latency_max_ms: float | None
+    # Python heap allocated while connecting (tracemalloc) and the RSS growth it caused, per socket.
+    python_bytes_per_connection: float
+    rss_bytes_per_connection: float | None
+
+    @property
+    def lost(self) -> int:
+        return self.expected_deliveries - self.deliveries
+
+    def to_dict(self) -> dict[str, object]:
+        return {**asdict(self), "lost": self.lost}
+
+
+def channel_layers_setting(layer: str, redis_url: str = "", capacity: int = 100) -> dict[str, object]:
+    if layer == LAYER_REDIS:
+        return {
+            "default": {
+                "BACKEND": "channels_redis.core.RedisChannelLayer",
+                "CONFIG": {"hosts": [redis_url or "redis://127.0.0.1:6379/2"], "capacity": capacity},
+            }
+        }
+    return {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer", "CONFIG": {"capacity": capacity}}}
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float | None:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return None
+    rank = max(1, min(len(sorted_values), math.ceil(fraction * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def _rss_bytes() -> int | None:
+    try:
+        resident_pages = int(PROC_STATM_PATH.read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _socket_scope(user_id: int) -> dict[str, object]:
+    return {
+        "type": "websocket",
+        "path": "/ws/jobs/",
+        "raw_path": b"/ws/jobs/",
+        "query_string": b"",
+        "headers": [],
+        "subprotocols": [],
+        "user": BenchUser(id=user_id),
+    }
+
+
+async def _connect(user_id: int) -> ApplicationCommunicator:
+    # asgiref's communicator directly: channels.testing would pull in daphne for its live server case.
+    communicator = ApplicationCommunicator(JobStatusConsumer.as_asgi(), _socket_scope(user_id))
+    await communicator.send_input({"type": "websocket.connect"})
+    response = await communicator.receive_output(timeout=30)
+    if response["type"] != "websocket.accept":
+        raise RuntimeError(f"WebSocket baglantisi reddedildi: {response}")
+    return communicator
+
+
+async def _disconnect(communicator: ApplicationCommunicator) -> None:
+    await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+    await communicator.wait(timeout=5)
+
+
+class _Subscriber:
+    def __init__(
+        self,
+        communicator: ApplicationCommunicator,
+        sent_at: dict[str, float],
+        latencies: list[float],
+    ) -> None:
+        self._communicator = communicator
+        self._sent_at = sent_at
+        self._latencies = latencies
+
+    async def receive_forever(self) -> None:
+        while True:
+            message = await self._communicator.receive_output(timeout=RECEIVE_TIMEOUT_SECONDS)
+            if message["type"] != "websocket.send":
+                continue
+            payload = json.loads(message["text"])
+            sent_at = self._sent_at.get(payload["job_id"])
+            # Stragglers from an earlier rate step are not this step's deliveries.
+            if sent_at is not None:
+                self._latencies.append(time.perf_counter() - sent_at)
+
+
+async def _connect_all(user_ids: Sequence[int]) -> list[ApplicationCommunicator]:
+    return list(await asyncio.gather(*(_connect(user_id) for user_id in user_ids)))
+
+
+async def _publish_at_rate(
+    owner_ids: Sequence[int],
+    rate_per_second: float,
+    duration_seconds: float,
+    sent_at: dict[str, float],
+) -> int:
+    """Publish rate * duration status updates of fresh jobs round-robin over owners, paced against the wall clock."""
+    publish_count = max(1, round(rate_per_second * duration_seconds))
+    started = time.perf_counter()
+    for index in range(publish_count):
+        delay = started + index / rate_per_second - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        job = MergeJobModel(id=uuid4(), owner_id=owner_ids[index % len(owner_ids)], status="running")
+        sent_at[str(job.id)] = time.perf_counter()
+        _publish_job_update(job)
+    return publish_count
+
+
+async def _flush_periodically(publisher: CoalescingEventPublisher, interval: float, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        await publisher.drain()
+
+
+async def _run_fanout(
+    connections: int,
+    users: int,
+    rates: Sequence[float],
+    duration_seconds: float,
+    flush_interval_seconds: float,
+    settle_seconds: float,
+) -> list[FanoutResult]:
+    user_ids = [index % users + 1 for index in range(connections)]
+    subscribers_per_owner = {owner: user_ids.count(owner) for owner in set(user_ids)}
+    owner_ids = sorted(subscribers_per_owner)
+
+    rss_before = _rss_bytes()
+    tracemalloc.start()
+    connect_started = time.perf_counter()
+    communicators = await _connect_all(user_ids)
+    connect_seconds = time.perf_counter() - connect_started
+    python_bytes, _peak = tracemalloc.get_traced_memory()
+    # Tracing allocations slows every later step, so it only covers the connect phase.
+    tracemalloc.stop()
+    rss_after = _rss_bytes()
+    rss_per_connection = None
+    if rss_before is not None and rss_after is not None:
+        rss_per_connection = (rss_after - rss_before) / connections
+
+    results = []
+    # The in-memory layer only works within one event loop, so events are drained here, not on a thread.
+    publisher = CoalescingEventPublisher(flush_interval_seconds, background=False)
+    previous_publisher = set_event_publisher(publisher)
+    try:
+        for rate in rates:
+            sent_at: dict[str, float] = {}
+            latencies: list[float] = []
+            readers = [
+                asyncio.ensure_future(_Subscriber(communicator, sent_at, latencies).receive_forever())
+                for communicator in communicators
+            ]
+            stop = asyncio.Event()
+            flusher = asyncio.ensure_future(_flush_periodically(publisher, flush_interval_seconds, stop))
+
+            publishes = await _publish_at_rate(owner_ids, rate, duration_seconds, sent_at)
+            expected = sum(subscribers_per_owner[owner_ids[index % len(owner_ids)]] for index in range(publishes))
+
+            deadline = time.perf_counter() + settle_seconds + flush_interval_seconds
+            while len(latencies) < expected and time.perf_counter() < deadline:
+                await asyncio.sleep(0.01)
+            stop.set()
+            await flusher
+            for reader in readers:
+                reader.cancel()
+            await asyncio.gather(*readers, return_exceptions=True)
+
+            ordered = sorted(latencies)
+            results.append(
+                FanoutResult(
+                    connections=connections,
+                    users=len(owner_ids),
+                    rate_per_second=rate,
+                    duration_seconds=duration_seconds,
+                    publishes=publishes,
+                    expected_deliveries=expected,
+                    deliveries=len(ordered),
+                    connect_seconds=connect_seconds,
+                    latency_p50_ms=_milliseconds(percentile(ordered, 0.50)),
+                    latency_p99_ms=_milliseconds(percentile(ordered, 0.99)),
+                    latency_max_ms=_milliseconds(ordered[-1] if ordered else None),
+                    python_bytes_per_connection=python_bytes / connections,
+                    rss_bytes_per_connection=rss_per_connection,
+                )
+            )
+    finally:
+        set_event_publisher(previous_publisher)
+        await asyncio.gather(*(_disconnect(communicator) for communicator in communicators), return_exceptions=True)
+    return results
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    return None if seconds is None else seconds * 1000
+
+
+def run_fanout_benchmark(
+    connection_counts: Sequence[int],
+    users: int,
+    rates: Sequence[float],
+    duration_seconds: float,
+    flush_interval_seconds: float = 0.25,
+    layer: str = LAYER_INMEMORY,
+    redis_url: str = "",
+    capacity: int = 100,
+    settle_seconds: float = 5.0,
+) -> list[FanoutResult]:
+    """Open each number of JobStatusConsumer sockets in one event loop and publish status events at each rate.
+
+    Latency runs from the _publish_job_update call to the consumer's send, so it includes the
+    coalescing flush delay and the channel layer hop, exactly what a dashboard sees.
+    """
+    results = []
+    layers_setting = channel_layers_setting(layer, redis_url, capacity)
+    with override_settings(CHANNEL_LAYERS=layers_setting, REALTIME_UPDATES_ENABLED=True):
+        for connections in connection_counts:
+            # A fresh layer per run: the in-memory layer's queues belong to the loop of the previous run.
+            channel_layers.backends.pop(DEFAULT_CHANNEL_LAYER, None)
+            results.extend(
+                asyncio.run(
+                    _run_fanout(
+                        connections,
+                        min(users, connections),
+                        rates,
+                        duration_seconds,
+                        flush_interval_seconds,
+                        settle_seconds,
+                    )
+                )
+            )
+    channel_layers.backends.pop(DEFAULT_CHANNEL_LAYER, None)
+    return results
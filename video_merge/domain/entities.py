@@ -14,6 +14,31 @@ class JobStatus(StrEnum):
     FAILED = "failed"
 
 
+class OutputMode(StrEnum):
+    MP4 = "mp4"
+    HLS = "hls"
+
+
+class JobLane(StrEnum):
+    """Which worker pool a job is routed to, chosen from its estimated cost."""
+
+    FAST = "fast"
+    BULK = "bulk"
+
+
+# (stage, start timestamp, end timestamp) of MergeJob; a stage lasts from one recorded
+# transition to the next, and "total" spans enqueue to the persisted output.
+JOB_STAGES = (
+    ("upload", "created_at", "uploaded_at"),
+    ("enqueue", "uploaded_at", "enqueued_at"),
+    ("queue_wait", "enqueued_at", "started_at"),
+    ("startup", "started_at", "merge_started_at"),
+    ("merge", "merge_started_at", "merge_finished_at"),
+    ("persist", "merge_finished_at", "finished_at"),
+    ("total", "enqueued_at", "finished_at"),
+)
+
+
 @dataclass(frozen=True, slots=True)
 class VideoClip:
     id: int
@@ -21,6 +46,56 @@ class VideoClip:
     order: int
     original_name: str
     file_path: Path
+    content_hash: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class MergeJobDraft:
+    """A job to create from clips the owner already uploaded, referenced by content hash."""
+
+    name: str
+    clip_hashes: tuple[str, ...]
+    output_mode: OutputMode = OutputMode.MP4
+
+
+@dataclass(frozen=True, slots=True)
+class ClipRange:
+    """Contiguous clip orders, inclusive, merged as one part of a split job."""
+
+    first_order: int
+    last_order: int
+
+
+@dataclass(frozen=True, slots=True)
+class QueuedJob:
+    """A job handed to the queue under a new task id, replacing previous_task_id if it is still current."""
+
+    job_id: UUID
+    task_id: str
+    lane: JobLane = JobLane.FAST
+    previous_task_id: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class ClipUploadSession:
+    id: UUID
+    job_id: UUID
+    order: int
+    original_name: str
+    length: int
+    offset: int = 0
+
+    @property
+    def is_complete(self) -> bool:
+        return self.offset >= self.length
+
+
+@dataclass(frozen=True, slots=True)
+class MergeProgress:
+    out_time_seconds: float
+    percent: float | None = None
+    speed: float | None = None
+    eta_seconds: float | None = None
 
 
 @dataclass(frozen=True, slots=True)
@@ -33,9 +108,65 @@ class MergeJob:
     updated_at: datetime
     output_file_name: str | None = None
     error_message: str = ""
+    merged_through_order: int = 0
+    output_mode: OutputMode = OutputMode.MP4
+    lane: JobLane = JobLane.FAST
+    enqueued_at: datetime | None = None
+    started_at: datetime | None = None
+    task_id: str = ""
+    uploaded_at: datetime | None = None
+    merge_started_at: datetime | None = None
+    merge_finished_at: datetime | None = None
+    finished_at: datetime | None = None
+    input_bytes: int = 0
+    output_bytes: int = 0
     clips: tuple[VideoClip, ...] = field(default_factory=tuple)
 
     @property
     def is_finished(self) -> bool:
         return self.status in {JobStatus.COMPLETED, JobStatus.FAILED}
 
+    @property
+    def queue_wait_seconds(self) -> float | None:
+        return self.stage_seconds("queue_wait")
+
+    def stage_seconds(self, stage: str) -> float | None:
+        """Duration of one JOB_STAGES entry, or None while either end is unrecorded."""
+        _, start_field, end_field = next(entry for entry in JOB_STAGES if entry[0] == stage)
+        start, end = getattr(self, start_field), getattr(self, end_field)
+        if start is None or end is None:
+            return None
+        return max((end - start).total_seconds(), 0.0)
+
+    @property
+    def stage_durations(self) -> dict[str, float]:
+        durations = {stage: self.stage_seconds(stage) for stage, _, _ in JOB_STAGES}
+        return {stage: seconds for stage, seconds in durations.items() if seconds is not None}
+
+
+@dataclass(frozen=True, slots=True)
+class HistogramSample:
+    """One labelled Prometheus-style histogram; bucket_counts are cumulative and match the bounds."""
+
+    labels: dict[str, str]
+    bucket_counts: tuple[int, ...]
+    count: int
+    total: float
+
+
+@dataclass(frozen=True, slots=True)
+class JobMetrics:
+    duration_bounds: tuple[float, ...]
+    byte_bounds: tuple[int, ...]
+    stage_durations: tuple[HistogramSample, ...]
+    input_bytes: tuple[HistogramSample, ...]
+    output_bytes: tuple[HistogramSample, ...]
+    queued: dict[JobLane, int]
+    running: dict[JobLane, int]
+    oldest_queued_seconds: dict[JobLane, float]
+
+
+@dataclass(frozen=True, slots=True)
+class JobPage:
+    jobs: tuple[MergeJob, ...]
+    next_cursor: str | None = None
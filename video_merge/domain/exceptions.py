@@ -18,5 +18,17 @@ class MergeExecutionError(VideoMergeError):
     """Raised when FFmpeg command execution fails."""
 
 
+class UploadOffsetMismatchError(VideoMergeError):
+    """Raised when a resumable upload chunk does not start at the stored offset."""
+
+
+class UserConcurrencyLimitError(VideoMergeError):
+    """Raised when the owner already has as many running jobs as allowed; the job should wait."""
+
+
+class StaleTaskError(VideoMergeError):
+    """Raised when a queued task is no longer the one the job was last enqueued under."""
+
+
 class QueueUnavailableError(VideoMergeError):
     """Raised when job queue infrastructure is not reachable."""
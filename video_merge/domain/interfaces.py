@@ -1,28 +1,86 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 from pathlib import Path
-from typing import Iterable
+from typing import AsyncIterator, Callable, ContextManager, Iterable, Iterator, Sequence
 from uuid import UUID
 
-from .entities import JobStatus, MergeJob, VideoClip
+from .entities import (
+    ClipRange,
+    ClipUploadSession,
+    JobLane,
+    JobMetrics,
+    JobPage,
+    JobStatus,
+    MergeJob,
+    MergeJobDraft,
+    MergeProgress,
+    OutputMode,
+    QueuedJob,
+    VideoClip,
+)
+
+ProgressCallback = Callable[[MergeProgress], None]
 
 
 class MergeJobRepository(ABC):
     @abstractmethod
-    def create_job(self, owner_id: int, name: str) -> MergeJob:
+    def atomic(self) -> ContextManager[None]:
+        """Group several calls into one unit: everything written inside commits together or not at all."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_job(self, owner_id: int, name: str, output_mode: OutputMode = OutputMode.MP4) -> MergeJob:
         raise NotImplementedError
 
     @abstractmethod
     def add_clip(self, job_id: UUID, uploaded_file: object, order: int, original_name: str) -> VideoClip:
         raise NotImplementedError
 
+    @abstractmethod
+    def add_clips(
+        self,
+        job_id: UUID,
+        uploads: Sequence[tuple[object, str]],
+        first_order: int,
+    ) -> list[VideoClip]:
+        """Persist (uploaded_file, original_name) pairs as consecutive clips starting at first_order."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_jobs_from_blobs(self, owner_id: int, drafts: Sequence[MergeJobDraft]) -> list[MergeJob]:
+        """Create every draft with its clips atomically; unknown or foreign hashes are rejected."""
+        raise NotImplementedError
+
     @abstractmethod
     def get_user_job(self, user_id: int, job_id: UUID, include_clips: bool = False) -> MergeJob | None:
         raise NotImplementedError
 
     @abstractmethod
-    def list_user_jobs(self, user_id: int) -> list[MergeJob]:
+    def list_user_jobs(
+        self,
+        user_id: int,
+        status: JobStatus | None = None,
+        cursor: str | None = None,
+        limit: int = 25,
+    ) -> JobPage:
+        """Newest first; pass the previous page's next_cursor to continue."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def aget_user_job(self, user_id: int, job_id: UUID, include_clips: bool = False) -> MergeJob | None:
+        """get_user_job for async views, without blocking the event loop on the query."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def alist_user_jobs(
+        self,
+        user_id: int,
+        status: JobStatus | None = None,
+        cursor: str | None = None,
+        limit: int = 25,
+    ) -> JobPage:
         raise NotImplementedError
 
     @abstractmethod
@@ -30,21 +88,170 @@ class MergeJobRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def set_status(self, job_id: UUID, status: JobStatus, error_message: str = "") -> None:
+    def set_status(
+        self,
+        job_id: UUID,
+        status: JobStatus,
+        error_message: str = "",
+        task_id: str | None = None,
+    ) -> bool:
+        """Completed and failed transitions also stamp finished_at; returns whether the job was updated.
+
+        With a task_id, the job is left untouched unless it still belongs to that task.
+        """
         raise NotImplementedError
 
     @abstractmethod
-    def set_output_file(self, job_id: UUID, output_file_name: str) -> None:
+    def job_sizes(self, job_ids: Sequence[UUID]) -> dict[UUID, int]:
+        """Total stored clip bytes per job, used to estimate its cost."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def mark_enqueued(self, queued_jobs: Sequence[QueuedJob]) -> set[UUID]:
+        """Move jobs to pending under their new task ids; returns the ids whose compare-and-set won."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def start_job(
+        self,
+        owner_id: int,
+        job_id: UUID,
+        task_id: str | None = None,
+        max_running: int | None = None,
+        running_since: datetime | None = None,
+    ) -> bool:
+        """Mark the job running unless the owner already has max_running running jobs.
+
+        With running_since, jobs started before it count as abandoned by a dead worker and hold no slot.
+        With a task_id, raises StaleTaskError unless the job is pending under exactly that task.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def record_merge_window(self, job_id: UUID, started_at: datetime, finished_at: datetime) -> None:
+        """Widen the job's merge window to cover [started_at, finished_at]; split parts each report theirs."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_output_file(
+        self,
+        job_id: UUID,
+        output_file_name: str,
+        merged_through_order: int = 0,
+        output_bytes: int | None = None,
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def collect_metrics(self, duration_bounds: Sequence[float], byte_bounds: Sequence[int]) -> JobMetrics:
+        """Stage duration and byte histograms over all jobs, plus current queue depth per lane."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def publish_progress(self, owner_id: int, job_id: UUID, progress: MergeProgress) -> None:
+        raise NotImplementedError
+
+
+class ClipUploadStore(ABC):
+    @abstractmethod
+    def create_upload(self, job_id: UUID, order: int, original_name: str, length: int) -> ClipUploadSession:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_upload(self, owner_id: int, upload_id: UUID) -> ClipUploadSession | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_chunk(self, upload_id: UUID, offset: int, chunks: Iterator[bytes]) -> ClipUploadSession:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_job_uploads(self, job_id: UUID) -> list[ClipUploadSession]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def sweep_expired(self, idle_before: datetime) -> int:
+        """Delete unfinished uploads idle since before idle_before, with their partial files."""
         raise NotImplementedError
 
 
 class VideoMerger(ABC):
+    @property
+    def parameters_fingerprint(self) -> str:
+        """Identifies settings that change the merged output, used for result caching."""
+        return type(self).__name__
+
+    @abstractmethod
+    def merge(
+        self,
+        clip_paths: Iterable[Path],
+        output_path: Path,
+        progress_callback: ProgressCallback | None = None,
+        target: str = "",
+    ) -> None:
+        """With a target from plan_target, every clip is brought to that format instead of one chosen here."""
+        raise NotImplementedError
+
+    def plan_target(self, clip_paths: Iterable[Path]) -> str:
+        """Output format for merging clip_paths in parts, as an opaque JSON-safe string.
+
+        Each part passes it back to merge() so all parts come out alike; "" lets every merge choose.
+        """
+        return ""
+
     @abstractmethod
-    def merge(self, clip_paths: Iterable[Path], output_path: Path) -> None:
+    def merge_segmented(
+        self,
+        clip_paths: Iterable[Path],
+        playlist_path: Path,
+        progress_callback: ProgressCallback | None = None,
+    ) -> None:
+        """Write an HLS playlist with fMP4 segments into playlist_path's directory."""
         raise NotImplementedError
 
+    @abstractmethod
+    def stream(self, clip_paths: Iterable[Path]) -> AsyncIterator[bytes]:
+        """Concatenate clip_paths as fragmented MP4 and yield it asynchronously, without an output file."""
+        raise NotImplementedError
+
+    def append(
+        self,
+        base_path: Path,
+        clip_paths: Iterable[Path],
+        output_path: Path,
+        progress_callback: ProgressCallback | None = None,
+    ) -> bool:
+        """Write base_path followed by clip_paths to output_path; False means a full merge is needed."""
+        return False
+
 
 class MergeJobQueue(ABC):
     @abstractmethod
-    def enqueue_process_job(self, owner_id: int, job_id: UUID) -> str:
+    def enqueue_process_job(self, owner_id: int, queued: QueuedJob) -> str:
+        raise NotImplementedError
+
+    def enqueue_process_jobs(self, owner_id: int, queued_jobs: Sequence[QueuedJob]) -> list[str]:
+        return [self.enqueue_process_job(owner_id=owner_id, queued=queued) for queued in queued_jobs]
+
+    @abstractmethod
+    def enqueue_split_merge(
+        self,
+        owner_id: int,
+        job_id: UUID,
+        task_id: str,
+        ranges: Sequence[ClipRange],
+        lane: JobLane = JobLane.FAST,
+        target: str = "",
+    ) -> str:
+        """Merge every range to target as its own task, then concat the parts once all of them are done."""
+        raise NotImplementedError
+
+
+class MergeOutputCache(ABC):
+    @abstractmethod
+    def fetch(self, cache_key: str, output_path: Path) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def store(self, cache_key: str, output_path: Path) -> None:
         raise NotImplementedError
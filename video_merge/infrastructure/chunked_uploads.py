@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import os
+import secrets
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+from uuid import UUID
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from video_merge.domain.entities import ClipUploadSession
+from video_merge.domain.exceptions import InvalidInputError, JobNotFoundError, UploadOffsetMismatchError
+from video_merge.domain.interfaces import ClipUploadStore
+from video_merge.infrastructure.clip_storage import adopt_clip_file
+from video_merge.models import ClipUpload, MergeClip, MergeJob as MergeJobModel, clip_upload_path
+
+
+def _upload_to_entity(upload: ClipUpload) -> ClipUploadSession:
+    return ClipUploadSession(
+        id=upload.id,
+        job_id=upload.job_id,
+        order=upload.order,
+        original_name=upload.original_name,
+        length=upload.length,
+        offset=upload.offset,
+    )
+
+
+def _partial_path(upload: ClipUpload) -> Path:
+    return Path(default_storage.path(upload.file_name + ".part"))
+
+
+class DjangoClipUploadStore(ClipUploadStore):
+    """Assembles resumable uploads in place at the clip's final `clip_upload_path` location.
+
+    A PATCH first claims a write lease on the upload row with a conditional UPDATE, so two requests
+    for the same offset never write the file at the same time. The lease is refreshed while bytes
+    arrive; one left behind by a crashed request lapses after `write_lease_seconds`.
+    """
+
+    def __init__(self, write_lease_seconds: float = 300.0) -> None:
+        self._write_lease = timedelta(seconds=write_lease_seconds)
+
+    def create_upload(self, job_id: UUID, order: int, original_name: str, length: int) -> ClipUploadSession:
+        job = MergeJobModel.objects.filter(id=job_id).first()
+        if job is None:
+            raise JobNotFoundError("Yukleme yapilacak is bulunamadi.")
+
+        placeholder = MergeClip(job=job, order=order, original_name=original_name)
+        file_name = default_storage.get_available_name(clip_upload_path(placeholder, original_name))
+        upload = ClipUpload.objects.create(
+            job=job,
+            order=order,
+            original_name=original_name,
+            file_name=file_name,
+            length=length,
+        )
+        partial_path = _partial_path(upload)
+        partial_path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path.touch()
+        return _upload_to_entity(upload)
+
+    def get_upload(self, owner_id: int, upload_id: UUID) -> ClipUploadSession | None:
+        upload = ClipUpload.objects.filter(id=upload_id, job__owner_id=owner_id).first()
+        if upload is None:
+            return None
+        return _upload_to_entity(upload)
+
+    def write_chunk(self, upload_id: UUID, offset: int, chunks: Iterator[bytes]) -> ClipUploadSession:
+        upload = ClipUpload.objects.get(id=upload_id)
+        token = self._claim_write(upload_id, offset)
+        if token is None:
+            raise UploadOffsetMismatchError(f"Beklenen offset: {upload.offset}")
+
+        try:
+            position = self._write(upload, token, offset, chunks)
+            if position >= upload.length:
+                self._complete(upload, token)
+            elif not self._release(upload_id, token, offset=position):
+                raise UploadOffsetMismatchError("Yukleme baska bir istek tarafindan guncellendi.")
+        except BaseException:
+            self._release(upload_id, token)
+            raise
+
+        upload.offset = position
+        return _upload_to_entity(upload)
+
+    def _claim_write(self, upload_id: UUID, offset: int) -> str | None:
+        now = timezone.now()
+        token = secrets.token_hex(16)
+        claimed = (
+            ClipUpload.objects.filter(id=upload_id, offset=offset, completed_at__isnull=True)
+            .filter(Q(write_token="") | Q(write_claimed_at__lt=now - self._write_lease))
+            .update(write_token=token, write_claimed_at=now, last_activity_at=now)
+        )
+        return token if claimed else None
+
+    def _refresh_claim(self, upload_id: UUID, token: str) -> None:
+        now = timezone.now()
+        refreshed = ClipUpload.objects.filter(id=upload_id, write_token=token).update(
+            write_claimed_at=now, last_activity_at=now
+        )
+        if not refreshed:
+            raise UploadOffsetMismatchError("Yukleme baska bir istek tarafindan guncellendi.")
+
+    def _release(self, upload_id: UUID, token: str, offset: int | None = None) -> bool:
+        values: dict[str, object] = {"write_token": "", "write_claimed_at": None}
+        if offset is not None:
+            values.update(offset=offset, last_activity_at=timezone.now())
+        return bool(ClipUpload.objects.filter(id=upload_id, write_token=token).update(**values))
+
+    def _write(self, upload: ClipUpload, token: str, offset: int, chunks: Iterator[bytes]) -> int:
+        refresh_every = self._write_lease.total_seconds() / 3
+        refreshed_at = time.monotonic()
+        position = offset
+        with open(_partial_path(upload), "r+b") as partial_file:
+            partial_file.seek(offset)
+            for chunk in chunks:
+                if position + len(chunk) > upload.length:
+                    raise InvalidInputError("Yukleme bildirilen boyutu asiyor.")
+                partial_file.write(chunk)
+                position += len(chunk)
+                if time.monotonic() - refreshed_at >= refresh_every:
+                    self._refresh_claim(upload.id, token)
+                    refreshed_at = time.monotonic()
+        return position
+
+    def _complete(self, upload: ClipUpload, token: str) -> None:
+        # Hashing reads the whole file; it runs under the write lease only, not under a row lock,
+        # so other clips of the job keep uploading and finishing meanwhile.
+        self._refresh_claim(upload.id, token)
+        os.replace(_partial_path(upload), default_storage.path(upload.file_name))
+        blob = adopt_clip_file(upload.file_name, upload.original_name)
+
+        with transaction.atomic():
+            job = MergeJobModel.objects.select_for_update().get(id=upload.job_id)
+            clip = MergeClip(job=job, order=upload.order, original_name=upload.original_name, blob=blob)
+            clip.file.name = upload.file_name
+            clip.save()
+            completed_at = timezone.now()
+            ClipUpload.objects.filter(id=upload.id).update(
+                offset=upload.length,
+                completed_at=completed_at,
+                last_activity_at=completed_at,
+                write_token="",
+                write_claimed_at=None,
+            )
+            MergeJobModel.objects.filter(id=job.id).update(
+                uploaded_at=completed_at,
+                input_bytes=F("input_bytes") + upload.length,
+            )
+
+    def sweep_expired(self, idle_before: datetime) -> int:
+        expired = ClipUpload.objects.filter(completed_at__isnull=True, last_activity_at__lt=idle_before)
+        removed = 0
+        for upload in expired.only("id", "file_name"):
+            # Re-checked per row: a PATCH that resumed since the scan refreshed last_activity_at.
+            deleted, _ = ClipUpload.objects.filter(
+                id=upload.id, completed_at__isnull=True, last_activity_at__lt=idle_before
+            ).delete()
+            if deleted:
+                _partial_path(upload).unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def list_job_uploads(self, job_id: UUID) -> list[ClipUploadSession]:
+        return [_upload_to_entity(upload) for upload in ClipUpload.objects.filter(job_id=job_id)]
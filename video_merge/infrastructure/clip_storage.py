@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Sequence
+
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import ProtectedError
+
+from video_merge.models import ClipBlob, MergeClip, clip_blob_upload_path
+
+
+def compute_content_hash(uploaded_file: object) -> str:
+    digest = getattr(uploaded_file, "content_sha256", None)
+    if digest:
+        return digest
+
+    hasher = hashlib.sha256()
+    if hasattr(uploaded_file, "chunks"):
+        for chunk in uploaded_file.chunks():
+            hasher.update(chunk)
+    else:
+        hasher.update(uploaded_file.read())
+    if hasattr(uploaded_file, "seek"):
+        uploaded_file.seek(0)
+    return hasher.hexdigest()
+
+
+def store_clip_blob(uploaded_file: object, original_name: str) -> ClipBlob:
+    """Return the blob holding the upload's content, writing it only if it is not stored yet."""
+    digest = compute_content_hash(uploaded_file)
+
+    existing = ClipBlob.objects.filter(sha256=digest).first()
+    if existing is not None and existing.file and default_storage.exists(existing.file.name):
+        return existing
+
+    stale_file_name = existing.file.name if existing is not None else None
+    blob = existing or ClipBlob(sha256=digest)
+    blob.size = getattr(uploaded_file, "size", 0) or 0
+    blob.file.save(original_name, uploaded_file, save=False)
+    return _claim_blob(blob, stale_file_name)
+
+
+def _claim_blob(blob: ClipBlob, stale_file_name: str | None) -> ClipBlob:
+    """Insert a new blob row, or repoint a row whose file went missing (stale_file_name).
+
+    Both are compare-and-set, so of two concurrent writers of the same content exactly one wins;
+    the loser deletes its own copy and returns the winner's row.
+    """
+    if stale_file_name is None:
+        try:
+            with transaction.atomic():
+                blob.save(force_insert=True)
+            return blob
+        except IntegrityError:
+            pass
+    elif ClipBlob.objects.filter(sha256=blob.sha256, file=stale_file_name).update(
+        file=blob.file.name, size=blob.size
+    ):
+        return blob
+
+    default_storage.delete(blob.file.name)
+    return ClipBlob.objects.get(sha256=blob.sha256)
+
+
+def store_clip_blobs(uploads: Sequence[tuple[object, str]]) -> list[ClipBlob]:
+    """Batch form of store_clip_blob: one lookup for known content and one insert for new blobs."""
+    digests = [compute_content_hash(uploaded_file) for uploaded_file, _ in uploads]
+    known = ClipBlob.objects.in_bulk(set(digests))
+
+    blobs: dict[str, ClipBlob] = {}
+    created: list[ClipBlob] = []
+    for digest, (uploaded_file, original_name) in zip(digests, uploads):
+        if digest in blobs:
+            continue
+        existing = known.get(digest)
+        if existing is not None and existing.file and default_storage.exists(existing.file.name):
+            blobs[digest] = existing
+            continue
+        if existing is not None:
+            # The row outlived its file; rare enough to repair one at a time.
+            blobs[digest] = store_clip_blob(uploaded_file, original_name)
+            continue
+
+        blob = ClipBlob(sha256=digest, size=getattr(uploaded_file, "size", 0) or 0)
+        blob.file.save(original_name, uploaded_file, save=False)
+        blobs[digest] = blob
+        created.append(blob)
+
+    if created:
+        ClipBlob.objects.bulk_create(created, ignore_conflicts=True)
+        stored = ClipBlob.objects.in_bulk([blob.sha256 for blob in created])
+        for blob in created:
+            winner = stored[blob.sha256]
+            if winner.file.name != blob.file.name:
+                # A concurrent upload of the same content won the race; keep its copy.
+                default_storage.delete(blob.file.name)
+                blobs[blob.sha256] = winner
+
+    return [blobs[digest] for digest in digests]
+
+
+def hash_stored_file(file_name: str) -> str:
+    hasher = hashlib.sha256()
+    with default_storage.open(file_name, "rb") as stored_file:
+        for chunk in stored_file.chunks():
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def adopt_clip_file(file_name: str, original_name: str) -> ClipBlob:
+    """Register an already assembled clip file as a blob, or swap it for an existing blob's link."""
+    digest = hash_stored_file(file_name)
+
+    existing = ClipBlob.objects.filter(sha256=digest).first()
+    if existing is not None and existing.file and default_storage.exists(existing.file.name):
+        default_storage.delete(file_name)
+        link_blob(existing, file_name)
+        return existing
+
+    stale_file_name = existing.file.name if existing is not None else None
+    blob = existing or ClipBlob(sha256=digest)
+    blob.size = default_storage.size(file_name)
+    blob_name = default_storage.get_available_name(clip_blob_upload_path(blob, original_name))
+    blob_path = Path(default_storage.path(blob_name))
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(default_storage.path(file_name), blob_path)
+    except OSError:
+        shutil.copyfile(default_storage.path(file_name), blob_path)
+    blob.file.name = blob_name
+    return _claim_blob(blob, stale_file_name)
+
+
+def _link_or_copy(source_path: Path, target_path: Path) -> None:
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source_path, target_path)
+    except OSError:
+        shutil.copyfile(source_path, target_path)
+
+
+def link_blob(blob: ClipBlob, target_name: str) -> str:
+    """Expose the blob under a per-job path with a hardlink, copying only across filesystems."""
+    target_name = default_storage.get_available_name(target_name)
+    _link_or_copy(Path(blob.file.path), Path(default_storage.path(target_name)))
+    return target_name
+
+
+def link_blob_on_commit(blob: ClipBlob, target_name: str) -> str:
+    """link_blob deferred until the current transaction commits, so a rollback leaves no stray links.
+
+    target_name is used as is: only for paths nobody else can claim meanwhile, like a new job's clips.
+    """
+    source_path = Path(blob.file.path)
+    target_path = Path(default_storage.path(target_name))
+    transaction.on_commit(lambda: _link_or_copy(source_path, target_path))
+    return target_name
+
+
+def release_clip_files(file_name: str, blob_id: str | None) -> None:
+    if file_name and not MergeClip.objects.filter(file=file_name).exists():
+        default_storage.delete(file_name)
+
+    if blob_id is None or MergeClip.objects.filter(blob_id=blob_id).exists():
+        return
+
+    blob = ClipBlob.objects.filter(sha256=blob_id).first()
+    if blob is None:
+        return
+    blob_file_name = blob.file.name
+    try:
+        blob.delete()
+    except ProtectedError:
+        return
+    if blob_file_name:
+        default_storage.delete(blob_file_name)
@@ -1,45 +1,180 @@
 from __future__ import annotations
 
+import logging
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 
 from django.conf import settings
 
 from video_merge.application.use_cases import (
+    AbandonWaitingJobUseCase,
+    AppendClipsUseCase,
+    CompleteSplitMergeUseCase,
+    CreateJobBatchUseCase,
+    CreateClipUploadUseCase,
     CreateMergeJobUseCase,
+    CreateUploadJobUseCase,
     EnqueueMergeJobUseCase,
+    FinalizeUploadedJobUseCase,
+    GetClipUploadUseCase,
+    GetJobMetricsUseCase,
     GetUserJobUseCase,
     ListUserJobsUseCase,
+    MergeClipRangeUseCase,
     ProcessMergeJobUseCase,
+    StreamMergedJobUseCase,
+    SweepExpiredUploadsUseCase,
+    WriteUploadChunkUseCase,
 )
+from video_merge.infrastructure.chunked_uploads import DjangoClipUploadStore
+from video_merge.infrastructure.ffmpeg_capabilities import FFmpegCapabilities, require_ffmpeg_capabilities
 from video_merge.infrastructure.ffmpeg_merger import FFmpegVideoMerger
+from video_merge.infrastructure.output_cache import FileSystemMergeOutputCache
 from video_merge.infrastructure.queue import CeleryMergeJobQueue
 from video_merge.infrastructure.repositories import DjangoMergeJobRepository
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class UseCaseBundle:
     create_job: CreateMergeJobUseCase
+    append_clips: AppendClipsUseCase
     enqueue_job: EnqueueMergeJobUseCase
+    create_job_batch: CreateJobBatchUseCase
     process_job: ProcessMergeJobUseCase
+    abandon_waiting_job: AbandonWaitingJobUseCase
+    merge_clip_range: MergeClipRangeUseCase
+    complete_split_merge: CompleteSplitMergeUseCase
+    stream_job: StreamMergedJobUseCase
     list_jobs: ListUserJobsUseCase
     get_job: GetUserJobUseCase
+    create_upload_job: CreateUploadJobUseCase
+    create_clip_upload: CreateClipUploadUseCase
+    get_clip_upload: GetClipUploadUseCase
+    write_upload_chunk: WriteUploadChunkUseCase
+    finalize_upload_job: FinalizeUploadedJobUseCase
+    sweep_uploads: SweepExpiredUploadsUseCase
+    job_metrics: GetJobMetricsUseCase
+
+
+_bundle: UseCaseBundle | None = None
+_bundle_lock = threading.Lock()
 
 
 def build_use_case_bundle() -> UseCaseBundle:
+    """Return the process-wide bundle, building it on first use.
+
+    Every object in the bundle is stateless per call, so requests, consumers and tasks share it.
+    """
+    global _bundle
+    if _bundle is None:
+        with _bundle_lock:
+            if _bundle is None:
+                _bundle = _create_use_case_bundle()
+    return _bundle
+
+
+def reset_use_case_bundle(**kwargs) -> None:
+    """setting_changed receiver: the bundle captures settings when it is built."""
+    global _bundle
+    with _bundle_lock:
+        _bundle = None
+
+
+def warm_up_worker_container() -> FFmpegCapabilities:
+    """Probe ffmpeg and build the bundle before a worker accepts tasks.
+
+    Raises FFmpegUnavailableError for a missing or incomplete ffmpeg or a missing ffprobe, so the worker fails to boot.
+    """
+    global _bundle
+    capabilities = require_ffmpeg_capabilities(
+        getattr(settings, "FFMPEG_BINARY", "ffmpeg"),
+        getattr(settings, "FFPROBE_BINARY", "ffprobe"),
+    )
+    with _bundle_lock:
+        _bundle = _create_use_case_bundle(capabilities)
+    logger.info("Worker hazir: %s (ffprobe: %s)", capabilities.version, capabilities.ffprobe_path)
+    return capabilities
+
+
+def _create_use_case_bundle(capabilities: FFmpegCapabilities | None = None) -> UseCaseBundle:
     repository = DjangoMergeJobRepository()
     queue = CeleryMergeJobQueue()
-    merger = FFmpegVideoMerger(ffmpeg_binary=getattr(settings, "FFMPEG_BINARY", "ffmpeg"))
+    upload_store = DjangoClipUploadStore(
+        write_lease_seconds=getattr(settings, "CHUNKED_UPLOAD_WRITE_LEASE_SECONDS", 300),
+    )
+    merger = FFmpegVideoMerger(
+        ffmpeg_binary=getattr(settings, "FFMPEG_BINARY", "ffmpeg"),
+        ffprobe_binary=getattr(settings, "FFPROBE_BINARY", "ffprobe"),
+        normalize_workers=getattr(settings, "FFMPEG_NORMALIZE_WORKERS", 2),
+        log_dir=Path(settings.FFMPEG_LOG_DIR) if getattr(settings, "FFMPEG_LOG_DIR", "") else None,
+        capabilities=capabilities,
+    )
     media_root = Path(settings.MEDIA_ROOT)
+    output_cache = None
+    if getattr(settings, "MERGE_OUTPUT_CACHE_ENABLED", False):
+        output_cache = FileSystemMergeOutputCache(
+            cache_root=media_root / "merged_outputs" / "cache",
+            max_bytes=getattr(settings, "MERGE_OUTPUT_CACHE_MAX_BYTES", 50 * 1024**3),
+        )
+    bulk_threshold_bytes = getattr(settings, "MERGE_BULK_THRESHOLD_BYTES", None)
+    # Eager tasks run inside the request and an eager retry recurses instead of waiting,
+    # so the per-user cap only applies when a real worker pool picks the jobs up. Splitting
+    # a job only pays off when its ranges can run on several workers.
+    max_running_per_user = None
+    split_range_clips = None
+    if not getattr(settings, "CELERY_TASK_ALWAYS_EAGER", False):
+        max_running_per_user = getattr(settings, "MERGE_MAX_RUNNING_PER_USER", None)
+        split_range_clips = getattr(settings, "MERGE_SPLIT_RANGE_CLIPS", None)
+    progress_interval_seconds = getattr(settings, "MERGE_PROGRESS_INTERVAL_SECONDS", 1.0)
 
     return UseCaseBundle(
         create_job=CreateMergeJobUseCase(repository=repository),
-        enqueue_job=EnqueueMergeJobUseCase(repository=repository, queue=queue),
+        append_clips=AppendClipsUseCase(repository=repository),
+        enqueue_job=EnqueueMergeJobUseCase(
+            repository=repository,
+            queue=queue,
+            bulk_threshold_bytes=bulk_threshold_bytes,
+        ),
+        create_job_batch=CreateJobBatchUseCase(
+            repository=repository,
+            queue=queue,
+            max_jobs=getattr(settings, "MERGE_BATCH_MAX_JOBS", 100),
+            bulk_threshold_bytes=bulk_threshold_bytes,
+        ),
         process_job=ProcessMergeJobUseCase(
             repository=repository,
             merger=merger,
             media_root=media_root,
+            progress_interval_seconds=progress_interval_seconds,
+            output_cache=output_cache,
+            max_running_per_user=max_running_per_user,
+            queue=queue,
+            split_range_clips=split_range_clips,
+            running_stale_seconds=getattr(settings, "CELERY_TASK_TIME_LIMIT", None),
         ),
+        abandon_waiting_job=AbandonWaitingJobUseCase(repository=repository),
+        merge_clip_range=MergeClipRangeUseCase(repository=repository, merger=merger, media_root=media_root),
+        complete_split_merge=CompleteSplitMergeUseCase(
+            repository=repository,
+            merger=merger,
+            media_root=media_root,
+            progress_interval_seconds=progress_interval_seconds,
+            output_cache=output_cache,
+        ),
+        stream_job=StreamMergedJobUseCase(repository=repository, merger=merger),
         list_jobs=ListUserJobsUseCase(repository=repository),
         get_job=GetUserJobUseCase(repository=repository),
+        create_upload_job=CreateUploadJobUseCase(repository=repository),
+        create_clip_upload=CreateClipUploadUseCase(repository=repository, upload_store=upload_store),
+        get_clip_upload=GetClipUploadUseCase(upload_store=upload_store),
+        write_upload_chunk=WriteUploadChunkUseCase(upload_store=upload_store),
+        finalize_upload_job=FinalizeUploadedJobUseCase(repository=repository, upload_store=upload_store),
+        sweep_uploads=SweepExpiredUploadsUseCase(
+            upload_store=upload_store,
+            expire_seconds=getattr(settings, "CHUNKED_UPLOAD_EXPIRE_SECONDS", 24 * 3600),
+        ),
+        job_metrics=GetJobMetricsUseCase(repository=repository),
     )
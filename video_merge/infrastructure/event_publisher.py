@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from uuid import UUID
+
+from channels.layers import get_channel_layer
+
+from video_merge.infrastructure.tracing import SpanContext, SpanKind, current_span_context, start_span
+
+logger = logging.getLogger(__name__)
+
+STATUS_EVENT_TYPE = "job.status.event"
+PROGRESS_EVENT_TYPE = "job.progress.event"
+
+
+class CoalescingEventPublisher:
+    """Buffers channel-layer events per job and sends them in batches from a background thread.
+
+    Only the newest event of each type is kept per job, and a status event drops the job's
+    pending progress event, so a burst of transitions costs one send per job per flush.
+    Callers never wait on the channel layer.
+    """
+
+    def __init__(self, flush_interval_seconds: float = 0.25, channel_layer=None, background: bool = True) -> None:
+        self._flush_interval = flush_interval_seconds
+        self._channel_layer = channel_layer
+        # Without the background thread the owner drains the buffer itself, e.g. on its own event loop.
+        self._background = background
+        # (job, event type) -> (group, event, span context of the publishing call)
+        self._pending: dict[tuple[UUID, str], tuple[str, dict[str, object], SpanContext | None]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def publish(self, group: str, job_id: UUID, event: dict[str, object]) -> None:
+        event_type = str(event["type"])
+        with self._lock:
+            if event_type == STATUS_EVENT_TYPE:
+                self._pending.pop((job_id, PROGRESS_EVENT_TYPE), None)
+            # Re-inserting moves the key to the end, so the batch keeps the order of the latest events.
+            self._pending.pop((job_id, event_type), None)
+            self._pending[(job_id, event_type)] = (group, event, current_span_context())
+            if self._background and self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="job-event-publisher", daemon=True)
+                self._thread.start()
+
+    def flush(self) -> int:
+        """Send everything buffered so far from the calling thread; returns the number of events sent."""
+        if not self._pending:
+            return 0
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.drain())
+
+    async def drain(self) -> int:
+        """Send everything buffered so far on the running event loop; returns the number of events sent."""
+        with self._lock:
+            batch = list(self._pending.values())
+            self._pending.clear()
+        if batch:
+            await self._send_batch(batch)
+        return len(batch)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._wakeup.set()
+        if thread is not None:
+            thread.join(timeout=5)
+        else:
+            self.flush()
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self._flush_interval)
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001
+                logger.warning("Job event batch publish failed", exc_info=True)
+            if self._closed:
+                return
+
+    async def _send_batch(self, batch: list[tuple[str, dict[str, object], SpanContext | None]]) -> None:
+        channel_layer = self._channel_layer or get_channel_layer()
+        if channel_layer is None:
+            return
+
+        results = await asyncio.gather(
+            *(self._send_one(channel_layer, group, event, parent) for group, event, parent in batch),
+            return_exceptions=True,
+        )
+        for (group, _event, _parent), result in zip(batch, results):
+            if isinstance(result, Exception):
+                logger.warning("Job event publish failed for group=%s", group, exc_info=result)
+
+    @staticmethod
+    async def _send_one(channel_layer, group: str, event: dict[str, object], parent: SpanContext | None) -> None:
+        # The span hangs off the publishing call's span, so a delayed send shows up in that job's trace.
+        with start_span("channel.group_send", kind=SpanKind.PRODUCER, parent=parent, group=group):
+            await channel_layer.group_send(group, event)
+
+
+_publisher: CoalescingEventPublisher | None = None
+_publisher_pid: int | None = None
+_publisher_lock = threading.Lock()
+
+
+def get_event_publisher(flush_interval_seconds: float = 0.25) -> CoalescingEventPublisher:
+    """Return this process's publisher; a forked pool process gets its own buffer and thread."""
+    global _publisher, _publisher_pid
+    if _publisher is None or _publisher_pid != os.getpid():
+        with _publisher_lock:
+            if _publisher is None or _publisher_pid != os.getpid():
+                _publisher = CoalescingEventPublisher(flush_interval_seconds)
+                _publisher_pid = os.getpid()
+                atexit.register(close_event_publisher)
+    return _publisher
+
+
+def set_event_publisher(publisher: CoalescingEventPublisher | None) -> CoalescingEventPublisher | None:
+    """Install publisher as this process's publisher and return the previous one (used by load tests)."""
+    global _publisher, _publisher_pid
+    with _publisher_lock:
+        previous, _publisher, _publisher_pid = _publisher, publisher, os.getpid()
+    return previous
+
+
+def close_event_publisher() -> None:
+    """Flush and stop this process's publisher, e.g. when a worker process shuts down."""
+    global _publisher
+    with _publisher_lock:
+        publisher, _publisher = _publisher, None
+    if publisher is not None and _publisher_pid == os.getpid():
+        publisher.close()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass
+from functools import lru_cache
+
+from video_merge.domain.exceptions import FFmpegUnavailableError
+from video_merge.infrastructure.tracing import SpanKind, start_span
+
+# What the merge pipeline cannot work without: the concat/normalize fallbacks encode
+# H.264 + AAC, and output is either a single MP4 or an HLS playlist.
+REQUIRED_ENCODERS = frozenset({"libx264", "aac"})
+REQUIRED_MUXERS = frozenset({"mp4", "hls"})
+
+# `ffmpeg -encoders` rows look like " V....D libx264  libx264 H.264 ...", `-muxers` rows like
+# "  E mp4  MP4 (MPEG-4 Part 14)"; the flag column is followed by the name.
+ENCODER_LINE = re.compile(r"^\s*[VAS][A-Z.]{5}\s+(\S+)")
+MUXER_LINE = re.compile(r"^\s*D?E\S*\s+(\S+)")
+
+
+@dataclass(frozen=True, slots=True)
+class FFmpegCapabilities:
+    ffmpeg_path: str
+    ffprobe_path: str | None
+    version: str
+    encoders: frozenset[str]
+    muxers: frozenset[str]
+
+    def missing_requirements(self) -> list[str]:
+        # Without ffprobe clips cannot be profiled, so mismatched formats would be concatenated blind.
+        missing = ["binary:ffprobe"] if self.ffprobe_path is None else []
+        missing += [f"encoder:{name}" for name in sorted(REQUIRED_ENCODERS - self.encoders)]
+        missing += [f"muxer:{name}" for name in sorted(REQUIRED_MUXERS - self.muxers)]
+        return missing
+
+
+def parse_ffmpeg_listing(output: str, pattern: re.Pattern[str]) -> frozenset[str]:
+    names: set[str] = set()
+    past_header = False
+    for line in output.splitlines():
+        if line.strip().startswith("--"):
+            past_header = True
+            continue
+        match = pattern.match(line) if past_header else None
+        if match:
+            # Muxers such as "mov,mp4,m4a,3gp,3g2,mj2" are listed under one comma-joined name.
+            names.update(match.group(1).split(","))
+    return frozenset(names)
+
+
+def _run_listing(ffmpeg_path: str, *args: str) -> str:
+    with start_span("ffmpeg.listing", kind=SpanKind.CLIENT, args=" ".join(args)):
+        result = subprocess.run(
+            [ffmpeg_path, "-hide_banner", *args],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    if result.returncode != 0:
+        raise FFmpegUnavailableError(f"{ffmpeg_path} {' '.join(args)} calistirilamadi: {result.stderr.strip()}")
+    return result.stdout
+
+
+@lru_cache(maxsize=None)
+def load_ffmpeg_capabilities(ffmpeg_binary: str = "ffmpeg", ffprobe_binary: str = "ffprobe") -> FFmpegCapabilities:
+    """Resolve the binaries and list what this ffmpeg build can do, once per process.
+
+    Failures are not cached, so a fixed PATH is picked up on the next call.
+    """
+    ffmpeg_path = shutil.which(ffmpeg_binary)
+    if ffmpeg_path is None:
+        raise FFmpegUnavailableError("FFmpeg executable bulunamadi.")
+
+    version_lines = _run_listing(ffmpeg_path, "-version").splitlines()
+    return FFmpegCapabilities(
+        ffmpeg_path=ffmpeg_path,
+        ffprobe_path=shutil.which(ffprobe_binary),
+        version=version_lines[0].strip() if version_lines else "",
+        encoders=parse_ffmpeg_listing(_run_listing(ffmpeg_path, "-encoders"), ENCODER_LINE),
+        muxers=parse_ffmpeg_listing(_run_listing(ffmpeg_path, "-muxers"), MUXER_LINE),
+    )
+
+
+def require_ffmpeg_capabilities(ffmpeg_binary: str = "ffmpeg", ffprobe_binary: str = "ffprobe") -> FFmpegCapabilities:
+    capabilities = load_ffmpeg_capabilities(ffmpeg_binary, ffprobe_binary)
+    missing = capabilities.missing_requirements()
+    if missing:
+        raise FFmpegUnavailableError(f"{capabilities.version} gerekli ozellikleri desteklemiyor: {', '.join(missing)}")
+    return capabilities
@@ -1,44 +1,314 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import os
 import shutil
-import subprocess
 import tempfile
+from contextlib import aclosing
+from dataclasses import asdict
 from pathlib import Path
-from typing import Iterable
+from typing import AsyncIterator, Iterable, Sequence
 
-from video_merge.domain.exceptions import FFmpegUnavailableError, MergeExecutionError
-from video_merge.domain.interfaces import VideoMerger
+from video_merge.domain.exceptions import MergeExecutionError
+from video_merge.domain.interfaces import ProgressCallback, VideoMerger
+from video_merge.infrastructure.ffmpeg_capabilities import FFmpegCapabilities, load_ffmpeg_capabilities
+from video_merge.infrastructure.ffmpeg_process import FFMPEG_LOG_ARGS, FFmpegLogSummary, astream_ffmpeg, run_ffmpeg
+from video_merge.infrastructure.ffmpeg_progress import FFmpegProgressParser
+from video_merge.infrastructure.ffprobe import ClipStreamProfile, FFprobeClipProber
+from video_merge.infrastructure.normalization import (
+    NORMALIZE_PROFILE,
+    ClipNormalizer,
+    needs_normalization,
+    needs_video_reencode,
+)
+
+LEGACY_CODEC_ARGS = ("-c:v", "copy", "-c:a", "aac")
+HLS_SEGMENT_SECONDS = 6
+# Fragmented MP4 needs no seekable output: the moov box is written empty up front
+# and every keyframe starts a self-contained moof/mdat pair.
+STREAM_MOVFLAGS = "frag_keyframe+empty_moov+default_base_moof"
+# Audio codecs the mp4 muxer accepts as-is (ffprobe codec names); anything else, PCM for example, is
+# re-encoded to AAC even when every clip matches.
+MP4_AUDIO_CODECS = frozenset({"aac", "mp3", "alac", "opus", "flac", "ac3", "eac3"})
+
+
+def select_codec_args(profiles: Sequence[ClipStreamProfile] | None) -> list[str]:
+    if not profiles:
+        return list(LEGACY_CODEC_ARGS)
+
+    # Video mismatches are resolved by the normalization stage before concat.
+    audio_signatures = {profile.audio_signature for profile in profiles}
+    if len(audio_signatures) == 1:
+        audio_codec = profiles[0].audio_codec
+        if audio_codec is None or audio_codec in MP4_AUDIO_CODECS:
+            return ["-c", "copy"]
+    return ["-c:v", "copy", "-c:a", "aac"]
+
+
+def _raise_on_failed_stream(returncode: int, log_summary: FFmpegLogSummary) -> None:
+    if returncode != 0:
+        raise MergeExecutionError(log_summary.format())
 
 
 class FFmpegVideoMerger(VideoMerger):
-    def __init__(self, ffmpeg_binary: str = "ffmpeg") -> None:
+    def __init__(
+        self,
+        ffmpeg_binary: str = "ffmpeg",
+        ffprobe_binary: str = "ffprobe",
+        normalize_workers: int = 2,
+        log_dir: Path | None = None,
+        capabilities: FFmpegCapabilities | None = None,
+    ) -> None:
+        if capabilities is not None:
+            ffmpeg_binary = capabilities.ffmpeg_path
+            ffprobe_binary = capabilities.ffprobe_path or ffprobe_binary
         self._ffmpeg_binary = ffmpeg_binary
+        self._ffprobe_binary = ffprobe_binary
+        self._capabilities = capabilities
+        self._normalizer = ClipNormalizer(
+            ffmpeg_binary=ffmpeg_binary,
+            max_workers=normalize_workers,
+            encoders=capabilities.encoders if capabilities is not None else None,
+        )
+        self._log_dir = log_dir
 
-    def merge(self, clip_paths: Iterable[Path], output_path: Path) -> None:
-        if shutil.which(self._ffmpeg_binary) is None:
-            raise FFmpegUnavailableError("FFmpeg executable bulunamadi.")
+    @property
+    def capabilities(self) -> FFmpegCapabilities:
+        """Probed once per process; workers inject it at boot so a broken install fails early."""
+        if self._capabilities is None:
+            self._capabilities = load_ffmpeg_capabilities(self._ffmpeg_binary, self._ffprobe_binary)
+        return self._capabilities
+
+    def _log_path(self, output_path: Path, stage: str) -> Path | None:
+        if self._log_dir is None:
+            return None
+        return self._log_dir / f"{output_path.stem}.{stage}.log"
+
+    @property
+    def parameters_fingerprint(self) -> str:
+        return f"ffmpeg-concat:v1:{NORMALIZE_PROFILE}"
+
+    def _probe_clips(self, clip_paths: list[Path]) -> list[ClipStreamProfile] | None:
+        ffprobe_path = self.capabilities.ffprobe_path
+        if ffprobe_path is None:
+            return None
+
+        prober = FFprobeClipProber(ffprobe_binary=ffprobe_path)
+        return [prober.probe(clip_path) for clip_path in clip_paths]
+
+    def plan_target(self, clip_paths: Iterable[Path]) -> str:
+        self._ensure_ffmpeg()
+        profiles = self._probe_clips(list(clip_paths))
+        if not profiles:
+            return ""
+        target_profile = self._normalizer.select_target(profiles)
+        # Decided once for the job: a range whose clips all match still re-encodes if another range must,
+        # so every part carries the same encoder parameter sets.
+        return json.dumps(
+            {"profile": asdict(target_profile), "reencode_video": needs_video_reencode(profiles, target_profile)}
+        )
+
+    def merge(
+        self,
+        clip_paths: Iterable[Path],
+        output_path: Path,
+        progress_callback: ProgressCallback | None = None,
+        target: str = "",
+    ) -> None:
+        target_profile = None
+        reencode_video = None
+        if target:
+            plan = json.loads(target)
+            target_profile = ClipStreamProfile(**plan["profile"])
+            reencode_video = plan["reencode_video"]
+        self._merge_into(
+            list(clip_paths),
+            output_path,
+            progress_callback,
+            target_profile=target_profile,
+            reencode_video=reencode_video,
+        )
+
+    def merge_segmented(
+        self,
+        clip_paths: Iterable[Path],
+        playlist_path: Path,
+        progress_callback: ProgressCallback | None = None,
+    ) -> None:
+        segment_dir = playlist_path.parent
+        if segment_dir.exists():
+            shutil.rmtree(segment_dir)
+        segment_dir.mkdir(parents=True)
+
+        # An EVENT playlist is rewritten after every finished segment, and temp_file keeps
+        # half-written segments out of it, so playback can start while ffmpeg is running.
+        segment_args = [
+            "-f",
+            "hls",
+            "-hls_time",
+            str(HLS_SEGMENT_SECONDS),
+            "-hls_playlist_type",
+            "event",
+            "-hls_segment_type",
+            "fmp4",
+            "-hls_fmp4_init_filename",
+            "init.mp4",
+            "-hls_flags",
+            "independent_segments+temp_file",
+            "-hls_segment_filename",
+            str(segment_dir / "segment_%05d.m4s"),
+        ]
+        self._merge_into(list(clip_paths), playlist_path, progress_callback, segment_args)
+
+    def _merge_into(
+        self,
+        clip_paths: list[Path],
+        output_path: Path,
+        progress_callback: ProgressCallback | None,
+        segment_args: list[str] | None = None,
+        target_profile: ClipStreamProfile | None = None,
+        reencode_video: bool | None = None,
+    ) -> None:
+        self._ensure_ffmpeg()
 
-        clip_paths = list(clip_paths)
         if not clip_paths:
             raise MergeExecutionError("Birlesecek video listesi bos.")
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        profiles = self._probe_clips(clip_paths)
+        progress_parser = FFmpegProgressParser(sum(profile.duration for profile in profiles or ()))
+        if not profiles:
+            target_profile = None
+
+        if target_profile is None and not needs_normalization(profiles):
+            codec_args = select_codec_args(profiles)
+            self._concat(clip_paths, output_path, codec_args, progress_parser, progress_callback, segment_args)
+            return
+
+        work_parent = output_path.parent if segment_args is None else output_path.parent.parent
+        with tempfile.TemporaryDirectory(prefix=".normalize-", dir=work_parent) as work_dir:
+            normalized_paths = self._normalizer.normalize(
+                clip_paths,
+                profiles,
+                Path(work_dir),
+                log_path=self._log_path(output_path, "normalize"),
+                target=target_profile,
+                reencode_video=reencode_video,
+            )
+            self._concat(
+                normalized_paths,
+                output_path,
+                ["-c", "copy"],
+                progress_parser,
+                progress_callback,
+                segment_args,
+            )
+
+    def append(
+        self,
+        base_path: Path,
+        clip_paths: Iterable[Path],
+        output_path: Path,
+        progress_callback: ProgressCallback | None = None,
+    ) -> bool:
+        self._ensure_ffmpeg()
+
+        clip_paths = list(clip_paths)
+        if not clip_paths:
+            return False
+
+        profiles = self._probe_clips([base_path, *clip_paths])
+        if profiles is None:
+            return False
+        if len({profile.video_signature for profile in profiles}) > 1:
+            return False
+        if len({profile.audio_signature for profile in profiles}) > 1:
+            return False
 
-        list_file_path: Path | None = None
+        progress_parser = FFmpegProgressParser(sum(profile.duration for profile in profiles))
+        self._concat([base_path, *clip_paths], output_path, ["-c", "copy"], progress_parser, progress_callback)
+        return True
+
+    def stream(self, clip_paths: Iterable[Path]) -> AsyncIterator[bytes]:
+        # Everything that can fail before the first byte runs eagerly here, so callers
+        # can still answer with an error status instead of a truncated body.
+        self._ensure_ffmpeg()
+
+        clip_paths = list(clip_paths)
+        if not clip_paths:
+            raise MergeExecutionError("Birlesecek video listesi bos.")
+
+        profiles = self._probe_clips(clip_paths)
+        if needs_normalization(profiles):
+            raise MergeExecutionError(
+                "Videolarin goruntu formatlari farkli; akisla birlestirme yerine normal birlestirme kullanin."
+            )
+        return self._stream_concat(clip_paths, select_codec_args(profiles))
+
+    async def _stream_concat(self, clip_paths: list[Path], codec_args: list[str]) -> AsyncIterator[bytes]:
+        list_file_path = await asyncio.to_thread(self._write_concat_list, clip_paths)
         try:
-            with tempfile.NamedTemporaryFile(
-                mode="w",
-                suffix=".txt",
-                delete=False,
-                encoding="utf-8",
-            ) as list_file:
-                list_file_path = Path(list_file.name)
-                for clip_path in clip_paths:
-                    normalized_path = clip_path.resolve().as_posix().replace("'", r"'\''")
-                    list_file.write(f"file '{normalized_path}'\n")
+            command = [
+                self._ffmpeg_binary,
+                *FFMPEG_LOG_ARGS,
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                str(list_file_path),
+                *codec_args,
+                "-movflags",
+                STREAM_MOVFLAGS,
+                "-f",
+                "mp4",
+                "pipe:1",
+            ]
+            # aclosing: an early close of this iterator must reach the pipe reader now, not at GC.
+            async with aclosing(astream_ffmpeg(command, on_exit=_raise_on_failed_stream)) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+        finally:
+            list_file_path.unlink(missing_ok=True)
+
+    def _ensure_ffmpeg(self) -> FFmpegCapabilities:
+        # Raises FFmpegUnavailableError when the binary is missing; cached after the first success.
+        return self.capabilities
+
+    @staticmethod
+    def _write_concat_list(clip_paths: list[Path]) -> Path:
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            suffix=".txt",
+            delete=False,
+            encoding="utf-8",
+        ) as list_file:
+            for clip_path in clip_paths:
+                normalized_path = clip_path.resolve().as_posix().replace("'", r"'\''")
+                list_file.write(f"file '{normalized_path}'\n")
+        return Path(list_file.name)
 
+    def _concat(
+        self,
+        clip_paths: list[Path],
+        output_path: Path,
+        codec_args: list[str],
+        progress_parser: FFmpegProgressParser,
+        progress_callback: ProgressCallback | None,
+        segment_args: list[str] | None = None,
+    ) -> None:
+        # Render next to the target and swap it in, so the previous output (which may be
+        # one of the inputs, or share an inode with a cache entry) is never truncated.
+        # Segmented output is written in place because it is meant to be read while growing.
+        partial_path = output_path
+        if segment_args is None:
+            partial_path = output_path.with_name(f".{output_path.stem}.partial{output_path.suffix}")
+        list_file_path = self._write_concat_list(clip_paths)
+        try:
             command = [
                 self._ffmpeg_binary,
+                *FFMPEG_LOG_ARGS,
                 "-y",
                 "-f",
                 "concat",
@@ -46,22 +316,30 @@ class FFmpegVideoMerger(VideoMerger):
                 "0",
                 "-i",
                 str(list_file_path),
-                "-c:v",
-                "copy",
-                "-c:a",
-                "aac",
-                str(output_path),
+                *codec_args,
+                *(segment_args or ()),
+                "-progress",
+                "pipe:1",
+                "-nostats",
+                str(partial_path),
             ]
 
-            result = subprocess.run(
+            def handle_progress_line(line: str) -> None:
+                progress = progress_parser.feed(line)
+                if progress is not None and progress_callback is not None:
+                    progress_callback(progress)
+
+            returncode, log_summary = run_ffmpeg(
                 command,
-                capture_output=True,
-                text=True,
-                check=False,
+                on_stdout_line=handle_progress_line,
+                log_path=self._log_path(output_path, "concat"),
             )
-            if result.returncode != 0:
-                error_text = result.stderr.strip() or "Bilinmeyen FFmpeg hatasi."
-                raise MergeExecutionError(error_text)
+            if returncode != 0:
+                raise MergeExecutionError(log_summary.format())
+
+            if partial_path != output_path:
+                os.replace(partial_path, output_path)
         finally:
-            if list_file_path and list_file_path.exists():
-                list_file_path.unlink(missing_ok=True)
+            list_file_path.unlink(missing_ok=True)
+            if partial_path != output_path:
+                partial_path.unlink(missing_ok=True)
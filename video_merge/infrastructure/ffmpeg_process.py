@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import subprocess
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Callable, TextIO
+
+from video_merge.infrastructure.tracing import Span, SpanKind, begin_span, start_span
+
+# `level` prefixes every line with its severity so warnings can be counted without
+# parsing free text; `warning` keeps per-frame info chatter out of the pipe.
+FFMPEG_LOG_ARGS = ("-hide_banner", "-loglevel", "level+warning")
+DEFAULT_TAIL_LINES = 40
+ERROR_TAGS = ("[error]", "[fatal]", "[panic]")
+STREAM_CHUNK_SIZE = 256 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class FFmpegLogSummary:
+    tail: tuple[str, ...]
+    total_lines: int
+    warning_count: int
+    error_count: int
+
+    def format(self) -> str:
+        lines = list(self.tail)
+        if self.total_lines > len(self.tail):
+            lines.insert(0, f"... ({self.total_lines - len(self.tail)} satir kisaltildi)")
+        lines.append(f"[ozet] uyari: {self.warning_count}, hata: {self.error_count}")
+        return "\n".join(lines)
+
+
+class StderrCollector:
+    """Keeps the last lines of an ffmpeg log in a ring buffer and counts severities."""
+
+    def __init__(self, max_lines: int = DEFAULT_TAIL_LINES, log_file: TextIO | None = None) -> None:
+        self._tail: deque[str] = deque(maxlen=max_lines)
+        self._log_file = log_file
+        self._total_lines = 0
+        self._warning_count = 0
+        self._error_count = 0
+
+    def feed(self, line: str) -> None:
+        if self._log_file is not None:
+            self._log_file.write(line)
+
+        line = line.rstrip()
+        if not line:
+            return
+        self._total_lines += 1
+        if "[warning]" in line:
+            self._warning_count += 1
+        elif any(tag in line for tag in ERROR_TAGS):
+            self._error_count += 1
+        self._tail.append(line)
+
+    def consume(self, stream: TextIO) -> None:
+        for line in stream:
+            self.feed(line)
+
+    def summary(self) -> FFmpegLogSummary:
+        return FFmpegLogSummary(
+            tail=tuple(self._tail),
+            total_lines=self._total_lines,
+            warning_count=self._warning_count,
+            error_count=self._error_count,
+        )
+
+
+def _ffmpeg_span_attributes(command: list[str]) -> dict[str, object]:
+    # Inputs/outputs identify the run; the full argv can hold thousands of clip paths.
+    return {"process.executable": Path(command[0]).name, "process.argv_count": len(command), "output": command[-1]}
+
+
+def _record_exit(span: Span | None, returncode: int, summary: FFmpegLogSummary) -> None:
+    if span is None:
+        return
+    span.set_attribute("process.exit_code", returncode)
+    span.set_attribute("ffmpeg.warning_count", summary.warning_count)
+    span.set_attribute("ffmpeg.error_count", summary.error_count)
+    if returncode != 0:
+        span.error = f"ffmpeg exit code {returncode}"
+
+
+def run_ffmpeg(
+    command: list[str],
+    on_stdout_line: Callable[[str], None] | None = None,
+    log_path: Path | None = None,
+    max_tail_lines: int = DEFAULT_TAIL_LINES,
+) -> tuple[int, FFmpegLogSummary]:
+    """Run ffmpeg while streaming stderr into a bounded buffer (and optionally a log file)."""
+    log_file: TextIO | None = None
+    if log_path is not None:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        log_file = log_path.open("a", encoding="utf-8", errors="replace")
+
+    try:
+        with start_span("ffmpeg", kind=SpanKind.CLIENT, **_ffmpeg_span_attributes(command)) as span:
+            collector = StderrCollector(max_lines=max_tail_lines, log_file=log_file)
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE if on_stdout_line is not None else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                errors="replace",
+            )
+            assert process.stderr is not None
+            stderr_thread = threading.Thread(target=collector.consume, args=(process.stderr,), daemon=True)
+            stderr_thread.start()
+
+            try:
+                if on_stdout_line is not None:
+                    assert process.stdout is not None
+                    for line in process.stdout:
+                        on_stdout_line(line)
+            except BaseException:
+                process.kill()
+                raise
+            finally:
+                returncode = process.wait()
+                stderr_thread.join()
+
+            summary = collector.summary()
+            _record_exit(span, returncode, summary)
+        return returncode, summary
+    finally:
+        if log_file is not None:
+            log_file.close()
+
+
+async def astream_ffmpeg(
+    command: list[str],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    on_exit: Callable[[int, FFmpegLogSummary], None] | None = None,
+    log_path: Path | None = None,
+    max_tail_lines: int = DEFAULT_TAIL_LINES,
+) -> AsyncIterator[bytes]:
+    """Yield ffmpeg's stdout in chunks of at most chunk_size bytes, then hand its exit status to on_exit.
+
+    Each blocking pipe read runs on the default executor, so a slow client holds no thread between
+    chunks. Closing the iterator early or cancelling it (e.g. the HTTP client went away) kills the process.
+    """
+    log_file: TextIO | None = None
+    if log_path is not None:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        log_file = log_path.open("a", encoding="utf-8", errors="replace")
+
+    # Not made current: the iterator is resumed from whichever task drives the response.
+    span = begin_span("ffmpeg.stream", kind=SpanKind.CLIENT, attributes=_ffmpeg_span_attributes(command))
+    try:
+        collector = StderrCollector(max_lines=max_tail_lines, log_file=log_file)
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+        )
+        assert process.stdout is not None and process.stderr is not None
+        stderr_text = io.TextIOWrapper(process.stderr, encoding="utf-8", errors="replace")
+        stderr_thread = threading.Thread(target=collector.consume, args=(stderr_text,), daemon=True)
+        stderr_thread.start()
+
+        pending_read: asyncio.Future[bytes] | None = None
+        finished = False
+        try:
+            while True:
+                pending_read = asyncio.ensure_future(asyncio.to_thread(process.stdout.read, chunk_size))
+                # Shielded: on cancellation the read keeps its thread until the kill below ends it,
+                # and the pipe is closed only after that.
+                chunk = await asyncio.shield(pending_read)
+                if not chunk:
+                    break
+                yield chunk
+            finished = True
+        finally:
+            if not finished:
+                process.kill()
+            if pending_read is not None:
+                await asyncio.wait([pending_read])
+            returncode = await asyncio.to_thread(process.wait)
+            await asyncio.to_thread(stderr_thread.join)
+            process.stdout.close()
+            stderr_text.close()
+
+        summary = collector.summary()
+        _record_exit(span, returncode, summary)
+        if on_exit is not None:
+            on_exit(returncode, summary)
+    finally:
+        if span is not None:
+            span.end()
+        if log_file is not None:
+            log_file.close()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from video_merge.domain.entities import MergeProgress
+
+
+def _parse_out_time(value: str) -> float | None:
+    parts = value.strip().split(":")
+    if len(parts) != 3:
+        return None
+    try:
+        hours, minutes, seconds = int(parts[0]), int(parts[1]), float(parts[2])
+    except ValueError:
+        return None
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def _parse_speed(value: str) -> float | None:
+    try:
+        speed = float(value.strip().rstrip("x"))
+    except ValueError:
+        return None
+    return speed if speed > 0 else None
+
+
+class FFmpegProgressParser:
+    """Turns `-progress pipe:1` key=value blocks into MergeProgress snapshots."""
+
+    def __init__(self, total_duration_seconds: float = 0.0) -> None:
+        self._total = max(total_duration_seconds, 0.0)
+        self._block: dict[str, str] = {}
+
+    def feed(self, line: str) -> MergeProgress | None:
+        key, separator, value = line.strip().partition("=")
+        if not separator:
+            return None
+
+        self._block[key] = value
+        if key != "progress":
+            return None
+
+        block, self._block = self._block, {}
+        out_time = _parse_out_time(block.get("out_time", ""))
+        if out_time is None:
+            try:
+                out_time = int(block.get("out_time_us", "")) / 1_000_000
+            except ValueError:
+                out_time = 0.0
+        out_time = max(out_time, 0.0)
+        speed = _parse_speed(block.get("speed", ""))
+
+        if value == "end":
+            return MergeProgress(out_time_seconds=out_time, percent=100.0, speed=speed, eta_seconds=0.0)
+
+        percent: float | None = None
+        eta: float | None = None
+        if self._total > 0:
+            percent = round(min(out_time / self._total * 100, 99.9), 1)
+            if speed:
+                eta = round(max(self._total - out_time, 0.0) / speed, 1)
+        return MergeProgress(out_time_seconds=out_time, percent=percent, speed=speed, eta_seconds=eta)
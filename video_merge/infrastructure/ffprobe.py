@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+from video_merge.domain.exceptions import MergeExecutionError
+from video_merge.infrastructure.tracing import SpanKind, start_span
+
+
+@dataclass(frozen=True, slots=True)
+class ClipStreamProfile:
+    video_codec: str | None = None
+    width: int | None = None
+    height: int | None = None
+    pix_fmt: str | None = None
+    video_time_base: str | None = None
+    audio_codec: str | None = None
+    sample_rate: str | None = None
+    channel_layout: str | None = None
+    duration: float = 0.0
+
+    @property
+    def video_signature(self) -> tuple[object, ...]:
+        return (self.video_codec, self.width, self.height, self.pix_fmt, self.video_time_base)
+
+    @property
+    def audio_signature(self) -> tuple[object, ...]:
+        return (self.audio_codec, self.sample_rate, self.channel_layout)
+
+
+def _to_int(value: object) -> int | None:
+    try:
+        return int(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value: object) -> float:
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_ffprobe_output(raw_output: str) -> ClipStreamProfile:
+    try:
+        data = json.loads(raw_output or "{}")
+    except json.JSONDecodeError as exc:
+        raise MergeExecutionError("FFprobe ciktisi okunamadi.") from exc
+
+    streams = data.get("streams") or []
+    video = next((stream for stream in streams if stream.get("codec_type") == "video"), {})
+    audio = next((stream for stream in streams if stream.get("codec_type") == "audio"), {})
+    channel_layout = audio.get("channel_layout")
+    if not channel_layout and audio.get("channels"):
+        channel_layout = f"{audio['channels']}c"
+
+    return ClipStreamProfile(
+        video_codec=video.get("codec_name"),
+        width=_to_int(video.get("width")),
+        height=_to_int(video.get("height")),
+        pix_fmt=video.get("pix_fmt"),
+        video_time_base=video.get("time_base"),
+        audio_codec=audio.get("codec_name"),
+        sample_rate=audio.get("sample_rate"),
+        channel_layout=channel_layout,
+        duration=_to_float((data.get("format") or {}).get("duration")),
+    )
+
+
+class FFprobeClipProber:
+    def __init__(self, ffprobe_binary: str = "ffprobe") -> None:
+        self._ffprobe_binary = ffprobe_binary
+
+    def probe(self, clip_path: Path) -> ClipStreamProfile:
+        command = [
+            self._ffprobe_binary,
+            "-v",
+            "error",
+            "-show_entries",
+            "stream=codec_type,codec_name,width,height,pix_fmt,time_base,sample_rate,channel_layout,channels"
+            ":format=duration",
+            "-of",
+            "json",
+            str(clip_path),
+        ]
+        with start_span("ffprobe", kind=SpanKind.CLIENT, clip=clip_path.name) as span:
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            if span is not None:
+                span.set_attribute("process.exit_code", result.returncode)
+        if result.returncode != 0:
+            error_text = result.stderr.strip() or "Bilinmeyen FFprobe hatasi."
+            raise MergeExecutionError(f"{clip_path.name}: {error_text}")
+        return parse_ffprobe_output(result.stdout)
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import contextvars
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Collection, Sequence
+
+from video_merge.domain.exceptions import MergeExecutionError
+from video_merge.infrastructure.ffmpeg_process import FFMPEG_LOG_ARGS, run_ffmpeg
+from video_merge.infrastructure.ffprobe import ClipStreamProfile
+
+VIDEO_ENCODERS = {
+    "h264": "libx264",
+    "hevc": "libx265",
+    "mpeg4": "mpeg4",
+}
+AUDIO_ENCODERS = {
+    "aac": "aac",
+    "mp3": "libmp3lame",
+    "ac3": "ac3",
+    "opus": "libopus",
+}
+
+
+NORMALIZE_PROFILE = "libx264-veryfast-crf18-pad-uniform"
+
+
+def needs_normalization(profiles: Sequence[ClipStreamProfile] | None) -> bool:
+    if not profiles:
+        return False
+    return len({profile.video_signature for profile in profiles}) > 1
+
+
+def _can_encode(known: dict[str, str], codec: str | None, encoders: Collection[str] | None) -> bool:
+    if codec not in known:
+        return False
+    return encoders is None or known[codec] in encoders
+
+
+def select_target_profile(
+    profiles: Sequence[ClipStreamProfile],
+    encoders: Collection[str] | None = None,
+) -> ClipStreamProfile:
+    """Pick the most common clip format so that as few clips as possible are transcoded.
+
+    When the ffmpeg build's encoder list is known, formats it cannot encode fall back to H.264/AAC.
+    """
+    counts = Counter((profile.video_signature, profile.audio_signature) for profile in profiles)
+    (video_signature, audio_signature), _ = counts.most_common(1)[0]
+    target = next(
+        profile
+        for profile in profiles
+        if profile.video_signature == video_signature and profile.audio_signature == audio_signature
+    )
+
+    if not _can_encode(VIDEO_ENCODERS, target.video_codec, encoders):
+        target = replace(target, video_codec="h264")
+    if target.audio_codec is not None and not _can_encode(AUDIO_ENCODERS, target.audio_codec, encoders):
+        target = replace(target, audio_codec="aac")
+    if target.pix_fmt is None:
+        target = replace(target, pix_fmt="yuv420p")
+    return replace(target, duration=0.0)
+
+
+def is_conforming(profile: ClipStreamProfile, target: ClipStreamProfile) -> bool:
+    return (
+        profile.video_signature == target.video_signature
+        and profile.audio_signature == target.audio_signature
+    )
+
+
+def needs_video_reencode(profiles: Sequence[ClipStreamProfile], target: ClipStreamProfile) -> bool:
+    """Whether any clip's video differs from target.
+
+    Re-encoded clips carry libx264's own SPS/PPS, which a stream-copy concat cannot splice onto untouched
+    originals, so once one clip's video is re-encoded every clip's video is.
+    """
+    return any(profile.video_signature != target.video_signature for profile in profiles)
+
+
+def build_normalize_command(
+    ffmpeg_binary: str,
+    source_path: Path,
+    source: ClipStreamProfile,
+    target: ClipStreamProfile,
+    output_path: Path,
+    reencode_video: bool | None = None,
+) -> list[str]:
+    """Bring source to target, copying whichever stream already matches.
+
+    reencode_video defaults to whether the source's video differs from target.
+    """
+    if reencode_video is None:
+        reencode_video = source.video_signature != target.video_signature
+    command = [ffmpeg_binary, *FFMPEG_LOG_ARGS, "-y", "-i", str(source_path)]
+    add_silence = target.audio_codec is not None and source.audio_codec is None
+    if add_silence:
+        command += [
+            "-f",
+            "lavfi",
+            "-i",
+            f"anullsrc=r={target.sample_rate or 48000}:cl={target.channel_layout or 'stereo'}",
+            "-shortest",
+        ]
+    command += ["-map", "0:v:0"]
+
+    if reencode_video:
+        video_filters = []
+        if target.width and target.height:
+            video_filters.append(
+                f"scale={target.width}:{target.height}:force_original_aspect_ratio=decrease,"
+                f"pad={target.width}:{target.height}:(ow-iw)/2:(oh-ih)/2,setsar=1"
+            )
+        if video_filters:
+            command += ["-vf", ",".join(video_filters)]
+        command += [
+            "-c:v",
+            VIDEO_ENCODERS[target.video_codec or "h264"],
+            "-preset",
+            "veryfast",
+            "-crf",
+            "18",
+            "-pix_fmt",
+            target.pix_fmt or "yuv420p",
+        ]
+        if target.video_time_base and "/" in target.video_time_base:
+            command += ["-video_track_timescale", target.video_time_base.split("/", 1)[1]]
+    else:
+        command += ["-c:v", "copy"]
+
+    if target.audio_codec is None:
+        command += ["-an"]
+    elif not add_silence and source.audio_signature == target.audio_signature:
+        command += ["-map", "0:a:0", "-c:a", "copy"]
+    else:
+        command += ["-map", "1:a:0" if add_silence else "0:a:0", "-c:a", AUDIO_ENCODERS[target.audio_codec]]
+        audio_format = []
+        if target.sample_rate:
+            audio_format.append(f"sample_rates={target.sample_rate}")
+        if target.channel_layout:
+            audio_format.append(f"channel_layouts={target.channel_layout}")
+        if audio_format:
+            command += ["-af", "aformat=" + ":".join(audio_format)]
+
+    command.append(str(output_path))
+    return command
+
+
+class ClipNormalizer:
+    """Transcodes non-conforming clips to the target format with a bounded worker pool.
+
+    Each worker only drives an ffmpeg child process, so threads are enough to keep
+    every core busy while staying safe inside daemonic Celery pool processes.
+    """
+
+    def __init__(
+        self,
+        ffmpeg_binary: str = "ffmpeg",
+        max_workers: int = 2,
+        encoders: Collection[str] | None = None,
+    ) -> None:
+        self._ffmpeg_binary = ffmpeg_binary
+        self._max_workers = max(1, max_workers)
+        self._encoders = encoders
+
+    def _transcode(
+        self,
+        source_path: Path,
+        source: ClipStreamProfile,
+        target: ClipStreamProfile,
+        output_path: Path,
+        log_path: Path | None,
+        reencode_video: bool,
+    ) -> Path:
+        command = build_normalize_command(
+            self._ffmpeg_binary, source_path, source, target, output_path, reencode_video=reencode_video
+        )
+        returncode, log_summary = run_ffmpeg(command, log_path=log_path)
+        if returncode != 0:
+            raise MergeExecutionError(f"{source_path.name} donusturulemedi:\n{log_summary.format()}")
+        return output_path
+
+    def select_target(self, profiles: Sequence[ClipStreamProfile]) -> ClipStreamProfile:
+        return select_target_profile(profiles, self._encoders)
+
+    def normalize(
+        self,
+        clip_paths: Sequence[Path],
+        profiles: Sequence[ClipStreamProfile],
+        work_dir: Path,
+        log_path: Path | None = None,
+        target: ClipStreamProfile | None = None,
+        reencode_video: bool | None = None,
+    ) -> list[Path]:
+        """Transcode clips that differ from target, by default the most common format among profiles.
+
+        If any clip's video has to be re-encoded, every clip's video is; reencode_video overrides that
+        decision when profiles are only part of a job.
+        """
+        target = target or self.select_target(profiles)
+        if reencode_video is None:
+            reencode_video = needs_video_reencode(profiles, target)
+        normalized_paths = list(clip_paths)
+        pending = [
+            (index, clip_path, profile)
+            for index, (clip_path, profile) in enumerate(zip(clip_paths, profiles))
+            if reencode_video or not is_conforming(profile, target)
+        ]
+        if not pending:
+            return normalized_paths
+
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(pending))) as executor:
+            futures = {
+                # Each transcode runs in the caller's context so its ffmpeg span joins the job's trace.
+                index: executor.submit(
+                    contextvars.copy_context().run,
+                    self._transcode,
+                    clip_path,
+                    profile,
+                    target,
+                    work_dir / f"{index:04d}_normalized.mp4",
+                    log_path.with_name(f"{log_path.stem}-{index:04d}.log") if log_path else None,
+                    reencode_video,
+                )
+                for index, clip_path, profile in pending
+            }
+            for index, future in futures.items():
+                normalized_paths[index] = future.result()
+
+        return normalized_paths
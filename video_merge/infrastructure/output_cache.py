@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+from pathlib import Path
+
+from video_merge.domain.interfaces import MergeOutputCache
+
+logger = logging.getLogger(__name__)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_target = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    temp_target.unlink(missing_ok=True)
+    try:
+        os.link(source, temp_target)
+    except OSError:
+        shutil.copyfile(source, temp_target)
+    os.replace(temp_target, target)
+
+
+class FileSystemMergeOutputCache(MergeOutputCache):
+    """Keeps merged outputs under `cache_root`, hardlinked into job output paths.
+
+    An entry still linked from a job output costs no extra disk and removing it frees nothing, so
+    `max_bytes` only counts entries the cache alone keeps alive (link count 1, i.e. their jobs were
+    deleted). Entry mtimes record the last use; eviction removes the least recently used of those.
+    """
+
+    def __init__(self, cache_root: Path, max_bytes: int) -> None:
+        self._cache_root = cache_root
+        self._max_bytes = max_bytes
+
+    def _entry_path(self, cache_key: str, output_path: Path) -> Path:
+        return self._cache_root / cache_key[:2] / f"{cache_key}{output_path.suffix}"
+
+    def fetch(self, cache_key: str, output_path: Path) -> bool:
+        entry_path = self._entry_path(cache_key, output_path)
+        try:
+            _link_or_copy(entry_path, output_path)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return False
+        except OSError:
+            logger.warning("Merge cache entry could not be reused: %s", entry_path, exc_info=True)
+            return False
+        return True
+
+    def store(self, cache_key: str, output_path: Path) -> None:
+        entry_path = self._entry_path(cache_key, output_path)
+        try:
+            _link_or_copy(output_path, entry_path)
+            self._evict()
+        except OSError:
+            logger.warning("Merge output could not be cached: %s", output_path, exc_info=True)
+
+    def _evict(self) -> None:
+        entries = []
+        total_size = 0
+        for entry_path in self._cache_root.glob("*/*"):
+            if entry_path.name.startswith("."):
+                continue
+            stat = entry_path.stat()
+            if stat.st_nlink > 1:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total_size += stat.st_size
+
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self._max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_size -= size
@@ -1,21 +1,101 @@
 from __future__ import annotations
 
+from typing import Sequence
 from uuid import UUID
 
+from celery import chord, group
+from django.conf import settings
 from kombu.exceptions import OperationalError
 
+from video_merge.domain.entities import ClipRange, JobLane, QueuedJob
 from video_merge.domain.exceptions import QueueUnavailableError
 from video_merge.domain.interfaces import MergeJobQueue
+from video_merge.infrastructure.tracing import SpanKind, start_span
+
+
+def lane_queue_name(lane: JobLane) -> str:
+    if lane == JobLane.BULK:
+        return getattr(settings, "MERGE_BULK_QUEUE", "merge_bulk")
+    return getattr(settings, "MERGE_FAST_QUEUE", "merge_fast")
 
 
 class CeleryMergeJobQueue(MergeJobQueue):
-    def enqueue_process_job(self, owner_id: int, job_id: UUID) -> str:
+    def enqueue_process_job(self, owner_id: int, queued: QueuedJob) -> str:
         from video_merge.tasks import process_merge_job_task
 
+        queue = lane_queue_name(queued.lane)
         try:
-            result = process_merge_job_task.delay(owner_id=owner_id, job_id=str(job_id))
+            with start_span(
+                "queue.enqueue_process_job",
+                kind=SpanKind.PRODUCER,
+                job_id=str(queued.job_id),
+                queue=queue,
+            ):
+                result = process_merge_job_task.apply_async(
+                    kwargs={"owner_id": owner_id, "job_id": str(queued.job_id)},
+                    queue=queue,
+                    task_id=queued.task_id,
+                )
         except OperationalError as exc:
             raise QueueUnavailableError("Redis/Celery kuyruguna baglanilamadi.") from exc
 
         return result.id
 
+    def enqueue_process_jobs(self, owner_id: int, queued_jobs: Sequence[QueuedJob]) -> list[str]:
+        from video_merge.tasks import process_merge_job_task
+
+        # A group publishes every message over one producer connection.
+        signatures = group(
+            process_merge_job_task.s(owner_id=owner_id, job_id=str(queued.job_id)).set(
+                queue=lane_queue_name(queued.lane),
+                task_id=queued.task_id,
+            )
+            for queued in queued_jobs
+        )
+        try:
+            with start_span("queue.enqueue_process_jobs", kind=SpanKind.PRODUCER, job_count=len(queued_jobs)):
+                result = signatures.apply_async()
+        except OperationalError as exc:
+            raise QueueUnavailableError("Redis/Celery kuyruguna baglanilamadi.") from exc
+
+        return [child.id for child in result.results]
+
+    def enqueue_split_merge(
+        self,
+        owner_id: int,
+        job_id: UUID,
+        task_id: str,
+        ranges: Sequence[ClipRange],
+        lane: JobLane = JobLane.FAST,
+        target: str = "",
+    ) -> str:
+        from video_merge.tasks import complete_split_merge_task, merge_clip_range_task
+
+        # Parts stay on the job's lane, so a split bulk job spreads over the bulk pool
+        # without pushing its ranges in front of short jobs on the fast queue.
+        queue = lane_queue_name(lane)
+        header = [
+            merge_clip_range_task.s(
+                owner_id=owner_id,
+                job_id=str(job_id),
+                task_id=task_id,
+                first_order=clip_range.first_order,
+                last_order=clip_range.last_order,
+                target=target,
+            ).set(queue=queue)
+            for clip_range in ranges
+        ]
+        callback = complete_split_merge_task.s(owner_id=owner_id, job_id=str(job_id), task_id=task_id).set(queue=queue)
+        try:
+            with start_span(
+                "queue.enqueue_split_merge",
+                kind=SpanKind.PRODUCER,
+                job_id=str(job_id),
+                queue=queue,
+                range_count=len(ranges),
+            ):
+                result = chord(header)(callback)
+        except OperationalError as exc:
+            raise QueueUnavailableError("Redis/Celery kuyruguna baglanilamadi.") from exc
+
+        return result.id
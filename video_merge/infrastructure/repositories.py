@@ -1,23 +1,87 @@
 from __future__ import annotations
 
+import base64
 import logging
+from dataclasses import replace
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import ContextManager, Sequence
 from uuid import UUID
 
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
 from django.conf import settings
-from django.db import transaction
-from django.db.models import Prefetch
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import (
+    Case,
+    Count,
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Min,
+    Prefetch,
+    Q,
+    QuerySet,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest, Least, Left, Now
 from django.urls import reverse
+from django.utils import timezone
 
-from video_merge.domain.entities import JobStatus, MergeJob, VideoClip
+from video_merge.domain.entities import (
+    JOB_STAGES,
+    HistogramSample,
+    JobLane,
+    JobMetrics,
+    JobPage,
+    JobStatus,
+    MergeJob,
+    MergeJobDraft,
+    MergeProgress,
+    OutputMode,
+    QueuedJob,
+    VideoClip,
+)
+from video_merge.domain.exceptions import InvalidInputError, StaleTaskError
 from video_merge.domain.interfaces import MergeJobRepository
-from video_merge.models import MergeClip, MergeJob as MergeJobModel
+from video_merge.infrastructure.clip_storage import link_blob_on_commit, store_clip_blobs
+from video_merge.infrastructure.event_publisher import get_event_publisher
+from video_merge.infrastructure.tracing import start_span, traced_methods
+from video_merge.models import ClipBlob, MergeClip, MergeJob as MergeJobModel, clip_upload_path
 from video_merge.presentation.ws_groups import user_jobs_group_name
 
 logger = logging.getLogger(__name__)
 
+JOB_PAGE_SIZE = 25
+# List rows only need the columns of a job card; error_message is unbounded text, so rows
+# carry a prefix that is enough for the card's one-line excerpt.
+JOB_LIST_FIELDS = (
+    "id",
+    "owner_id",
+    "name",
+    "status",
+    "output_mode",
+    "output_file",
+    "merged_through_order",
+    "lane",
+    "enqueued_at",
+    "started_at",
+    "task_id",
+    "uploaded_at",
+    "merge_started_at",
+    "merge_finished_at",
+    "finished_at",
+    "input_bytes",
+    "output_bytes",
+    "created_at",
+    "updated_at",
+)
+# Columns a job.status.event is built from.
+JOB_UPDATE_FIELDS = ("owner_id", "status", "error_message", "output_file", "output_mode")
+JOB_LIST_ERROR_CHARS = 160
+
 
 def _clip_to_entity(clip: MergeClip) -> VideoClip:
     return VideoClip(
@@ -26,10 +90,15 @@ def _clip_to_entity(clip: MergeClip) -> VideoClip:
         order=clip.order,
         original_name=clip.original_name,
         file_path=Path(clip.file.path),
+        content_hash=clip.blob_id or "",
     )
 
 
-def _job_to_entity(job: MergeJobModel, include_clips: bool = False) -> MergeJob:
+def _job_to_entity(
+    job: MergeJobModel,
+    include_clips: bool = False,
+    error_message: str | None = None,
+) -> MergeJob:
     clips: tuple[VideoClip, ...] = tuple()
     if include_clips:
         clips = tuple(_clip_to_entity(clip) for clip in job.clips.all())
@@ -42,89 +111,518 @@ def _job_to_entity(job: MergeJobModel, include_clips: bool = False) -> MergeJob:
         created_at=job.created_at,
         updated_at=job.updated_at,
         output_file_name=job.output_file.name if job.output_file else None,
-        error_message=job.error_message,
+        error_message=job.error_message if error_message is None else error_message,
+        merged_through_order=job.merged_through_order,
+        output_mode=OutputMode(job.output_mode),
+        lane=JobLane(job.lane),
+        enqueued_at=job.enqueued_at,
+        started_at=job.started_at,
+        task_id=job.task_id,
+        uploaded_at=job.uploaded_at,
+        merge_started_at=job.merge_started_at,
+        merge_finished_at=job.merge_finished_at,
+        finished_at=job.finished_at,
+        input_bytes=job.input_bytes,
+        output_bytes=job.output_bytes,
         clips=clips,
     )
 
 
+def _supports_update_returning() -> bool:
+    # PostgreSQL and SQLite >= 3.35 accept UPDATE ... RETURNING; MySQL and older MariaDB do not.
+    # Checked by vendor and version: Django's insert-RETURNING feature flags say nothing about UPDATE.
+    if connection.vendor == "postgresql":
+        return True
+    if connection.vendor == "sqlite":
+        return connection.Database.sqlite_version_info >= (3, 35)
+    return False
+
+
+def _update_job_returning(
+    job_id: UUID,
+    values: dict[str, object],
+    task_id: str | None = None,
+) -> MergeJobModel | None:
+    """Update one job and read back what a status event needs, in a single statement."""
+    meta = MergeJobModel._meta
+    quote = connection.ops.quote_name
+    fields = [meta.get_field(name) for name in values]
+    assignments = ", ".join(f"{quote(field.column)} = %s" for field in fields)
+    returning = ", ".join(quote(meta.get_field(name).column) for name in JOB_UPDATE_FIELDS)
+    params = [field.get_db_prep_save(values[field.name], connection) for field in fields]
+    conditions = [f"{quote(meta.pk.column)} = %s"]
+    params.append(meta.pk.get_db_prep_value(job_id, connection))
+    if task_id is not None:
+        conditions.append(f"{quote(meta.get_field('task_id').column)} = %s")
+        params.append(task_id)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {quote(meta.db_table)} SET {assignments} WHERE {' AND '.join(conditions)} RETURNING {returning}",
+            params,
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return MergeJobModel(id=job_id, **dict(zip(JOB_UPDATE_FIELDS, row)))
+
+
+def _encode_job_cursor(job: MergeJobModel) -> str:
+    raw = f"{job.created_at.isoformat()}|{job.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_job_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, job_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(job_id)
+    except ValueError as exc:
+        raise InvalidInputError("Gecersiz sayfa imleci.") from exc
+
+
+def _user_job_queryset(user_id: int, job_id: UUID, include_clips: bool) -> QuerySet[MergeJobModel]:
+    queryset = MergeJobModel.objects.filter(owner_id=user_id, id=job_id)
+    if include_clips:
+        queryset = queryset.prefetch_related(Prefetch("clips", queryset=MergeClip.objects.order_by("order")))
+    return queryset
+
+
+def _job_page_queryset(user_id: int, status: JobStatus | None, cursor: str | None) -> QuerySet[MergeJobModel]:
+    # (owner[, status], -created_at, -id) matches the composite indexes, so each page is an
+    # index range scan no matter how deep it is, unlike OFFSET.
+    queryset = (
+        MergeJobModel.objects.filter(owner_id=user_id)
+        .only(*JOB_LIST_FIELDS)
+        .annotate(error_excerpt=Left("error_message", JOB_LIST_ERROR_CHARS))
+        .order_by("-created_at", "-id")
+    )
+    if status is not None:
+        queryset = queryset.filter(status=status.value)
+    if cursor:
+        created_at, job_id = _decode_job_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=job_id))
+    return queryset
+
+
+def _job_page(rows: list[MergeJobModel], limit: int) -> JobPage:
+    """rows holds up to limit + 1 jobs; the extra one only tells whether another page follows."""
+    next_cursor = _encode_job_cursor(rows[limit - 1]) if len(rows) > limit else None
+    jobs = tuple(_job_to_entity(job, error_message=job.error_excerpt) for job in rows[:limit])
+    return JobPage(jobs=jobs, next_cursor=next_cursor)
+
+
+def job_output_url(job_id: UUID, output_mode: str) -> str:
+    if output_mode == OutputMode.HLS:
+        return reverse("video_merge:job_hls_file", kwargs={"job_id": job_id, "file_name": "index.m3u8"})
+    return reverse("video_merge:job_download", kwargs={"job_id": job_id})
+
+
 def _serialize_job_update(job: MergeJobModel) -> dict[str, object]:
     return {
         "job_id": str(job.id),
         "status": job.status,
         "error_message": job.error_message or "",
         "has_output": bool(job.output_file),
-        "output_url": (
-            reverse("video_merge:job_download", kwargs={"job_id": job.id})
-            if job.output_file
-            else ""
-        ),
+        "output_url": job_output_url(job.id, job.output_mode) if job.output_file else "",
     }
 
 
-def _publish_job_update(job: MergeJobModel) -> None:
+def _serialize_job_progress(job_id: UUID, progress: MergeProgress) -> dict[str, object]:
+    return {
+        "job_id": str(job_id),
+        "event": "progress",
+        "status": JobStatus.RUNNING.value,
+        "percent": progress.percent,
+        "speed": progress.speed,
+        "eta_seconds": progress.eta_seconds,
+        "out_time_seconds": progress.out_time_seconds,
+    }
+
+
+def _send_user_event(owner_id: int, job_id: UUID, event: dict[str, object]) -> None:
     if not getattr(settings, "REALTIME_UPDATES_ENABLED", False):
         return
 
-    channel_layer = get_channel_layer()
-    if channel_layer is None:
-        return
+    publisher = get_event_publisher(getattr(settings, "REALTIME_EVENT_FLUSH_SECONDS", 0.25))
+    with start_span("job_event.publish", event_type=event["type"], job_id=str(job_id)):
+        publisher.publish(user_jobs_group_name(owner_id), job_id, event)
+
 
-    group_name = user_jobs_group_name(job.owner_id)
+def _publish_job_update(job: MergeJobModel) -> None:
     event = {
         "type": "job.status.event",
         "payload": _serialize_job_update(job),
     }
+    _send_user_event(job.owner_id, job.id, event)
 
-    try:
-        async_to_sync(channel_layer.group_send)(group_name, event)
-    except Exception:  # noqa: BLE001
-        logger.warning("Job status event publish failed for job_id=%s", job.id, exc_info=True)
+
+def _publish_job_progress(owner_id: int, job_id: UUID, progress: MergeProgress) -> None:
+    event = {
+        "type": "job.progress.event",
+        "payload": _serialize_job_progress(job_id, progress),
+    }
+    _send_user_event(owner_id, job_id, event)
 
 
+def _histogram_aggregates(
+    prefix: str,
+    field_name: str,
+    bounds: Sequence[object],
+    recorded: Q,
+    output_field: object | None = None,
+) -> dict[str, object]:
+    aggregates: dict[str, object] = {
+        f"{prefix}_count": Count("id", filter=recorded),
+        f"{prefix}_sum": Sum(field_name, filter=recorded, output_field=output_field),
+    }
+    for index, bound in enumerate(bounds):
+        aggregates[f"{prefix}_le_{index}"] = Count("id", filter=recorded & Q(**{f"{field_name}__lte": bound}))
+    return aggregates
+
+
+def _histogram_sample(
+    row: dict[str, object],
+    prefix: str,
+    labels: dict[str, str],
+    bucket_count: int,
+) -> HistogramSample:
+    total = row[f"{prefix}_sum"] or 0
+    return HistogramSample(
+        labels=labels,
+        bucket_counts=tuple(row[f"{prefix}_le_{index}"] for index in range(bucket_count)),
+        count=row[f"{prefix}_count"],
+        total=total.total_seconds() if isinstance(total, timedelta) else float(total),
+    )
+
+
+@traced_methods("repository")
 class DjangoMergeJobRepository(MergeJobRepository):
-    def create_job(self, owner_id: int, name: str) -> MergeJob:
-        job = MergeJobModel.objects.create(owner_id=owner_id, name=name)
+    def atomic(self) -> ContextManager[None]:
+        return transaction.atomic()
+
+    def create_job(self, owner_id: int, name: str, output_mode: OutputMode = OutputMode.MP4) -> MergeJob:
+        job = MergeJobModel.objects.create(owner_id=owner_id, name=name, output_mode=output_mode.value)
         return _job_to_entity(job)
 
-    @transaction.atomic
     def add_clip(self, job_id: UUID, uploaded_file: object, order: int, original_name: str) -> VideoClip:
-        job = MergeJobModel.objects.select_for_update().get(id=job_id)
-        clip = MergeClip(job=job, order=order, original_name=original_name)
-        clip.file.save(original_name, uploaded_file, save=False)
-        clip.save()
-        return _clip_to_entity(clip)
+        return self.add_clips(job_id, [(uploaded_file, original_name)], first_order=order)[0]
 
-    def get_user_job(self, user_id: int, job_id: UUID, include_clips: bool = False) -> MergeJob | None:
-        queryset = MergeJobModel.objects.filter(owner_id=user_id, id=job_id)
-        if include_clips:
-            queryset = queryset.prefetch_related(
-                Prefetch("clips", queryset=MergeClip.objects.order_by("order"))
+    @transaction.atomic
+    def add_clips(
+        self,
+        job_id: UUID,
+        uploads: Sequence[tuple[object, str]],
+        first_order: int,
+    ) -> list[VideoClip]:
+        if not uploads:
+            return []
+
+        job = MergeJobModel.objects.select_for_update().only("id", "owner_id").get(id=job_id)
+        blobs = store_clip_blobs(uploads)
+        clips = []
+        for order, ((_, original_name), blob) in enumerate(zip(uploads, blobs), start=first_order):
+            clip = MergeClip(job=job, order=order, original_name=original_name, blob=blob)
+            clip.file.name = link_blob_on_commit(blob, clip_upload_path(clip, original_name))
+            clips.append(clip)
+        MergeClip.objects.bulk_create(clips)
+        MergeJobModel.objects.filter(id=job.id).update(
+            uploaded_at=timezone.now(),
+            input_bytes=F("input_bytes") + sum(blob.size for blob in blobs),
+        )
+        return [_clip_to_entity(clip) for clip in clips]
+
+    @transaction.atomic
+    def create_jobs_from_blobs(self, owner_id: int, drafts: Sequence[MergeJobDraft]) -> list[MergeJob]:
+        wanted = {digest for draft in drafts for digest in draft.clip_hashes}
+        # Only content the owner uploaded can be referenced; other users' hashes look unknown.
+        original_names: dict[str, str] = {}
+        owned_clips = (
+            MergeClip.objects.filter(job__owner_id=owner_id, blob_id__in=wanted)
+            .order_by("id")
+            .values_list("blob_id", "original_name")
+        )
+        for blob_id, original_name in owned_clips:
+            original_names.setdefault(blob_id, original_name)
+        missing = sorted(wanted - original_names.keys())
+        if missing:
+            raise InvalidInputError(f"Bilinmeyen video ozeti: {', '.join(missing[:5])}")
+        blobs = ClipBlob.objects.in_bulk(list(original_names))
+
+        # The referenced content is already stored, so these jobs are uploaded as soon as they exist.
+        uploaded_at = timezone.now()
+        jobs = [
+            MergeJobModel(
+                owner_id=owner_id,
+                name=draft.name,
+                output_mode=draft.output_mode.value,
+                uploaded_at=uploaded_at,
+                input_bytes=sum(blobs[digest].size for digest in draft.clip_hashes),
             )
+            for draft in drafts
+        ]
+        MergeJobModel.objects.bulk_create(jobs)
+
+        clips_by_job: list[list[MergeClip]] = []
+        for job, draft in zip(jobs, drafts):
+            job_clips = []
+            for order, digest in enumerate(draft.clip_hashes, start=1):
+                clip = MergeClip(job=job, order=order, original_name=original_names[digest], blob=blobs[digest])
+                # The jobs are new, so their clip paths are free; linking waits for the commit.
+                clip.file.name = link_blob_on_commit(blobs[digest], clip_upload_path(clip, clip.original_name))
+                job_clips.append(clip)
+            clips_by_job.append(job_clips)
+        MergeClip.objects.bulk_create([clip for job_clips in clips_by_job for clip in job_clips])
+
+        return [
+            replace(_job_to_entity(job), clips=tuple(_clip_to_entity(clip) for clip in job_clips))
+            for job, job_clips in zip(jobs, clips_by_job)
+        ]
+
+    def get_user_job(self, user_id: int, job_id: UUID, include_clips: bool = False) -> MergeJob | None:
+        job = _user_job_queryset(user_id, job_id, include_clips).first()
+        if job is None:
+            return None
+
+        return _job_to_entity(job, include_clips=include_clips)
 
-        job = queryset.first()
+    async def aget_user_job(self, user_id: int, job_id: UUID, include_clips: bool = False) -> MergeJob | None:
+        job = await _user_job_queryset(user_id, job_id, include_clips).afirst()
         if job is None:
             return None
 
         return _job_to_entity(job, include_clips=include_clips)
 
-    def list_user_jobs(self, user_id: int) -> list[MergeJob]:
-        jobs = MergeJobModel.objects.filter(owner_id=user_id)
-        return [_job_to_entity(job, include_clips=False) for job in jobs]
+    def list_user_jobs(
+        self,
+        user_id: int,
+        status: JobStatus | None = None,
+        cursor: str | None = None,
+        limit: int = JOB_PAGE_SIZE,
+    ) -> JobPage:
+        rows = list(_job_page_queryset(user_id, status, cursor)[: limit + 1])
+        return _job_page(rows, limit)
+
+    async def alist_user_jobs(
+        self,
+        user_id: int,
+        status: JobStatus | None = None,
+        cursor: str | None = None,
+        limit: int = JOB_PAGE_SIZE,
+    ) -> JobPage:
+        rows = [job async for job in _job_page_queryset(user_id, status, cursor)[: limit + 1]]
+        return _job_page(rows, limit)
 
     def list_job_clips(self, job_id: UUID) -> list[VideoClip]:
         clips = MergeClip.objects.filter(job_id=job_id).order_by("order")
         return [_clip_to_entity(clip) for clip in clips]
 
-    def set_status(self, job_id: UUID, status: JobStatus, error_message: str = "") -> None:
-        updated_count = MergeJobModel.objects.filter(id=job_id).update(
-            status=status.value,
-            error_message=error_message,
-        )
-        if not updated_count:
-            return
+    def set_status(
+        self,
+        job_id: UUID,
+        status: JobStatus,
+        error_message: str = "",
+        task_id: str | None = None,
+    ) -> bool:
+        values = {
+            "status": status.value,
+            "error_message": error_message,
+            "finished_at": timezone.now() if status in {JobStatus.COMPLETED, JobStatus.FAILED} else None,
+        }
+        if not _supports_update_returning():
+            jobs = MergeJobModel.objects.filter(id=job_id)
+            if task_id is not None:
+                jobs = jobs.filter(task_id=task_id)
+            if not jobs.update(**values):
+                return False
+            self._publish_updates([job_id])
+            return True
 
-        job = MergeJobModel.objects.only("id", "owner_id", "status", "error_message", "output_file").get(id=job_id)
+        job = _update_job_returning(job_id, values, task_id=task_id)
+        if job is None:
+            return False
         _publish_job_update(job)
+        return True
+
+    def job_sizes(self, job_ids: Sequence[UUID]) -> dict[UUID, int]:
+        sizes = (
+            MergeClip.objects.filter(job_id__in=job_ids)
+            .values("job_id")
+            .annotate(total=Coalesce(Sum("blob__size"), 0))
+            .values_list("job_id", "total")
+        )
+        totals = dict(sizes)
+        return {job_id: totals.get(job_id, 0) for job_id in job_ids}
+
+    def mark_enqueued(self, queued_jobs: Sequence[QueuedJob]) -> set[UUID]:
+        if not queued_jobs:
+            return set()
+
+        # Compare-and-set: a row only moves to the new task id while it still carries the
+        # task id the caller saw and is not running, so concurrent enqueues cannot both win.
+        expected = Q()
+        for queued in queued_jobs:
+            expected |= Q(id=queued.job_id, task_id=queued.previous_task_id)
+        updated_count = (
+            MergeJobModel.objects.filter(expected)
+            .exclude(status=JobStatus.RUNNING.value)
+            .update(
+                status=JobStatus.PENDING.value,
+                error_message="",
+                lane=Case(*(When(id=queued.job_id, then=Value(queued.lane.value)) for queued in queued_jobs)),
+                task_id=Case(*(When(id=queued.job_id, then=Value(queued.task_id)) for queued in queued_jobs)),
+                enqueued_at=timezone.now(),
+                started_at=None,
+                merge_started_at=None,
+                merge_finished_at=None,
+                finished_at=None,
+            )
+        )
+
+        claimed = {queued.job_id for queued in queued_jobs}
+        if updated_count != len(queued_jobs):
+            claimed = set(
+                MergeJobModel.objects.filter(
+                    id__in=[queued.job_id for queued in queued_jobs],
+                    task_id__in=[queued.task_id for queued in queued_jobs],
+                ).values_list("id", flat=True)
+            )
+        self._publish_updates(list(claimed))
+        return claimed
+
+    def start_job(
+        self,
+        owner_id: int,
+        job_id: UUID,
+        task_id: str | None = None,
+        max_running: int | None = None,
+        running_since: datetime | None = None,
+    ) -> bool:
+        jobs = MergeJobModel.objects.filter(id=job_id)
+        if task_id is not None:
+            jobs = jobs.filter(task_id=task_id, status=JobStatus.PENDING.value)
+
+        with transaction.atomic():
+            if max_running is not None:
+                # The owner's user row serializes slot claims, so two workers cannot both
+                # see "one slot left" for the same user.
+                list(get_user_model().objects.select_for_update().filter(id=owner_id).values_list("id"))
+                if task_id is not None and not jobs.exists():
+                    raise StaleTaskError(f"Gorev {task_id} artik bu isin guncel gorevi degil.")
+                running_jobs = MergeJobModel.objects.filter(owner_id=owner_id, status=JobStatus.RUNNING.value)
+                if running_since is not None:
+                    # A worker killed mid-merge never moves its job on; past the task time limit it is gone.
+                    running_jobs = running_jobs.filter(Q(started_at__isnull=True) | Q(started_at__gte=running_since))
+                running = running_jobs.exclude(id=job_id).count()
+                if running >= max_running:
+                    return False
+
+            updated_count = jobs.update(
+                status=JobStatus.RUNNING.value,
+                error_message="",
+                started_at=Coalesce("started_at", Now()),
+            )
+        if task_id is not None and not updated_count:
+            raise StaleTaskError(f"Gorev {task_id} artik bu isin guncel gorevi degil.")
+        self._publish_updates([job_id])
+        return True
+
+    def _publish_updates(self, job_ids: Sequence[UUID]) -> None:
+        jobs = MergeJobModel.objects.filter(id__in=job_ids).only("id", *JOB_UPDATE_FIELDS)
+        for job in jobs:
+            _publish_job_update(job)
+
+    def record_merge_window(self, job_id: UUID, started_at: datetime, finished_at: datetime) -> None:
+        started = Value(started_at, output_field=DateTimeField())
+        finished = Value(finished_at, output_field=DateTimeField())
+        # Least/Greatest are NULL on SQLite when any argument is, hence the Coalesce for the first report.
+        MergeJobModel.objects.filter(id=job_id).update(
+            merge_started_at=Coalesce(Least("merge_started_at", started), started),
+            merge_finished_at=Coalesce(Greatest("merge_finished_at", finished), finished),
+        )
+
+    def set_output_file(
+        self,
+        job_id: UUID,
+        output_file_name: str,
+        merged_through_order: int = 0,
+        output_bytes: int | None = None,
+    ) -> None:
+        values: dict[str, object] = {"output_file": output_file_name, "merged_through_order": merged_through_order}
+        if output_bytes is not None:
+            values["output_bytes"] = output_bytes
+        MergeJobModel.objects.filter(id=job_id).update(**values)
+
+    def collect_metrics(self, duration_bounds: Sequence[float], byte_bounds: Sequence[int]) -> JobMetrics:
+        # One grouped scan per family; every bucket is a filtered COUNT, so nothing is pulled row by row.
+        durations = {
+            f"{stage}_duration": ExpressionWrapper(F(end_field) - F(start_field), output_field=DurationField())
+            for stage, start_field, end_field in JOB_STAGES
+        }
+        aggregates: dict[str, object] = {}
+        for stage, start_field, end_field in JOB_STAGES:
+            recorded = Q(**{f"{start_field}__isnull": False, f"{end_field}__isnull": False})
+            aggregates.update(
+                _histogram_aggregates(
+                    stage,
+                    f"{stage}_duration",
+                    [timedelta(seconds=bound) for bound in duration_bounds],
+                    recorded,
+                    DurationField(),
+                )
+            )
+        stage_rows = MergeJobModel.objects.alias(**durations).values("lane").annotate(**aggregates).order_by("lane")
+
+        finished = Q(finished_at__isnull=False)
+        completed = finished & Q(status=JobStatus.COMPLETED.value)
+        byte_rows = (
+            MergeJobModel.objects.values("lane")
+            .annotate(
+                **_histogram_aggregates("input", "input_bytes", byte_bounds, finished),
+                **_histogram_aggregates("output", "output_bytes", byte_bounds, completed),
+            )
+            .order_by("lane")
+        )
+
+        queued = Q(status=JobStatus.PENDING.value) & ~Q(task_id="")
+        depth_rows = (
+            MergeJobModel.objects.filter(queued | Q(status=JobStatus.RUNNING.value))
+            .values("lane")
+            .annotate(
+                queued=Count("id", filter=queued),
+                running=Count("id", filter=Q(status=JobStatus.RUNNING.value)),
+                oldest_enqueued_at=Min("enqueued_at", filter=queued),
+            )
+            .order_by("lane")
+        )
+
+        now = timezone.now()
+        depth = {lane: {"queued": 0, "running": 0, "oldest": 0.0} for lane in JobLane}
+        for row in depth_rows:
+            lane_depth = depth[JobLane(row["lane"])]
+            lane_depth["queued"], lane_depth["running"] = row["queued"], row["running"]
+            if row["oldest_enqueued_at"] is not None:
+                lane_depth["oldest"] = max((now - row["oldest_enqueued_at"]).total_seconds(), 0.0)
+
+        stage_rows, byte_rows = list(stage_rows), list(byte_rows)
+        return JobMetrics(
+            duration_bounds=tuple(duration_bounds),
+            byte_bounds=tuple(byte_bounds),
+            stage_durations=tuple(
+                _histogram_sample(row, stage, {"stage": stage, "lane": row["lane"]}, len(duration_bounds))
+                for stage, _, _ in JOB_STAGES
+                for row in stage_rows
+            ),
+            input_bytes=tuple(
+                _histogram_sample(row, "input", {"lane": row["lane"]}, len(byte_bounds)) for row in byte_rows
+            ),
+            output_bytes=tuple(
+                _histogram_sample(row, "output", {"lane": row["lane"]}, len(byte_bounds)) for row in byte_rows
+            ),
+            queued={lane: values["queued"] for lane, values in depth.items()},
+            running={lane: values["running"] for lane, values in depth.items()},
+            oldest_queued_seconds={lane: values["oldest"] for lane, values in depth.items()},
+        )
 
-    def set_output_file(self, job_id: UUID, output_file_name: str) -> None:
-        MergeJobModel.objects.filter(id=job_id).update(output_file=output_file_name)
+    def publish_progress(self, owner_id: int, job_id: UUID, progress: MergeProgress) -> None:
+        _publish_job_progress(owner_id, job_id, progress)
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import atexit
+import functools
+import inspect
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+TRACEPARENT_HEADER = "traceparent"
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+SCOPE_NAME = "video_merge"
+# Buffered spans are written once their local root ends, or earlier once this many pile up.
+MAX_BUFFERED_SPANS = 512
+
+T = TypeVar("T")
+
+
+class SpanKind(IntEnum):
+    # Values of the OTLP Span.SpanKind enum.
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+    PRODUCER = 4
+    CONSUMER = 5
+
+
+@dataclass(frozen=True, slots=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+def parse_traceparent(value: str | None) -> SpanContext | None:
+    """W3C trace-context header -> SpanContext; malformed or all-zero ids are ignored."""
+    match = TRACEPARENT_PATTERN.match((value or "").strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, _ = match.groups()
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return SpanContext(trace_id=trace_id, span_id=span_id)
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    context: SpanContext
+    parent_span_id: str
+    kind: SpanKind
+    start_ns: int
+    local_root: bool
+    attributes: dict[str, object] = field(default_factory=dict)
+    end_ns: int | None = None
+    error: str | None = None
+    events: list[tuple[int, str, dict[str, object]]] = field(default_factory=list)
+
+    def set_attribute(self, key: str, value: object) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.error = f"{type(exc).__name__}: {exc}"
+        self.events.append(
+            (time.time_ns(), "exception", {"exception.type": type(exc).__name__, "exception.message": str(exc)})
+        )
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        exporter = _exporter
+        if exporter is not None:
+            exporter.add(self)
+
+
+def _attribute_value(value: object) -> dict[str, object]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON carries int64 as a string.
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(values: dict[str, object]) -> list[dict[str, object]]:
+    return [{"key": key, "value": _attribute_value(value)} for key, value in values.items() if value is not None]
+
+
+def span_to_otlp(span: Span) -> dict[str, object]:
+    return {
+        "traceId": span.context.trace_id,
+        "spanId": span.context.span_id,
+        "parentSpanId": span.parent_span_id,
+        "name": span.name,
+        "kind": int(span.kind),
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns or span.start_ns),
+        "attributes": _attributes(span.attributes),
+        "events": [
+            {"timeUnixNano": str(timestamp), "name": name, "attributes": _attributes(attributes)}
+            for timestamp, name, attributes in span.events
+        ],
+        # Status codes: 0 unset, 2 error.
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 0},
+    }
+
+
+class JsonLinesSpanExporter:
+    """Appends finished spans to a file, one OTLP/JSON ExportTraceServiceRequest per line.
+
+    This is the layout the OpenTelemetry collector's file exporter writes and its otlpjsonfile
+    receiver reads, so the file can be replayed into any tracing backend later.
+    """
+
+    def __init__(self, path: Path, service_name: str) -> None:
+        self._path = path
+        self._service_name = service_name
+        self._pending: list[Span] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                # A forked worker inherits the parent's buffer; those spans are the parent's to write.
+                self._pending.clear()
+                self._pid = os.getpid()
+            self._pending.append(span)
+            if not span.local_root and len(self._pending) < MAX_BUFFERED_SPANS:
+                return
+            batch, self._pending = self._pending, []
+        self._write(batch)
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._write(batch)
+
+    def _write(self, spans: list[Span]) -> None:
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _attributes({"service.name": self._service_name, "process.pid": os.getpid()}),
+                    },
+                    "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": [span_to_otlp(span) for span in spans]}],
+                }
+            ]
+        }
+        line = (json.dumps(payload, separators=(",", ":")) + "\n").encode()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # One write() on an O_APPEND descriptor, so web and worker processes can share the file.
+        descriptor = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(descriptor, line)
+        finally:
+            os.close(descriptor)
+
+
+_exporter: JsonLinesSpanExporter | None = None
+_configured = False
+_configure_lock = threading.Lock()
+_active_span: ContextVar[Span | None] = ContextVar("video_merge_active_span", default=None)
+_remote_parent: ContextVar[SpanContext | None] = ContextVar("video_merge_remote_parent", default=None)
+
+
+def configure_tracing(export_path: str | Path | None, service_name: str = "pars-vid-bir") -> None:
+    """Export spans to export_path, or turn tracing off (the default) with None/""."""
+    global _exporter, _configured
+    with _configure_lock:
+        if _exporter is not None:
+            _exporter.flush()
+        _exporter = JsonLinesSpanExporter(Path(export_path), service_name) if export_path else None
+        _configured = True
+
+
+def _ensure_configured() -> JsonLinesSpanExporter | None:
+    if not _configured:
+        from django.conf import settings
+
+        configure_tracing(
+            getattr(settings, "TRACE_EXPORT_PATH", ""),
+            getattr(settings, "TRACE_SERVICE_NAME", "pars-vid-bir"),
+        )
+    return _exporter
+
+
+def flush_spans() -> None:
+    exporter = _exporter
+    if exporter is not None:
+        exporter.flush()
+
+
+atexit.register(flush_spans)
+
+
+def current_span_context() -> SpanContext | None:
+    span = _active_span.get()
+    return span.context if span is not None else _remote_parent.get()
+
+
+def current_traceparent() -> str | None:
+    context = current_span_context()
+    return context.traceparent if context is not None else None
+
+
+def begin_span(
+    name: str,
+    kind: SpanKind = SpanKind.INTERNAL,
+    parent: SpanContext | None = None,
+    attributes: dict[str, object] | None = None,
+) -> Span | None:
+    """Start a span without making it current; the caller must call end(). None while tracing is off."""
+    if _ensure_configured() is None:
+        return None
+    active = _active_span.get()
+    if parent is None:
+        parent = active.context if active is not None else _remote_parent.get()
+    trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+    return Span(
+        name=name,
+        context=SpanContext(trace_id=trace_id, span_id=secrets.token_hex(8)),
+        parent_span_id=parent.span_id if parent is not None else "",
+        kind=kind,
+        start_ns=time.time_ns(),
+        # Spans without an in-process parent close a unit of work; that is when the buffer is written.
+        local_root=active is None,
+        attributes=dict(attributes or {}),
+    )
+
+
+@contextmanager
+def start_span(
+    name: str,
+    kind: SpanKind = SpanKind.INTERNAL,
+    parent: SpanContext | None = None,
+    **attributes: object,
+) -> Iterator[Span | None]:
+    span = begin_span(name, kind=kind, parent=parent, attributes=attributes)
+    if span is None:
+        yield None
+        return
+
+    token = _active_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.record_exception(exc)
+        raise
+    finally:
+        _active_span.reset(token)
+        span.end()
+
+
+@contextmanager
+def continue_trace(traceparent: str | None) -> Iterator[None]:
+    """Parent the spans started inside on a span from another process (HTTP or task header)."""
+    context = parse_traceparent(traceparent)
+    if context is None:
+        yield
+        return
+    token = _remote_parent.set(context)
+    try:
+        yield
+    finally:
+        _remote_parent.reset(token)
+
+
+def traced(name: str, kind: SpanKind = SpanKind.INTERNAL) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    def decorator(function: Callable[..., T]) -> Callable[..., T]:
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(name, kind=kind):
+                    return await function(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with start_span(name, kind=kind):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def traced_methods(prefix: str, kind: SpanKind = SpanKind.INTERNAL) -> Callable[[type[T]], type[T]]:
+    """Class decorator wrapping every public method defined on the class in a `<prefix>.<method>` span."""
+
+    def decorator(cls: type[T]) -> type[T]:
+        for attribute, member in list(vars(cls).items()):
+            if attribute.startswith("_") or not inspect.isfunction(member):
+                continue
+            setattr(cls, attribute, traced(f"{prefix}.{attribute}", kind=kind)(member))
+        return cls
+
+    return decorator
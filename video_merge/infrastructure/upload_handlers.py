@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile, UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, MemoryFileUploadHandler
+
+
+def upload_staging_dir() -> Path:
+    return Path(settings.MEDIA_ROOT) / "uploads" / ".incoming"
+
+
+class StagedUploadedFile(TemporaryUploadedFile):
+    """Temporary upload kept inside MEDIA_ROOT, so storage can rename it instead of copying.
+
+    The file is opened with delete=False and removed in close() only if it is still in staging;
+    once storage has moved it there is nothing left for the tempfile wrapper to unlink.
+    """
+
+    def __init__(self, name, content_type, size, charset, content_type_extra=None) -> None:
+        staging_dir = upload_staging_dir()
+        staging_dir.mkdir(parents=True, exist_ok=True)
+        file = tempfile.NamedTemporaryFile(suffix=".upload" + Path(name).suffix, dir=staging_dir, delete=False)
+        UploadedFile.__init__(self, file, name, content_type, size, charset, content_type_extra)
+
+    def close(self) -> None:
+        self.file.close()
+        Path(self.temporary_file_path()).unlink(missing_ok=True)
+
+
+class _ContentHashMixin:
+    """Computes the SHA-256 digest of each upload while its chunks stream in."""
+
+    def new_file(self, *args, **kwargs) -> None:
+        super().new_file(*args, **kwargs)  # type: ignore[misc]
+        self._content_hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes | None:
+        self._content_hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)  # type: ignore[misc]
+
+    def file_complete(self, file_size: int):
+        uploaded_file = super().file_complete(file_size)  # type: ignore[misc]
+        if uploaded_file is not None:
+            uploaded_file.content_sha256 = self._content_hasher.hexdigest()
+        return uploaded_file
+
+
+class HashingMemoryFileUploadHandler(_ContentHashMixin, MemoryFileUploadHandler):
+    pass
+
+
+class _StagingTemporaryFileUploadHandler(FileUploadHandler):
+    """TemporaryFileUploadHandler writing to a StagedUploadedFile instead of FILE_UPLOAD_TEMP_DIR."""
+
+    def new_file(self, *args, **kwargs) -> None:
+        super().new_file(*args, **kwargs)
+        self.file = StagedUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> None:
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size: int) -> StagedUploadedFile:
+        self.file.seek(0)
+        self.file.size = file_size
+        return self.file
+
+    def upload_interrupted(self) -> None:
+        if hasattr(self, "file"):
+            self.file.close()
+
+
+class StagingTemporaryFileUploadHandler(_ContentHashMixin, _StagingTemporaryFileUploadHandler):
+    """Streams large uploads to MEDIA_ROOT staging while hashing, so each byte is written once."""
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+import time
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from video_merge.infrastructure.repositories import DjangoMergeJobRepository
+
+
+class Command(BaseCommand):
+    help = "Compares per-clip add_clip calls with one add_clips call. Nothing is kept in the database."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--clips", type=int, default=200)
+        parser.add_argument("--clip-bytes", type=int, default=4096)
+
+    def handle(self, *args, **options) -> None:
+        clip_count = options["clips"]
+        clip_bytes = options["clip_bytes"]
+        media_root = tempfile.mkdtemp(prefix="clip-persistence-bench-")
+        try:
+            with override_settings(MEDIA_ROOT=media_root):
+                for label, run in (("add_clip x N", self._per_clip), ("add_clips", self._bulk)):
+                    elapsed, queries = self._measure(run, clip_count, clip_bytes)
+                    self.stdout.write(
+                        f"{label:>14}: {clip_count} klip, {elapsed * 1000:8.1f} ms "
+                        f"({elapsed * 1000 / clip_count:.2f} ms/klip), {queries} sorgu"
+                    )
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+    def _measure(self, run, clip_count: int, clip_bytes: int) -> tuple[float, int]:
+        repository = DjangoMergeJobRepository()
+        with transaction.atomic():
+            owner = get_user_model().objects.create_user(username=f"bench-{uuid4().hex[:12]}")
+            job = repository.create_job(owner_id=owner.id, name="benchmark")
+            # Distinct content per clip so every clip takes the "new blob" path.
+            uploads = []
+            for index in range(clip_count):
+                name = f"{index:04d}.mp4"
+                uploads.append((SimpleUploadedFile(name, index.to_bytes(4, "big") * (clip_bytes // 4)), name))
+
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                run(repository, job.id, uploads)
+                elapsed = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+        return elapsed, len(captured.captured_queries)
+
+    @staticmethod
+    def _per_clip(repository: DjangoMergeJobRepository, job_id, uploads) -> None:
+        for order, (uploaded_file, original_name) in enumerate(uploads, start=1):
+            repository.add_clip(job_id, uploaded_file, order, original_name)
+
+    @staticmethod
+    def _bulk(repository: DjangoMergeJobRepository, job_id, uploads) -> None:
+        repository.add_clips(job_id, uploads, first_order=1)
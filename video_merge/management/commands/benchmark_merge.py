@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from video_merge.benchmarks.footage import CODEC_ENCODERS, VIDEO_CODEC_ARGS, build_scenarios, generate_footage
+from video_merge.benchmarks.runner import TARGETS, build_report, compare_reports, run_benchmarks
+from video_merge.domain.exceptions import FFmpegUnavailableError
+from video_merge.infrastructure.ffmpeg_capabilities import require_ffmpeg_capabilities
+from video_merge.infrastructure.ffmpeg_merger import FFmpegVideoMerger
+
+
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates synthetic clips with ffmpeg lavfi sources, merges them through FFmpegVideoMerger and "
+        "ProcessMergeJobUseCase, and writes wall/CPU time, peak RSS and IO per run to a JSON file."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--codecs", default="h264", help=f"Virgulle ayrilmis: {', '.join(VIDEO_CODEC_ARGS)}")
+        parser.add_argument("--resolutions", default="640x360,1280x720")
+        parser.add_argument("--clip-counts", default="4,16")
+        parser.add_argument("--durations", default="2,10", help="Klip basina saniye.")
+        parser.add_argument("--targets", default=",".join(TARGETS))
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--no-mixed",
+            action="store_true",
+            help="Normalizasyon gerektiren karisik cozunurluk senaryolarini atla.",
+        )
+        parser.add_argument(
+            "--footage-dir",
+            default=str(Path(tempfile.gettempdir()) / "pars-merge-bench-footage"),
+            help="Uretilen klipler burada saklanir ve sonraki calismalarda yeniden kullanilir.",
+        )
+        parser.add_argument("--output", default="", help="Sonuc JSON dosyasi.")
+        parser.add_argument("--compare", default="", help="Karsilastirilacak onceki sonuc JSON dosyasi.")
+        parser.add_argument("--tolerance", type=float, default=0.15, help="Gerileme sayilan artis orani.")
+
+    def handle(self, *args, **options) -> None:
+        ffmpeg_binary = getattr(settings, "FFMPEG_BINARY", "ffmpeg")
+        try:
+            capabilities = require_ffmpeg_capabilities(ffmpeg_binary, getattr(settings, "FFPROBE_BINARY", "ffprobe"))
+        except FFmpegUnavailableError as exc:
+            raise CommandError(str(exc)) from exc
+
+        targets = _csv(options["targets"])
+        unknown_targets = set(targets) - set(TARGETS)
+        if unknown_targets:
+            raise CommandError(f"Bilinmeyen hedef: {', '.join(sorted(unknown_targets))}")
+
+        codecs = []
+        for codec in _csv(options["codecs"]):
+            if codec not in VIDEO_CODEC_ARGS:
+                raise CommandError(f"Bilinmeyen codec: {codec}")
+            if CODEC_ENCODERS[codec] not in capabilities.encoders:
+                self.stderr.write(f"{codec} atlandi: bu ffmpeg {CODEC_ENCODERS[codec]} encoder'ina sahip degil.")
+                continue
+            codecs.append(codec)
+        if not codecs:
+            raise CommandError("Calistirilacak codec kalmadi.")
+
+        parameters = {
+            "codecs": codecs,
+            "resolutions": _csv(options["resolutions"]),
+            "clip_counts": [int(value) for value in _csv(options["clip_counts"])],
+            "durations": [float(value) for value in _csv(options["durations"])],
+            "targets": targets,
+            "repeat": options["repeat"],
+            "mixed": not options["no_mixed"],
+        }
+        scenarios = build_scenarios(
+            parameters["codecs"],
+            parameters["resolutions"],
+            parameters["clip_counts"],
+            parameters["durations"],
+            include_mixed=parameters["mixed"],
+        )
+
+        footage_dir = Path(options["footage_dir"])
+        self.stdout.write(f"Klipler hazirlaniyor: {footage_dir}")
+        footage = generate_footage(
+            (spec for scenario in scenarios for spec in scenario.clips),
+            footage_dir,
+            capabilities.ffmpeg_path,
+        )
+
+        merger = FFmpegVideoMerger(capabilities=capabilities)
+        results = run_benchmarks(
+            scenarios,
+            footage,
+            targets,
+            options["repeat"],
+            merger,
+            on_result=lambda result: self.stdout.write(
+                f"{result.key:>40} #{result.repeat}: {result.measurement.wall_seconds:7.2f} s, "
+                f"cpu {result.measurement.cpu_user_seconds + result.measurement.cpu_system_seconds:7.2f} s, "
+                f"rss {result.measurement.peak_child_rss_bytes / 1024**2:6.1f} MiB"
+            ),
+        )
+        report = build_report(results, capabilities.version, parameters)
+
+        output_path = Path(options["output"] or f"merge-benchmark-{datetime.now():%Y%m%d-%H%M%S}.json")
+        output_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        self.stdout.write(self.style.SUCCESS(f"Sonuclar yazildi: {output_path}"))
+
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text(encoding="utf-8"))
+            lines, regressions = compare_reports(report, baseline, options["tolerance"])
+            for line in lines:
+                self.stdout.write(line)
+            if regressions:
+                raise CommandError(f"{len(regressions)} olcumde %{options['tolerance'] * 100:.0f} ustu gerileme var.")
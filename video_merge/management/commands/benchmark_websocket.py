@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from video_merge.benchmarks.websocket_fanout import LAYER_INMEMORY, LAYERS, run_fanout_benchmark
+
+
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _ms(value: float | None) -> str:
+    return "-" if value is None else f"{value:8.1f} ms"
+
+
+class Command(BaseCommand):
+    help = (
+        "Opens many JobStatusConsumer WebSockets in one process, publishes job status events at fixed rates "
+        "and reports delivery latency percentiles, lost events and memory per connection."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--connections", default="500,2000", help="Virgulle ayrilmis baglanti sayilari.")
+        parser.add_argument("--users", type=int, default=100, help="Baglantilarin dagitildigi kullanici sayisi.")
+        parser.add_argument("--rates", default="10,100", help="Saniyedeki yayin sayilari.")
+        parser.add_argument("--duration", type=float, default=5.0, help="Her hizda yayin suresi (saniye).")
+        parser.add_argument("--flush-interval", type=float, default=None, help="Birlestirici yayin araligi.")
+        parser.add_argument("--layer", default=LAYER_INMEMORY, choices=LAYERS)
+        parser.add_argument("--redis-url", default="", help="--layer redis icin; varsayilan yerel Redis.")
+        parser.add_argument("--capacity", type=int, default=100, help="Kanal basina kuyruk kapasitesi.")
+        parser.add_argument("--settle", type=float, default=5.0, help="Gec teslimatlar icin bekleme (saniye).")
+        parser.add_argument("--output", default="", help="Sonuc JSON dosyasi.")
+
+    def handle(self, *args, **options) -> None:
+        try:
+            connection_counts = [int(value) for value in _csv(options["connections"])]
+            rates = [float(value) for value in _csv(options["rates"])]
+        except ValueError as exc:
+            raise CommandError(f"Gecersiz sayi: {exc}") from exc
+        if not connection_counts or min(connection_counts) < 1 or options["users"] < 1:
+            raise CommandError("Baglanti ve kullanici sayilari pozitif olmali.")
+        if not rates or min(rates) <= 0 or options["duration"] <= 0:
+            raise CommandError("Hiz ve sure pozitif olmali.")
+
+        flush_interval = options["flush_interval"]
+        if flush_interval is None:
+            flush_interval = getattr(settings, "REALTIME_EVENT_FLUSH_SECONDS", 0.25)
+
+        results = run_fanout_benchmark(
+            connection_counts,
+            options["users"],
+            rates,
+            options["duration"],
+            flush_interval_seconds=flush_interval,
+            layer=options["layer"],
+            redis_url=options["redis_url"],
+            capacity=options["capacity"],
+            settle_seconds=options["settle"],
+        )
+        for result in results:
+            rss = result.rss_bytes_per_connection
+            self.stdout.write(
+                f"{result.connections:>6} baglanti / {result.users} kullanici @ {result.rate_per_second:g}/s: "
+                f"p50 {_ms(result.latency_p50_ms)}, p99 {_ms(result.latency_p99_ms)}, "
+                f"max {_ms(result.latency_max_ms)}, {result.deliveries}/{result.expected_deliveries} teslim, "
+                f"{result.lost} kayip, {result.python_bytes_per_connection / 1024:.1f} KiB/baglanti"
+                + ("" if rss is None else f" (rss {rss / 1024:.1f} KiB)")
+            )
+
+        if options["output"]:
+            report = {
+                "parameters": {
+                    "layer": options["layer"],
+                    "flush_interval_seconds": flush_interval,
+                    "capacity": options["capacity"],
+                },
+                "results": [result.to_dict() for result in results],
+            }
+            output_path = Path(options["output"])
+            output_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Sonuclar yazildi: {output_path}"))
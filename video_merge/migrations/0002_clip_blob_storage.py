@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:04
+
+import django.db.models.deletion
+import video_merge.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_merge', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClipBlob',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('file', models.FileField(upload_to=video_merge.models.clip_blob_upload_path)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='mergeclip',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='clips', to='video_merge.clipblob'),
+        ),
+    ]
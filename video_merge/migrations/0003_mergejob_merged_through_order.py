@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_merge', '0002_clip_blob_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mergejob',
+            name='merged_through_order',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
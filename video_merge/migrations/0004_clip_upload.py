@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:08
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_merge', '0003_mergejob_merged_through_order'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClipUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('order', models.PositiveIntegerField()),
+                ('original_name', models.CharField(max_length=255)),
+                ('file_name', models.CharField(max_length=255)),
+                ('length', models.PositiveBigIntegerField()),
+                ('offset', models.PositiveBigIntegerField(default=0)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='video_merge.mergejob')),
+            ],
+            options={
+                'ordering': ['order'],
+                'constraints': [models.UniqueConstraint(fields=('job', 'order'), name='uniq_job_upload_order')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_merge', '0004_clip_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mergejob',
+            name='output_mode',
+            field=models.CharField(choices=[('mp4', 'MP4'), ('hls', 'HLS (fMP4)')], default='mp4', max_length=8),
+        ),
+    ]
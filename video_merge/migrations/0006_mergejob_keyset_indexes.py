@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_merge', '0005_mergejob_output_mode'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mergejob',
+            index=models.Index(fields=['owner', '-created_at', '-id'], name='mergejob_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mergejob',
+            index=models.Index(fields=['owner', 'status', '-created_at', '-id'], name='mergejob_owner_status_idx'),
+        ),
+        migrations.AlterField(
+            model_name='mergejob',
+            name='owner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='merge_jobs', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
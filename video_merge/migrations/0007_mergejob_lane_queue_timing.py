@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_merge', '0006_mergejob_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mergejob',
+            name='enqueued_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='mergejob',
+            name='lane',
+            field=models.CharField(choices=[('fast', 'Fast'), ('bulk', 'Bulk')], default='fast', max_length=8),
+        ),
+        migrations.AddField(
+            model_name='mergejob',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
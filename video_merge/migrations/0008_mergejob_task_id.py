@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_merge', '0007_mergejob_lane_queue_timing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mergejob',
+            name='task_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_merge', '0008_mergejob_task_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mergejob',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='mergejob',
+            name='input_bytes',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='mergejob',
+            name='merge_finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='mergejob',
+            name='merge_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='mergejob',
+            name='output_bytes',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='mergejob',
+            name='uploaded_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
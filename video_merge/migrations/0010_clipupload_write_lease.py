@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_merge', '0009_mergejob_stage_timing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clipupload',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='clipupload',
+            name='write_claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='clipupload',
+            name='write_token',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='clipupload',
+            index=models.Index(condition=models.Q(('completed_at__isnull', True)), fields=['last_activity_at'], name='clipupload_idle_idx'),
+        ),
+    ]
@@ -5,6 +5,7 @@ from pathlib import Path
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 def clip_upload_path(instance: "MergeClip", filename: str) -> str:
@@ -16,6 +17,21 @@ def clip_upload_path(instance: "MergeClip", filename: str) -> str:
     )
 
 
+def clip_blob_upload_path(instance: "ClipBlob", filename: str) -> str:
+    extension = Path(filename).suffix.lower()
+    return f"uploads/blobs/{instance.sha256[:2]}/{instance.sha256}{extension}"
+
+
+class ClipBlob(models.Model):
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    file = models.FileField(upload_to=clip_blob_upload_path)
+    size = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.sha256} ({self.size} bytes)"
+
+
 class MergeJob(models.Model):
     class Status(models.TextChoices):
         PENDING = "pending", "Pending"
@@ -23,11 +39,21 @@ class MergeJob(models.Model):
         COMPLETED = "completed", "Completed"
         FAILED = "failed", "Failed"
 
+    class OutputMode(models.TextChoices):
+        MP4 = "mp4", "MP4"
+        HLS = "hls", "HLS (fMP4)"
+
+    class Lane(models.TextChoices):
+        FAST = "fast", "Fast"
+        BULK = "bulk", "Bulk"
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="merge_jobs",
+        # Covered by the composite indexes below, which all lead with owner.
+        db_index=False,
     )
     name = models.CharField(max_length=150)
     status = models.CharField(
@@ -35,13 +61,39 @@ class MergeJob(models.Model):
         choices=Status.choices,
         default=Status.PENDING,
     )
+    output_mode = models.CharField(
+        max_length=8,
+        choices=OutputMode.choices,
+        default=OutputMode.MP4,
+    )
     output_file = models.FileField(upload_to="merged_outputs/", blank=True, null=True)
+    merged_through_order = models.PositiveIntegerField(default=0)
+    lane = models.CharField(
+        max_length=8,
+        choices=Lane.choices,
+        default=Lane.FAST,
+    )
+    # Stage timestamps; see JOB_STAGES in the domain for how they pair up into durations.
+    uploaded_at = models.DateTimeField(blank=True, null=True)
+    enqueued_at = models.DateTimeField(blank=True, null=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    merge_started_at = models.DateTimeField(blank=True, null=True)
+    merge_finished_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    input_bytes = models.PositiveBigIntegerField(default=0)
+    output_bytes = models.PositiveBigIntegerField(default=0)
+    # Id of the Celery task the job was last enqueued under; any other task for it is stale.
+    task_id = models.CharField(max_length=255, blank=True, default="")
     error_message = models.TextField(blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["owner", "-created_at", "-id"], name="mergejob_owner_created_idx"),
+            models.Index(fields=["owner", "status", "-created_at", "-id"], name="mergejob_owner_status_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.owner})"
@@ -54,6 +106,13 @@ class MergeClip(models.Model):
         related_name="clips",
     )
     file = models.FileField(upload_to=clip_upload_path)
+    blob = models.ForeignKey(
+        ClipBlob,
+        on_delete=models.PROTECT,
+        related_name="clips",
+        blank=True,
+        null=True,
+    )
     original_name = models.CharField(max_length=255)
     order = models.PositiveIntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
@@ -66,3 +125,40 @@ class MergeClip(models.Model):
 
     def __str__(self) -> str:
         return f"{self.job_id} - #{self.order} - {self.original_name}"
+
+
+class ClipUpload(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job = models.ForeignKey(
+        MergeJob,
+        on_delete=models.CASCADE,
+        related_name="uploads",
+    )
+    order = models.PositiveIntegerField()
+    original_name = models.CharField(max_length=255)
+    file_name = models.CharField(max_length=255)
+    length = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    completed_at = models.DateTimeField(blank=True, null=True)
+    # The PATCH currently writing holds this lease; a second writer at the same offset is refused.
+    write_token = models.CharField(max_length=32, blank=True, default="")
+    write_claimed_at = models.DateTimeField(blank=True, null=True)
+    last_activity_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["order"]
+        constraints = [
+            models.UniqueConstraint(fields=["job", "order"], name="uniq_job_upload_order"),
+        ]
+        indexes = [
+            # The expiry sweep scans unfinished uploads by last activity.
+            models.Index(
+                fields=["last_activity_at"],
+                name="clipupload_idle_idx",
+                condition=models.Q(completed_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.job_id} - #{self.order} - {self.offset}/{self.length}"
@@ -23,6 +23,10 @@ class JobStatusConsumer(AsyncWebsocketConsumer):
             await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
     async def job_status_event(self, event: dict[str, object]) -> None:
-        payload = event.get("payload", {})
-        await self.send(text_data=json.dumps(payload))
+        await self._forward(event)
 
+    async def job_progress_event(self, event: dict[str, object]) -> None:
+        await self._forward(event)
+
+    async def _forward(self, event: dict[str, object]) -> None:
+        await self.send(text_data=json.dumps(event.get("payload", {})))
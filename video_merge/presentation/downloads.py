@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import mimetypes
+import re
+from pathlib import Path
+from typing import AsyncIterator
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_CHUNK_SIZE = 512 * 1024
+
+
+def _etag(stat_result) -> str:
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def _parse_range(header_value: str, size: int) -> tuple[int, int] | None:
+    """Return an inclusive (start, end) for a single byte range, or None if it cannot be served."""
+    match = RANGE_PATTERN.match(header_value.strip())
+    if match is None:
+        return None
+
+    start_text, end_text = match.groups()
+    if not start_text and not end_text:
+        return None
+    if not start_text:
+        suffix_length = int(end_text)
+        if suffix_length == 0:
+            return None
+        return max(size - suffix_length, 0), size - 1
+
+    start = int(start_text)
+    end = min(int(end_text), size - 1) if end_text else size - 1
+    if start >= size or end < start:
+        return None
+    return start, end
+
+
+def _if_range_matches(header_value: str, etag: str, last_modified: int) -> bool:
+    header_value = header_value.strip()
+    if header_value.startswith('"'):
+        return header_value == etag
+    return parse_http_date_safe(header_value) == last_modified
+
+
+async def _aread_range(path: Path, start: int, length: int) -> AsyncIterator[bytes]:
+    # Each blocking open/read runs on the default executor, so a slow client only holds a coroutine
+    # between chunks, never a thread.
+    source = await asyncio.to_thread(path.open, "rb")
+    try:
+        await asyncio.to_thread(source.seek, start)
+        remaining = length
+        while remaining > 0:
+            chunk = await asyncio.to_thread(source.read, min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        await asyncio.to_thread(source.close)
+
+
+def _offloaded_response(
+    path: Path,
+    relative_name: str,
+    download_name: str,
+    as_attachment: bool,
+    content_type: str,
+) -> HttpResponse | None:
+    mode = getattr(settings, "DOWNLOAD_OFFLOAD_MODE", "")
+    if not mode:
+        return None
+
+    # The proxy serves the bytes (including Range requests); Django only sends headers.
+    response = HttpResponse(content_type=content_type)
+    response["Content-Disposition"] = content_disposition_header(as_attachment, download_name)
+    if mode == "x-accel-redirect":
+        prefix = getattr(settings, "DOWNLOAD_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + quote(relative_name)
+    elif mode == "x-sendfile":
+        response["X-Sendfile"] = str(path)
+    else:
+        return None
+    return response
+
+
+def _requested_range(
+    request: HttpRequest,
+    size: int,
+    etag: str,
+    last_modified: int,
+) -> tuple[tuple[int, int] | None, HttpResponse | None]:
+    """(byte range to serve or None for the whole file, 416 response if the range cannot be served)."""
+    range_header = request.headers.get("Range", "")
+    if not range_header or size == 0:
+        return None, None
+    if_range = request.headers.get("If-Range", "")
+    if if_range and not _if_range_matches(if_range, etag, last_modified):
+        return None, None
+
+    byte_range = _parse_range(range_header, size)
+    if byte_range is None and RANGE_PATTERN.match(range_header.strip()):
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        response["Accept-Ranges"] = "bytes"
+        return None, response
+    return byte_range, None
+
+
+def _with_validators(response: HttpResponse, etag: str, last_modified: int) -> HttpResponse:
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+async def abuild_download_response(
+    request: HttpRequest,
+    path: Path,
+    relative_name: str,
+    download_name: str,
+    as_attachment: bool = True,
+    content_type: str | None = None,
+) -> HttpResponse:
+    """Serve path with Range/If-Range support; the body is an async iterator.
+
+    Under ASGI a synchronous streaming body (FileResponse included) is read into memory in full
+    before the first byte is sent, so there is deliberately no sync variant.
+    """
+    content_type = content_type or mimetypes.guess_type(download_name)[0] or "application/octet-stream"
+    offloaded = _offloaded_response(path, relative_name, download_name, as_attachment, content_type)
+    if offloaded is not None:
+        return offloaded
+
+    stat_result = await asyncio.to_thread(path.stat)
+    size = stat_result.st_size
+    etag = _etag(stat_result)
+    last_modified = int(stat_result.st_mtime)
+    byte_range, unsatisfiable = _requested_range(request, size, etag, last_modified)
+    if unsatisfiable is not None:
+        return unsatisfiable
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1
+    response = StreamingHttpResponse(
+        _aread_range(path, start, length),
+        status=200 if byte_range is None else 206,
+        content_type=content_type,
+    )
+    response["Content-Length"] = str(length)
+    response["Content-Disposition"] = content_disposition_header(as_attachment, download_name)
+    if byte_range is not None:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return _with_validators(response, etag, last_modified)
@@ -7,6 +7,7 @@ from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 
 from video_merge.domain.constants import SUPPORTED_VIDEO_EXTENSIONS
+from video_merge.domain.entities import OutputMode
 
 
 class MultipleFileInput(forms.ClearableFileInput):
@@ -43,6 +44,15 @@ class MergeJobCreateForm(forms.Form):
             }
         ),
     )
+    output_mode = forms.ChoiceField(
+        label="Cikti bicimi",
+        required=False,
+        initial=OutputMode.MP4,
+        choices=[
+            (OutputMode.MP4, "Tek MP4 dosyasi"),
+            (OutputMode.HLS, "HLS (islem surerken izlenebilir)"),
+        ],
+    )
 
     def clean_files(self) -> list[object]:
         files = self.cleaned_data.get("files", [])
@@ -56,6 +66,29 @@ class MergeJobCreateForm(forms.Form):
 
         return files
 
+    def clean_output_mode(self) -> OutputMode:
+        return OutputMode(self.cleaned_data.get("output_mode") or OutputMode.MP4)
+
+
+class MergeJobAppendForm(forms.Form):
+    files = MultipleFileField(
+        label="Eklenecek videolar",
+        widget=MultipleFileInput(
+            attrs={
+                "accept": ",".join(SUPPORTED_VIDEO_EXTENSIONS),
+            }
+        ),
+    )
+
+    def clean_files(self) -> list[object]:
+        files = self.cleaned_data.get("files", [])
+        for uploaded in files:
+            extension = Path(uploaded.name).suffix.lower()
+            if extension not in SUPPORTED_VIDEO_EXTENSIONS:
+                raise forms.ValidationError(f"Desteklenmeyen dosya uzantisi: {extension}")
+
+        return files
+
 
 class SignUpForm(UserCreationForm):
     email = forms.EmailField(required=False)
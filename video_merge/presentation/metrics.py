@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+from video_merge.domain.entities import HistogramSample, JobLane, JobMetrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _histogram_lines(
+    name: str,
+    help_text: str,
+    bounds: Sequence[float],
+    samples: Iterable[HistogramSample],
+) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for sample in samples:
+        for bound, bucket_count in zip(bounds, sample.bucket_counts):
+            labels = _format_labels({**sample.labels, "le": _format_value(bound)})
+            lines.append(f"{name}_bucket{labels} {bucket_count}")
+        lines.append(f"{name}_bucket{_format_labels({**sample.labels, 'le': '+Inf'})} {sample.count}")
+        lines.append(f"{name}_sum{_format_labels(sample.labels)} {_format_value(sample.total)}")
+        lines.append(f"{name}_count{_format_labels(sample.labels)} {sample.count}")
+    return lines
+
+
+def _gauge_lines(name: str, help_text: str, values: dict[JobLane, float]) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for lane, value in values.items():
+        lines.append(f"{name}{_format_labels({'lane': lane.value})} {_format_value(value)}")
+    return lines
+
+
+def render_prometheus(metrics: JobMetrics) -> str:
+    """Prometheus text exposition (format 0.0.4) of the job metrics."""
+    lines = [
+        *_histogram_lines(
+            "merge_job_stage_duration_seconds",
+            "Time between consecutive recorded job transitions, per stage.",
+            metrics.duration_bounds,
+            metrics.stage_durations,
+        ),
+        *_histogram_lines(
+            "merge_job_input_bytes",
+            "Total clip bytes of finished jobs.",
+            metrics.byte_bounds,
+            metrics.input_bytes,
+        ),
+        *_histogram_lines(
+            "merge_job_output_bytes",
+            "Merged output bytes of completed jobs.",
+            metrics.byte_bounds,
+            metrics.output_bytes,
+        ),
+        *_gauge_lines("merge_jobs_queued", "Jobs enqueued and waiting for a worker.", metrics.queued),
+        *_gauge_lines("merge_jobs_running", "Jobs currently being merged.", metrics.running),
+        *_gauge_lines(
+            "merge_job_oldest_queued_seconds",
+            "Age of the oldest job still waiting for a worker.",
+            metrics.oldest_queued_seconds,
+        ),
+    ]
+    return "\n".join(lines) + "\n"
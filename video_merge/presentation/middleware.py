@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from video_merge.infrastructure.tracing import TRACEPARENT_HEADER, Span, SpanKind, continue_trace, start_span
+
+
+def _finish_request_span(span: Span | None, request: HttpRequest, response: HttpResponse) -> None:
+    if span is None:
+        return
+    match = request.resolver_match
+    if match is not None and match.route:
+        span.name = f"{request.method} /{match.route}"
+        span.set_attribute("http.route", f"/{match.route}")
+    span.set_attribute("http.response.status_code", response.status_code)
+    if response.status_code >= 500:
+        span.error = f"HTTP {response.status_code}"
+
+
+class TracingMiddleware:
+    """Opens the root span of a request, continuing the caller's trace when it sent a traceparent.
+
+    Streaming responses are timed until the view returns, not until the last byte is sent.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with continue_trace(request.headers.get(TRACEPARENT_HEADER)):
+            with start_span(
+                request.method or "HTTP",
+                kind=SpanKind.SERVER,
+                **{"http.request.method": request.method, "url.path": request.path},
+            ) as span:
+                response = self.get_response(request)
+                _finish_request_span(span, request, response)
+        return response
+
+    async def __acall__(self, request: HttpRequest):
+        with continue_trace(request.headers.get(TRACEPARENT_HEADER)):
+            with start_span(
+                request.method or "HTTP",
+                kind=SpanKind.SERVER,
+                **{"http.request.method": request.method, "url.path": request.path},
+            ) as span:
+                response = await self.get_response(request)
+                _finish_request_span(span, request, response)
+        return response
+
+
+_MULTIPART_REJECTION_MESSAGES = {
+    411: "Content-Length basligi olmayan form yuklemesi kabul edilmiyor.",
+    413: "Dosya form yuklemesi icin cok buyuk; buyuk videolari parcali yukleme ile gonderin.",
+}
+
+
+def _header(scope, name: bytes) -> bytes | None:
+    for key, value in scope.get("headers", ()):
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _is_multipart(scope) -> bool:
+    content_type = _header(scope, b"content-type") or b""
+    return content_type.lower().startswith(b"multipart/form-data")
+
+
+def _multipart_rejection_status(scope) -> int | None:
+    limit = int(getattr(settings, "MULTIPART_UPLOAD_MAX_BYTES", settings.FILE_UPLOAD_MAX_MEMORY_SIZE))
+    if limit <= 0:
+        return None
+    raw_length = _header(scope, b"content-length")
+    try:
+        length = int(raw_length) if raw_length is not None else None
+    except ValueError:
+        length = None
+    if length is None:
+        # Without a declared length the body size is unknown until it has been spooled.
+        return 411
+    return 413 if length > limit else None
+
+
+async def _send_plain_response(send, status: int, message: str) -> None:
+    body = message.encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"connection", b"close"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class MultipartUploadLimit:
+    """ASGI wrapper that refuses multipart bodies larger than ``MULTIPART_UPLOAD_MAX_BYTES`` before Django reads them.
+
+    Django's ASGI handler spools the whole body into a temporary file before the upload handlers run, so a large
+    multipart upload would be written to disk twice. Large videos go through the chunked upload endpoints instead.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and _is_multipart(scope):
+            status = _multipart_rejection_status(scope)
+            if status is not None:
+                await _send_plain_response(send, status, _MULTIPART_REJECTION_MESSAGES[status])
+                return
+        await self.app(scope, receive, send)
+
@@ -1,102 +1,227 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
+import hmac
+import json
+import re
 from pathlib import Path
 from uuid import UUID
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib import messages
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import AccessMixin, LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.http import FileResponse, Http404, HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from django.utils.http import content_disposition_header
 from django.views import View
 from django.views.generic import CreateView
 
+from video_merge.domain.entities import JobStatus, MergeJob, MergeJobDraft, OutputMode
 from video_merge.domain.exceptions import (
+    FFmpegUnavailableError,
     InvalidInputError,
+    JobNotFoundError,
+    MergeExecutionError,
     QueueUnavailableError,
+    UploadOffsetMismatchError,
 )
 from video_merge.infrastructure.container import build_use_case_bundle
-from video_merge.presentation.forms import MergeJobCreateForm, SignUpForm
+from video_merge.infrastructure.repositories import job_output_url
+from video_merge.presentation.downloads import abuild_download_response
+from video_merge.presentation.forms import MergeJobAppendForm, MergeJobCreateForm, SignUpForm
+from video_merge.presentation.metrics import PROMETHEUS_CONTENT_TYPE, render_prometheus
 
 
-class DashboardView(LoginRequiredMixin, View):
+class AsyncLoginRequiredMixin(AccessMixin):
+    """LoginRequiredMixin for views with async handlers.
+
+    The user is loaded with request.auser(); the plain mixin reads request.user, a blocking query
+    that Django refuses to run on the event loop.
+    """
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        # Templates and the messages framework read request.user later; give them the loaded user.
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class ApiLoginRequiredMixin(LoginRequiredMixin):
+    """LoginRequiredMixin for JSON endpoints: API clients get a 401 body instead of a redirect to the login page."""
+
+    def handle_no_permission(self) -> HttpResponse:
+        if self.request.user.is_authenticated:
+            return JsonResponse({"error": "Bu islem icin yetkiniz yok."}, status=403)
+        return JsonResponse({"error": "Oturum acmaniz gerekiyor."}, status=401)
+
+
+async def _job_list_context(request: HttpRequest, use_cases) -> dict[str, object]:
+    status_value = request.GET.get("status", "")
+    status = JobStatus(status_value) if status_value in set(JobStatus) else None
+    cursor = request.GET.get("cursor") or None
+    try:
+        page = await use_cases.list_jobs.aexecute(request.user.id, status=status, cursor=cursor)
+    except InvalidInputError:
+        page = await use_cases.list_jobs.aexecute(request.user.id, status=status)
+
+    return {
+        "jobs": page.jobs,
+        "next_cursor": page.next_cursor,
+        "status_filter": status.value if status else "",
+        "status_choices": [choice.value for choice in JobStatus],
+    }
+
+
+class DashboardView(AsyncLoginRequiredMixin, View):
     template_name = "video_merge/dashboard.html"
 
-    def get(self, request: HttpRequest) -> HttpResponse:
+    async def get(self, request: HttpRequest) -> HttpResponse:
         use_cases = build_use_case_bundle()
         context = {
             "form": MergeJobCreateForm(),
-            "jobs": use_cases.list_jobs.execute(request.user.id),
+            **await _job_list_context(request, use_cases),
         }
         return render(request, self.template_name, context)
 
-    def post(self, request: HttpRequest) -> HttpResponse:
-        form = MergeJobCreateForm(request.POST, request.FILES)
+    async def post(self, request: HttpRequest) -> HttpResponse:
         use_cases = build_use_case_bundle()
+        form, created_job = await sync_to_async(self._create_and_enqueue)(request, use_cases)
+        if created_job is not None:
+            messages.success(request, "Islem kuyruga alindi. Durumu detay ekranindan takip edebilirsiniz.")
+            return redirect("video_merge:job_detail", job_id=created_job.id)
 
+        context = {
+            "form": form,
+            **await _job_list_context(request, use_cases),
+        }
+        return render(request, self.template_name, context)
+
+    @staticmethod
+    def _create_and_enqueue(request: HttpRequest, use_cases) -> tuple[MergeJobCreateForm, MergeJob | None]:
+        """Parse the upload, store the clips and enqueue; all blocking, so it runs off the event loop.
+
+        On failure the error is added to the returned form and the job is None.
+        """
+        form = MergeJobCreateForm(request.POST, request.FILES)
         if not form.is_valid():
-            context = {
-                "form": form,
-                "jobs": use_cases.list_jobs.execute(request.user.id),
-            }
-            return render(request, self.template_name, context)
+            return form, None
 
-        files = form.cleaned_data["files"]
         try:
             created_job = use_cases.create_job.execute(
                 owner_id=request.user.id,
                 name=form.cleaned_data["name"],
-                uploaded_files=files,
+                uploaded_files=form.cleaned_data["files"],
+                output_mode=form.cleaned_data.get("output_mode", OutputMode.MP4),
             )
             use_cases.enqueue_job.execute(owner_id=request.user.id, job_id=created_job.id)
-            messages.success(request, "Islem kuyruga alindi. Durumu detay ekranindan takip edebilirsiniz.")
-            return redirect("video_merge:job_detail", job_id=created_job.id)
+            return form, created_job
         except InvalidInputError as exc:
             form.add_error("files", str(exc))
         except QueueUnavailableError as exc:
             form.add_error(None, f"Kuyruk baglantisi basarisiz: {exc}")
         except Exception as exc:  # noqa: BLE001
             form.add_error(None, f"Beklenmeyen hata: {exc}")
-
-        context = {
-            "form": form,
-            "jobs": use_cases.list_jobs.execute(request.user.id),
-        }
-        return render(request, self.template_name, context)
+        return form, None
 
 
-class JobDetailView(LoginRequiredMixin, View):
+class JobDetailView(AsyncLoginRequiredMixin, View):
     template_name = "video_merge/job_detail.html"
 
-    def get(self, request: HttpRequest, job_id: UUID) -> HttpResponse:
+    async def get(self, request: HttpRequest, job_id: UUID) -> HttpResponse:
         use_cases = build_use_case_bundle()
-        job = use_cases.get_job.execute(user_id=request.user.id, job_id=job_id, include_clips=True)
+        job = await use_cases.get_job.aexecute(user_id=request.user.id, job_id=job_id, include_clips=True)
         if job is None:
             raise Http404("Is bulunamadi.")
 
         context = {
             "job": job,
+            "output_url": job_output_url(job.id, job.output_mode),
+            "append_form": MergeJobAppendForm(),
         }
         return render(request, self.template_name, context)
 
 
-class JobOutputDownloadView(LoginRequiredMixin, View):
-    def get(self, request: HttpRequest, job_id: UUID) -> FileResponse:
+class JobOutputDownloadView(AsyncLoginRequiredMixin, View):
+    async def get(self, request: HttpRequest, job_id: UUID) -> HttpResponse:
         use_cases = build_use_case_bundle()
-        job = use_cases.get_job.execute(user_id=request.user.id, job_id=job_id, include_clips=False)
+        job = await use_cases.get_job.aexecute(user_id=request.user.id, job_id=job_id, include_clips=False)
         if job is None:
             raise Http404("Is bulunamadi.")
         if not job.output_file_name:
             raise Http404("Bu is icin indirilebilir cikti yok.")
 
         absolute_path = Path(settings.MEDIA_ROOT) / job.output_file_name
-        if not absolute_path.exists():
+        if not await asyncio.to_thread(absolute_path.exists):
             raise Http404("Cikti dosyasi diskte bulunamadi.")
 
         download_name = f"{job.name}.mp4".replace(" ", "_")
-        return FileResponse(absolute_path.open("rb"), as_attachment=True, filename=download_name)
+        return await abuild_download_response(request, absolute_path, job.output_file_name, download_name)
+
+
+class JobStreamView(AsyncLoginRequiredMixin, View):
+    async def get(self, request: HttpRequest, job_id: UUID) -> HttpResponse:
+        use_cases = build_use_case_bundle()
+        try:
+            # Lookup and probing block; the returned chunks are an async iterator over the ffmpeg pipe.
+            job, chunks = await sync_to_async(use_cases.stream_job.execute)(owner_id=request.user.id, job_id=job_id)
+        except JobNotFoundError as exc:
+            raise Http404(str(exc)) from exc
+        except (InvalidInputError, MergeExecutionError) as exc:
+            return HttpResponse(str(exc), status=409, content_type="text/plain; charset=utf-8")
+        except FFmpegUnavailableError as exc:
+            return HttpResponse(str(exc), status=503, content_type="text/plain; charset=utf-8")
+
+        # The body is produced while ffmpeg runs: no length, no ranges, nothing to cache.
+        response = StreamingHttpResponse(chunks, content_type="video/mp4")
+        response["Content-Disposition"] = content_disposition_header(False, f"{job.name}.mp4".replace(" ", "_"))
+        response["Cache-Control"] = "no-store"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+HLS_FILE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]+\.(m3u8|m4s|mp4)$")
+HLS_CONTENT_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".m4s": "video/iso.segment",
+    ".mp4": "video/mp4",
+}
+
+
+class JobHlsFileView(AsyncLoginRequiredMixin, View):
+    async def get(self, request: HttpRequest, job_id: UUID, file_name: str) -> HttpResponse:
+        if not HLS_FILE_NAME_PATTERN.match(file_name):
+            raise Http404("Gecersiz dosya adi.")
+
+        use_cases = build_use_case_bundle()
+        job = await use_cases.get_job.aexecute(user_id=request.user.id, job_id=job_id, include_clips=False)
+        if job is None:
+            raise Http404("Is bulunamadi.")
+        if job.output_mode != OutputMode.HLS or not job.output_file_name:
+            raise Http404("Bu is icin HLS ciktisi yok.")
+
+        relative_path = Path(job.output_file_name).parent / file_name
+        absolute_path = Path(settings.MEDIA_ROOT) / relative_path
+        if not await asyncio.to_thread(absolute_path.is_file):
+            raise Http404("Dosya henuz hazir degil.")
+
+        response = await abuild_download_response(
+            request,
+            absolute_path,
+            relative_path.as_posix(),
+            file_name,
+            as_attachment=False,
+            content_type=HLS_CONTENT_TYPES.get(absolute_path.suffix),
+        )
+        if absolute_path.suffix == ".m3u8":
+            # The playlist grows while the merge runs; segments never change once listed.
+            response["Cache-Control"] = "no-cache"
+        return response
 
 
 class RetryJobView(LoginRequiredMixin, View):
@@ -115,6 +240,224 @@ class RetryJobView(LoginRequiredMixin, View):
         return redirect("video_merge:job_detail", job_id=job_id)
 
 
+class AppendClipsView(LoginRequiredMixin, View):
+    def post(self, request: HttpRequest, job_id: UUID) -> HttpResponse:
+        form = MergeJobAppendForm(request.POST, request.FILES)
+        if not form.is_valid():
+            for error in form.errors.get("files", []):
+                messages.error(request, error)
+            return redirect("video_merge:job_detail", job_id=job_id)
+
+        use_cases = build_use_case_bundle()
+        try:
+            use_cases.append_clips.execute(
+                owner_id=request.user.id,
+                job_id=job_id,
+                uploaded_files=form.cleaned_data["files"],
+            )
+            use_cases.enqueue_job.execute(owner_id=request.user.id, job_id=job_id)
+            messages.success(request, "Yeni videolar eklendi ve is yeniden kuyruga alindi.")
+        except JobNotFoundError as exc:
+            raise Http404(str(exc)) from exc
+        except InvalidInputError as exc:
+            messages.error(request, str(exc))
+        except QueueUnavailableError as exc:
+            messages.error(request, f"Kuyruk baglantisi basarisiz: {exc}")
+        except Exception as exc:  # noqa: BLE001
+            messages.error(request, f"Beklenmeyen hata: {exc}")
+
+        return redirect("video_merge:job_detail", job_id=job_id)
+
+
+TUS_VERSION = "1.0.0"
+UPLOAD_READ_SIZE = 1024 * 1024
+
+
+def _parse_upload_metadata(header_value: str) -> dict[str, str]:
+    metadata: dict[str, str] = {}
+    for pair in header_value.split(","):
+        key, _, encoded_value = pair.strip().partition(" ")
+        if not key:
+            continue
+        try:
+            metadata[key] = base64.b64decode(encoded_value).decode("utf-8") if encoded_value else ""
+        except (binascii.Error, UnicodeDecodeError) as exc:
+            raise InvalidInputError(f"Gecersiz Upload-Metadata degeri: {key}") from exc
+    return metadata
+
+
+def _tus_response(status: int, **headers: str) -> HttpResponse:
+    response = HttpResponse(status=status)
+    response["Tus-Resumable"] = TUS_VERSION
+    response["Cache-Control"] = "no-store"
+    for name, value in headers.items():
+        response[name.replace("_", "-")] = value
+    return response
+
+
+class UploadJobCreateView(LoginRequiredMixin, View):
+    def post(self, request: HttpRequest) -> JsonResponse:
+        try:
+            output_mode = OutputMode(request.POST.get("output_mode") or OutputMode.MP4)
+        except ValueError:
+            return JsonResponse({"error": "Gecersiz cikti bicimi."}, status=400)
+
+        use_cases = build_use_case_bundle()
+        job = use_cases.create_upload_job.execute(
+            owner_id=request.user.id,
+            name=request.POST.get("name", ""),
+            output_mode=output_mode,
+        )
+        return JsonResponse(
+            {
+                "job_id": str(job.id),
+                "uploads_url": reverse("video_merge:upload_create"),
+                "finalize_url": reverse("video_merge:upload_job_finalize", kwargs={"job_id": job.id}),
+            },
+            status=201,
+        )
+
+
+class UploadJobFinalizeView(LoginRequiredMixin, View):
+    def post(self, request: HttpRequest, job_id: UUID) -> JsonResponse:
+        use_cases = build_use_case_bundle()
+        try:
+            use_cases.finalize_upload_job.execute(owner_id=request.user.id, job_id=job_id)
+            task_id = use_cases.enqueue_job.execute(owner_id=request.user.id, job_id=job_id)
+        except JobNotFoundError as exc:
+            return JsonResponse({"error": str(exc)}, status=404)
+        except InvalidInputError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        except QueueUnavailableError as exc:
+            return JsonResponse({"error": f"Kuyruk baglantisi basarisiz: {exc}"}, status=503)
+
+        messages.success(request, "Islem kuyruga alindi. Durumu detay ekranindan takip edebilirsiniz.")
+        return JsonResponse(
+            {
+                "job_id": str(job_id),
+                "task_id": task_id,
+                "redirect_url": reverse("video_merge:job_detail", kwargs={"job_id": job_id}),
+            }
+        )
+
+
+def _parse_job_draft(item: dict) -> MergeJobDraft:
+    clips = item["clips"]
+    if not isinstance(clips, list):
+        raise TypeError("clips must be a list")
+    return MergeJobDraft(
+        name=str(item.get("name") or ""),
+        clip_hashes=tuple(str(digest).lower() for digest in clips),
+        output_mode=OutputMode(item.get("output_mode") or OutputMode.MP4),
+    )
+
+
+class JobBatchCreateView(ApiLoginRequiredMixin, View):
+    """Create and enqueue several jobs from already uploaded clips (referenced by SHA-256)."""
+
+    def post(self, request: HttpRequest) -> JsonResponse:
+        try:
+            payload = json.loads(request.body or b"{}")
+            drafts = [_parse_job_draft(item) for item in payload["jobs"]]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return JsonResponse({"error": "Gecersiz istek govdesi."}, status=400)
+
+        use_cases = build_use_case_bundle()
+        try:
+            created = use_cases.create_job_batch.execute(owner_id=request.user.id, drafts=drafts)
+        except InvalidInputError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        except QueueUnavailableError as exc:
+            return JsonResponse({"error": f"Kuyruk baglantisi basarisiz: {exc}"}, status=503)
+
+        return JsonResponse(
+            {
+                "jobs": [
+                    {
+                        "job_id": str(job.id),
+                        "task_id": task_id,
+                        "clip_count": len(job.clips),
+                        "detail_url": reverse("video_merge:job_detail", kwargs={"job_id": job.id}),
+                    }
+                    for job, task_id in created
+                ]
+            },
+            status=201,
+        )
+
+
+class ClipUploadCreateView(LoginRequiredMixin, View):
+    def post(self, request: HttpRequest) -> HttpResponse:
+        try:
+            metadata = _parse_upload_metadata(request.headers.get("Upload-Metadata", ""))
+            length = int(request.headers.get("Upload-Length", ""))
+            upload = build_use_case_bundle().create_clip_upload.execute(
+                owner_id=request.user.id,
+                job_id=UUID(metadata.get("job_id", "")),
+                order=int(metadata.get("order", "")),
+                original_name=metadata.get("filename", ""),
+                length=length,
+            )
+        except JobNotFoundError:
+            return _tus_response(404)
+        except (InvalidInputError, ValueError) as exc:
+            return JsonResponse({"error": str(exc)}, status=400, headers={"Tus-Resumable": TUS_VERSION})
+
+        location = reverse("video_merge:upload_detail", kwargs={"upload_id": upload.id})
+        return _tus_response(201, Location=location, Upload_Offset=str(upload.offset))
+
+
+class ClipUploadView(LoginRequiredMixin, View):
+    http_method_names = ["head", "patch", "options"]
+
+    def head(self, request: HttpRequest, upload_id: UUID) -> HttpResponse:
+        upload = build_use_case_bundle().get_clip_upload.execute(owner_id=request.user.id, upload_id=upload_id)
+        if upload is None:
+            return _tus_response(404)
+        return _tus_response(200, Upload_Offset=str(upload.offset), Upload_Length=str(upload.length))
+
+    def patch(self, request: HttpRequest, upload_id: UUID) -> HttpResponse:
+        if request.content_type != "application/offset+octet-stream":
+            return _tus_response(415)
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+        except ValueError:
+            return _tus_response(400)
+
+        chunks = iter(lambda: request.read(UPLOAD_READ_SIZE), b"")
+        try:
+            upload = build_use_case_bundle().write_upload_chunk.execute(
+                owner_id=request.user.id,
+                upload_id=upload_id,
+                offset=offset,
+                chunks=chunks,
+            )
+        except JobNotFoundError:
+            return _tus_response(404)
+        except UploadOffsetMismatchError:
+            return _tus_response(409)
+        except InvalidInputError as exc:
+            return JsonResponse({"error": str(exc)}, status=400, headers={"Tus-Resumable": TUS_VERSION})
+
+        return _tus_response(204, Upload_Offset=str(upload.offset))
+
+
+class MetricsView(View):
+    """Prometheus scrape target; optionally guarded by METRICS_BEARER_TOKEN instead of a session."""
+
+    http_method_names = ["get"]
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        token = getattr(settings, "METRICS_BEARER_TOKEN", "")
+        if token:
+            scheme, _, supplied = request.headers.get("Authorization", "").partition(" ")
+            if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.strip(), token):
+                return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+
+        metrics = build_use_case_bundle().job_metrics.execute()
+        return HttpResponse(render_prometheus(metrics), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
 class SignUpView(SuccessMessageMixin, CreateView):
     form_class = SignUpForm
     template_name = "registration/signup.html"
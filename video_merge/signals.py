@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from video_merge.models import MergeClip
+
+
+@receiver(post_delete, sender=MergeClip, dispatch_uid="video_merge_release_clip_files")
+def release_clip_files_on_delete(sender, instance: MergeClip, **kwargs) -> None:  # noqa: ARG001
+    from video_merge.infrastructure.clip_storage import release_clip_files
+
+    transaction.on_commit(partial(release_clip_files, instance.file.name, instance.blob_id))
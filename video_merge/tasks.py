@@ -3,19 +3,61 @@ from __future__ import annotations
 import logging
 from uuid import UUID
 
-from celery import shared_task
+from celery import Task, shared_task
+from django.conf import settings
 
-from video_merge.domain.exceptions import JobNotFoundError
+from video_merge.domain.entities import ClipRange
+from video_merge.domain.exceptions import JobNotFoundError, StaleTaskError, UserConcurrencyLimitError
 from video_merge.infrastructure.container import build_use_case_bundle
+from video_merge.infrastructure.tracing import TRACEPARENT_HEADER, SpanKind, continue_trace, start_span
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(name="video_merge.process_merge_job")
-def process_merge_job_task(owner_id: int, job_id: str) -> None:
+class TracedTask(Task):
+    """Runs the task inside a consumer span parented on the traceparent header set when it was published.
+
+    Eager tasks carry no header and simply nest under the caller's current span.
+    """
+
+    def __call__(self, *args, **kwargs):
+        # Worker requests expose message headers as attributes; apply(headers=...) nests them.
+        traceparent = self.request.get(TRACEPARENT_HEADER) or (self.request.headers or {}).get(TRACEPARENT_HEADER)
+        with continue_trace(traceparent):
+            with start_span(
+                self.name,
+                kind=SpanKind.CONSUMER,
+                **{"celery.task_id": self.request.id, "celery.retries": self.request.retries or 0},
+            ):
+                return super().__call__(*args, **kwargs)
+
+
+@shared_task(
+    base=TracedTask,
+    bind=True,
+    name="video_merge.process_merge_job",
+    max_retries=getattr(settings, "MERGE_USER_SLOT_MAX_RETRIES", 5760),
+)
+def process_merge_job_task(self, owner_id: int, job_id: str) -> None:
     use_cases = build_use_case_bundle()
     try:
-        use_cases.process_job.execute(owner_id=owner_id, job_id=UUID(job_id))
+        use_cases.process_job.execute(owner_id=owner_id, job_id=UUID(job_id), task_id=self.request.id)
+    except StaleTaskError:
+        # The job was re-enqueued under a newer task; that one does the work.
+        logger.info("Eski gorev atlandi. owner_id=%s job_id=%s task_id=%s", owner_id, job_id, self.request.id)
+        return
+    except UserConcurrencyLimitError as exc:
+        if self.max_retries is not None and self.request.retries >= self.max_retries:
+            logger.warning("Kullanici is limiti bosalmadi, is iptal edildi. owner_id=%s job_id=%s", owner_id, job_id)
+            use_cases.abandon_waiting_job.execute(
+                UUID(job_id),
+                self.request.id,
+                f"Kullanici is limiti {self.max_retries} denemede bosalmadi; is iptal edildi.",
+            )
+            raise
+        # The job stays pending; come back once one of the owner's running jobs has finished.
+        logger.info("Kullanici is limiti dolu, tekrar denenecek. owner_id=%s job_id=%s", owner_id, job_id)
+        raise self.retry(exc=exc, countdown=getattr(settings, "MERGE_USER_SLOT_RETRY_SECONDS", 15))
     except JobNotFoundError:
         logger.exception("Merge job bulunamadi. owner_id=%s job_id=%s", owner_id, job_id)
         raise
@@ -23,3 +65,60 @@ def process_merge_job_task(owner_id: int, job_id: str) -> None:
         logger.exception("Merge job isleme hatasi. owner_id=%s job_id=%s", owner_id, job_id)
         raise
 
+
+@shared_task(base=TracedTask, name="video_merge.merge_clip_range")
+def merge_clip_range_task(
+    owner_id: int,
+    job_id: str,
+    task_id: str,
+    first_order: int,
+    last_order: int,
+    target: str = "",
+) -> str:
+    use_cases = build_use_case_bundle()
+    try:
+        return use_cases.merge_clip_range.execute(
+            owner_id=owner_id,
+            job_id=UUID(job_id),
+            task_id=task_id,
+            clip_range=ClipRange(first_order=first_order, last_order=last_order),
+            target=target,
+        )
+    except StaleTaskError:
+        # An empty name tells the chord callback that this split was superseded.
+        logger.info("Eski parca gorevi atlandi. owner_id=%s job_id=%s task_id=%s", owner_id, job_id, task_id)
+        return ""
+    except Exception:
+        logger.exception(
+            "Parca birlestirme hatasi. owner_id=%s job_id=%s aralik=%s-%s",
+            owner_id,
+            job_id,
+            first_order,
+            last_order,
+        )
+        raise
+
+
+@shared_task(base=TracedTask, name="video_merge.complete_split_merge")
+def complete_split_merge_task(part_names: list[str], owner_id: int, job_id: str, task_id: str) -> None:
+    use_cases = build_use_case_bundle()
+    try:
+        use_cases.complete_split_merge.execute(
+            owner_id=owner_id,
+            job_id=UUID(job_id),
+            task_id=task_id,
+            part_names=part_names,
+        )
+    except StaleTaskError:
+        logger.info("Eski birlestirme gorevi atlandi. owner_id=%s job_id=%s task_id=%s", owner_id, job_id, task_id)
+    except Exception:
+        logger.exception("Parca birlestirme sonu hatasi. owner_id=%s job_id=%s", owner_id, job_id)
+        raise
+
+
+@shared_task(base=TracedTask, name="video_merge.sweep_expired_uploads")
+def sweep_expired_uploads_task() -> int:
+    removed = build_use_case_bundle().sweep_uploads.execute()
+    if removed:
+        logger.info("Terk edilmis yuklemeler silindi. adet=%s", removed)
+    return removed
@@ -1,20 +1,127 @@
+import asyncio
+import base64
+import hashlib
+import io
+import json
 import shutil
+import subprocess
+import sys
 import tempfile
+from dataclasses import replace
+from datetime import timedelta
+from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 from uuid import uuid4
 
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase, override_settings
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.datastructures import MultiValueDict
 
-from video_merge.application.use_cases import CreateMergeJobUseCase
-from video_merge.domain.entities import JobStatus
+from pars_vid_bir.celery import inject_trace_context
+from video_merge.application.use_cases import (
+    AbandonWaitingJobUseCase,
+    AppendClipsUseCase,
+    CompleteSplitMergeUseCase,
+    CreateMergeJobUseCase,
+    EnqueueMergeJobUseCase,
+    MergeClipRangeUseCase,
+    ProcessMergeJobUseCase,
+    StreamMergedJobUseCase,
+    ThrottledProgressReporter,
+)
+from video_merge.benchmarks.footage import build_scenarios
+from video_merge.benchmarks.measure import measure_isolated
+from video_merge.benchmarks.runner import compare_reports
+from video_merge.benchmarks.websocket_fanout import percentile, run_fanout_benchmark
+from video_merge.domain.entities import JOB_STAGES, ClipRange, JobLane, JobStatus, MergeProgress, OutputMode, QueuedJob
+from video_merge.domain.exceptions import (
+    FFmpegUnavailableError,
+    MergeExecutionError,
+    StaleTaskError,
+    UploadOffsetMismatchError,
+    UserConcurrencyLimitError,
+)
+from video_merge.domain.interfaces import MergeJobQueue, VideoMerger
+from video_merge.infrastructure.chunked_uploads import DjangoClipUploadStore
+from video_merge.infrastructure.container import warm_up_worker_container
+from video_merge.infrastructure.event_publisher import CoalescingEventPublisher
+from video_merge.infrastructure.clip_storage import store_clip_blob
+from video_merge.infrastructure.ffmpeg_capabilities import (
+    ENCODER_LINE,
+    MUXER_LINE,
+    FFmpegCapabilities,
+    parse_ffmpeg_listing,
+)
+from video_merge.infrastructure.ffmpeg_merger import FFmpegVideoMerger, select_codec_args
+from video_merge.infrastructure.ffmpeg_process import StderrCollector, astream_ffmpeg, run_ffmpeg
+from video_merge.infrastructure.ffmpeg_progress import FFmpegProgressParser
+from video_merge.infrastructure.ffprobe import ClipStreamProfile, parse_ffprobe_output
+from video_merge.infrastructure.normalization import ClipNormalizer, needs_normalization, select_target_profile
+from video_merge.infrastructure.output_cache import FileSystemMergeOutputCache
 from video_merge.infrastructure.repositories import DjangoMergeJobRepository
-from video_merge.models import MergeJob
+from video_merge.infrastructure.tracing import (
+    SpanKind,
+    configure_tracing,
+    flush_spans,
+    parse_traceparent,
+    start_span,
+)
+from video_merge.infrastructure.upload_handlers import StagingTemporaryFileUploadHandler
+from video_merge.models import ClipBlob, ClipUpload, MergeClip, MergeJob
 from video_merge.presentation.forms import MergeJobCreateForm
+from video_merge.presentation.middleware import MultipartUploadLimit
+from video_merge.tasks import process_merge_job_task
+
+
+class RecordingVideoMerger(VideoMerger):
+    def __init__(self) -> None:
+        self.calls: list[list[Path]] = []
+        self.targets: list[str] = []
+        self.append_calls: list[list[Path]] = []
+        self.segmented_calls: list[list[Path]] = []
+
+    def append(self, base_path, clip_paths, output_path, progress_callback=None) -> bool:
+        clip_paths = list(clip_paths)
+        self.append_calls.append(clip_paths)
+        content = base_path.read_bytes() + b"".join(path.read_bytes() for path in clip_paths)
+        output_path.write_bytes(content)
+        return True
+
+    def plan_target(self, clip_paths) -> str:
+        return f"hedef-{len(list(clip_paths))}"
+
+    def merge(self, clip_paths, output_path, progress_callback=None, target="") -> None:
+        clip_paths = list(clip_paths)
+        self.calls.append(clip_paths)
+        self.targets.append(target)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(b"".join(path.read_bytes() for path in clip_paths))
+
+    def stream(self, clip_paths):
+        clip_paths = list(clip_paths)
+
+        async def chunks():
+            for path in clip_paths:
+                yield path.read_bytes()
+
+        return chunks()
+
+    def merge_segmented(self, clip_paths, playlist_path, progress_callback=None) -> None:
+        clip_paths = list(clip_paths)
+        self.segmented_calls.append(clip_paths)
+        playlist_path.parent.mkdir(parents=True, exist_ok=True)
+        segments = []
+        for index, path in enumerate(clip_paths):
+            segment_name = f"segment_{index:05d}.m4s"
+            (playlist_path.parent / segment_name).write_bytes(path.read_bytes())
+            segments.append(f"#EXTINF:1.0,\n{segment_name}\n")
+        playlist_path.write_text("#EXTM3U\n" + "".join(segments) + "#EXT-X-ENDLIST\n")
 
 
 class MergeJobCreateFormTests(TestCase):
@@ -70,6 +177,141 @@ class CreateMergeJobUseCaseTests(TestCase):
         self.assertEqual(job.clips[0].order, 1)
         self.assertEqual(job.clips[1].order, 2)
 
+    def test_clips_are_persisted_in_one_batch(self) -> None:
+        use_case = CreateMergeJobUseCase(repository=DjangoMergeJobRepository())
+        uploaded_files = [
+            SimpleUploadedFile(f"{index:03d}.mp4", b"clip-%d" % (index % 3), content_type="video/mp4")
+            for index in range(1, 31)
+        ]
+
+        with self.assertNumQueries(9):
+            job = use_case.execute(owner_id=self.user.id, name="Toplu", uploaded_files=uploaded_files)
+
+        self.assertEqual([clip.order for clip in job.clips], list(range(1, 31)))
+        self.assertTrue(all(clip.id for clip in job.clips))
+        self.assertEqual(ClipBlob.objects.count(), 3)
+        self.assertEqual(MergeClip.objects.filter(job_id=job.id).count(), 30)
+
+    def test_identical_uploads_share_one_stored_blob(self) -> None:
+        use_case = CreateMergeJobUseCase(repository=DjangoMergeJobRepository())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first = use_case.execute(
+                owner_id=self.user.id,
+                name="Gun 1",
+                uploaded_files=[SimpleUploadedFile("cam.mp4", b"same-footage", content_type="video/mp4")],
+            )
+            second = use_case.execute(
+                owner_id=self.user.id,
+                name="Gun 1 tekrar",
+                uploaded_files=[SimpleUploadedFile("cam.mp4", b"same-footage", content_type="video/mp4")],
+            )
+
+        self.assertEqual(ClipBlob.objects.count(), 1)
+        first_path, second_path = first.clips[0].file_path, second.clips[0].file_path
+        self.assertNotEqual(first_path, second_path)
+        self.assertEqual(first_path.stat().st_ino, second_path.stat().st_ino)
+        self.assertEqual(first.clips[0].content_hash, second.clips[0].content_hash)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MergeJob.objects.filter(id=first.id).delete()
+        self.assertFalse(first_path.exists())
+        self.assertEqual(ClipBlob.objects.count(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MergeJob.objects.filter(id=second.id).delete()
+        self.assertEqual(ClipBlob.objects.count(), 0)
+
+    def test_losing_a_concurrent_blob_insert_keeps_the_winners_file(self) -> None:
+        winner = store_clip_blob(SimpleUploadedFile("a.mp4", b"raced-footage"), "a.mp4")
+
+        # The lookup misses as if both uploads checked before either inserted.
+        with patch("django.db.models.query.QuerySet.first", return_value=None):
+            loser = store_clip_blob(SimpleUploadedFile("b.mp4", b"raced-footage"), "b.mp4")
+
+        self.assertEqual(loser.file.name, winner.file.name)
+        self.assertEqual(ClipBlob.objects.get(sha256=winner.sha256).file.name, winner.file.name)
+        self.assertEqual(len(list(Path(winner.file.path).parent.iterdir())), 1)
+
+    def test_staged_upload_is_renamed_into_place_without_copy(self) -> None:
+        handler = StagingTemporaryFileUploadHandler()
+        handler.new_file("files", "big.mp4", "video/mp4", 12)
+        handler.receive_data_chunk(b"large-", 0)
+        handler.receive_data_chunk(b"video!", 6)
+        uploaded = handler.file_complete(12)
+
+        staged_path = Path(uploaded.temporary_file_path())
+        self.assertTrue(staged_path.is_relative_to(self._temp_media_root))
+        self.assertEqual(uploaded.size, 12)
+        self.assertEqual(uploaded.content_sha256, hashlib.sha256(b"large-video!").hexdigest())
+        staged_inode = staged_path.stat().st_ino
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job = CreateMergeJobUseCase(DjangoMergeJobRepository()).execute(self.user.id, "Buyuk", [uploaded])
+
+        self.assertEqual(job.clips[0].file_path.stat().st_ino, staged_inode)
+        self.assertFalse(staged_path.exists())
+        uploaded.close()
+
+    def test_interrupted_staged_upload_is_removed(self) -> None:
+        handler = StagingTemporaryFileUploadHandler()
+        handler.new_file("files", "cut.mp4", "video/mp4", 12)
+        handler.receive_data_chunk(b"half", 0)
+        staged_path = Path(handler.file.temporary_file_path())
+
+        handler.upload_interrupted()
+
+        self.assertFalse(staged_path.exists())
+
+
+class JobListPaginationTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="list-user", password="secret123")
+        self.repository = DjangoMergeJobRepository()
+        created_at = timezone.now()
+        self.jobs = [
+            MergeJob.objects.create(
+                owner=self.user,
+                name=f"Is {index}",
+                status=MergeJob.Status.FAILED if index % 2 else MergeJob.Status.COMPLETED,
+                error_message="x" * 5000 if index % 2 else "",
+            )
+            for index in range(7)
+        ]
+        # Identical timestamps force the id tie-breaker to keep pages disjoint.
+        MergeJob.objects.filter(owner=self.user).update(created_at=created_at)
+
+    def test_keyset_pages_cover_every_job_once(self) -> None:
+        seen = []
+        cursor = None
+        while True:
+            with self.assertNumQueries(1):
+                page = self.repository.list_user_jobs(self.user.id, cursor=cursor, limit=3)
+            seen.extend(job.id for job in page.jobs)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, sorted((job.id for job in self.jobs), reverse=True))
+
+    def test_status_filter_and_slim_rows(self) -> None:
+        page = self.repository.list_user_jobs(self.user.id, status=JobStatus.FAILED, limit=10)
+
+        self.assertEqual(len(page.jobs), 3)
+        self.assertTrue(all(job.status == JobStatus.FAILED for job in page.jobs))
+        self.assertTrue(all(0 < len(job.error_message) < 5000 for job in page.jobs))
+        self.assertIsNone(page.next_cursor)
+
+    async def test_async_methods_match_the_sync_ones(self) -> None:
+        first = await self.repository.alist_user_jobs(self.user.id, limit=3)
+        second = await self.repository.alist_user_jobs(self.user.id, cursor=first.next_cursor, limit=3)
+        job = await self.repository.aget_user_job(self.user.id, self.jobs[0].id, include_clips=True)
+
+        self.assertEqual(first, await sync_to_async(self.repository.list_user_jobs)(self.user.id, limit=3))
+        self.assertEqual(len({*first.jobs, *second.jobs}), 6)
+        self.assertEqual((job.id, job.clips), (self.jobs[0].id, ()))
+        self.assertIsNone(await self.repository.aget_user_job(self.user.id + 1, self.jobs[0].id))
+
 
 class DashboardAccessTests(TestCase):
     def test_dashboard_requires_login(self) -> None:
@@ -126,7 +368,10 @@ class DashboardQueueDispatchTests(TestCase):
             error_message="Onceki hata",
         )
 
-        with patch("video_merge.tasks.process_merge_job_task.delay", return_value=SimpleNamespace(id="task-2")) as mock_delay:
+        with patch(
+            "video_merge.tasks.process_merge_job_task.apply_async",
+            return_value=SimpleNamespace(id="task-2"),
+        ) as mock_delay:
             response = self.client.post(reverse("video_merge:job_retry", kwargs={"job_id": job.id}))
 
         self.assertEqual(response.status_code, 302)
@@ -134,4 +379,1441 @@ class DashboardQueueDispatchTests(TestCase):
         job.refresh_from_db()
         self.assertEqual(job.status, MergeJob.Status.PENDING)
         self.assertEqual(job.error_message, "")
+        self.assertIsNotNone(job.enqueued_at)
         mock_delay.assert_called_once()
+        self.assertEqual(mock_delay.call_args.kwargs["queue"], "merge_fast")
+
+
+class FFmpegCodecSelectionTests(TestCase):
+    def _profile(self, **overrides: object) -> ClipStreamProfile:
+        values = {
+            "video_codec": "h264",
+            "width": 1920,
+            "height": 1080,
+            "pix_fmt": "yuv420p",
+            "video_time_base": "1/90000",
+            "audio_codec": "aac",
+            "sample_rate": "48000",
+            "channel_layout": "stereo",
+        }
+        values.update(overrides)
+        return ClipStreamProfile(**values)
+
+    def test_matching_clips_use_full_stream_copy(self) -> None:
+        args = select_codec_args([self._profile(), self._profile()])
+
+        self.assertEqual(args, ["-c", "copy"])
+
+    def test_audio_mismatch_only_reencodes_audio(self) -> None:
+        args = select_codec_args([self._profile(), self._profile(sample_rate="44100")])
+
+        self.assertEqual(args, ["-c:v", "copy", "-c:a", "aac"])
+
+    def test_matching_pcm_audio_is_reencoded_for_mp4(self) -> None:
+        pcm = self._profile(audio_codec="pcm_s16le")
+
+        self.assertEqual(select_codec_args([pcm, pcm]), ["-c:v", "copy", "-c:a", "aac"])
+
+    def test_missing_probe_falls_back_to_legacy_arguments(self) -> None:
+        self.assertEqual(select_codec_args(None), ["-c:v", "copy", "-c:a", "aac"])
+
+    def test_parses_ffprobe_json(self) -> None:
+        raw = (
+            '{"streams": [{"codec_type": "video", "codec_name": "h264", "width": 1280, "height": 720,'
+            ' "pix_fmt": "yuv420p", "time_base": "1/90000"},'
+            ' {"codec_type": "audio", "codec_name": "aac", "sample_rate": "48000", "channels": 2}],'
+            ' "format": {"duration": "12.5"}}'
+        )
+
+        profile = parse_ffprobe_output(raw)
+
+        self.assertEqual(profile.width, 1280)
+        self.assertEqual(profile.channel_layout, "2c")
+        self.assertEqual(profile.duration, 12.5)
+
+
+class FFmpegCapabilitiesTests(TestCase):
+    ENCODERS_OUTPUT = """Encoders:
+ V..... = Video
+ A..... = Audio
+ ------
+ V....D libx264              libx264 H.264 / AVC / MPEG-4 AVC (codec h264)
+ V....D mpeg4                MPEG-4 part 2
+ A....D aac                  AAC (Advanced Audio Coding)
+"""
+    MUXERS_OUTPUT = """File formats:
+ D. = Demuxing supported
+ .E = Muxing supported
+ ---
+  E hls             Apple HTTP Live Streaming
+  E mov             QuickTime / MOV
+  E mp4             MP4 (MPEG-4 Part 14)
+"""
+
+    def test_parses_encoder_and_muxer_listings(self) -> None:
+        encoders = parse_ffmpeg_listing(self.ENCODERS_OUTPUT, ENCODER_LINE)
+        muxers = parse_ffmpeg_listing(self.MUXERS_OUTPUT, MUXER_LINE)
+
+        self.assertEqual(encoders, {"libx264", "mpeg4", "aac"})
+        self.assertEqual(muxers, {"hls", "mov", "mp4"})
+        capabilities = FFmpegCapabilities("/opt/ffmpeg", "/opt/ffprobe", "ffmpeg version 7.0", encoders, muxers)
+        self.assertEqual(capabilities.missing_requirements(), [])
+        self.assertEqual(
+            replace(capabilities, muxers=frozenset({"mp4"})).missing_requirements(),
+            ["muxer:hls"],
+        )
+
+    def test_worker_boot_fails_without_ffprobe(self) -> None:
+        capabilities = FFmpegCapabilities(
+            "/opt/ffmpeg/bin/ffmpeg",
+            None,
+            "ffmpeg version 7.0",
+            frozenset({"libx264", "aac"}),
+            frozenset({"mp4", "hls"}),
+        )
+
+        with (
+            patch("video_merge.infrastructure.ffmpeg_capabilities.load_ffmpeg_capabilities", return_value=capabilities),
+            self.assertRaisesMessage(FFmpegUnavailableError, "binary:ffprobe"),
+        ):
+            warm_up_worker_container()
+
+    def test_injected_capabilities_skip_path_lookups(self) -> None:
+        capabilities = FFmpegCapabilities(
+            "/opt/ffmpeg/bin/ffmpeg",
+            None,
+            "ffmpeg version 7.0",
+            frozenset({"libx264", "aac"}),
+            frozenset({"mp4", "hls"}),
+        )
+        merger = FFmpegVideoMerger(capabilities=capabilities)
+
+        with patch("video_merge.infrastructure.ffmpeg_capabilities.shutil.which") as mock_which:
+            self.assertIsNone(merger._probe_clips([Path("a.mp4")]))
+            self.assertIs(merger.capabilities, capabilities)
+        mock_which.assert_not_called()
+
+    def test_target_profile_avoids_encoders_the_build_lacks(self) -> None:
+        hevc = ClipStreamProfile("hevc", 1920, 1080, "yuv420p", "1/90000", "aac", "48000", "stereo", 4.0)
+
+        self.assertEqual(select_target_profile([hevc]).video_codec, "hevc")
+        self.assertEqual(select_target_profile([hevc], encoders={"libx264", "aac"}).video_codec, "h264")
+
+
+    def test_range_is_normalized_to_the_job_wide_target(self) -> None:
+        camera = ClipStreamProfile("h264", 1920, 1080, "yuv420p", "1/90000", "aac", "48000", "stereo", 4.0)
+        phone = ClipStreamProfile("hevc", 1080, 1920, "yuv420p10le", "1/600", "aac", "44100", "mono", 4.0)
+        capabilities = FFmpegCapabilities(
+            "/opt/ffmpeg/bin/ffmpeg",
+            "/opt/ffmpeg/bin/ffprobe",
+            "ffmpeg version 7.0",
+            frozenset({"libx264", "libx265", "aac"}),
+            frozenset({"mp4", "hls"}),
+        )
+        merger = FFmpegVideoMerger(capabilities=capabilities)
+        output_path = Path(tempfile.mkdtemp(prefix="video-merge-tests-")) / "part.mp4"
+        self.addCleanup(shutil.rmtree, output_path.parent, ignore_errors=True)
+
+        with patch.object(merger, "_probe_clips", return_value=[camera, camera, phone]):
+            target = merger.plan_target([Path("a.ts"), Path("b.ts"), Path("c.mov")])
+        with (
+            patch.object(merger, "_probe_clips", return_value=[phone]),
+            patch.object(merger._normalizer, "normalize", return_value=[Path("c.mp4")]) as mock_normalize,
+            patch.object(merger, "_concat") as mock_concat,
+        ):
+            merger.merge([Path("c.mov")], output_path, target=target)
+
+        self.assertEqual(mock_normalize.call_args.kwargs["target"].video_signature, camera.video_signature)
+        self.assertTrue(mock_normalize.call_args.kwargs["reencode_video"])
+        self.assertEqual(mock_concat.call_args.args[2], ["-c", "copy"])
+
+
+class ClipNormalizerTests(TestCase):
+    def test_reencodes_every_clip_video_once_one_clip_differs(self) -> None:
+        camera = ClipStreamProfile(
+            video_codec="h264",
+            width=1920,
+            height=1080,
+            pix_fmt="yuv420p",
+            video_time_base="1/90000",
+            audio_codec="aac",
+            sample_rate="48000",
+            channel_layout="stereo",
+        )
+        phone = ClipStreamProfile(
+            video_codec="hevc",
+            width=1080,
+            height=1920,
+            pix_fmt="yuv420p10le",
+            video_time_base="1/600",
+            audio_codec="aac",
+            sample_rate="44100",
+            channel_layout="mono",
+        )
+        clip_paths = [Path("/media/a.ts"), Path("/media/b.mov"), Path("/media/c.ts")]
+        work_dir = Path("/tmp/normalize")
+
+        self.assertTrue(needs_normalization([camera, phone, camera]))
+        with patch(
+            "video_merge.infrastructure.normalization.run_ffmpeg",
+            return_value=(0, StderrCollector().summary()),
+        ) as mock_run:
+            normalized = ClipNormalizer(max_workers=4).normalize(clip_paths, [camera, phone, camera], work_dir)
+
+        # Stream-copying untouched originals next to re-encoded clips would mix H.264 parameter sets.
+        self.assertEqual(normalized, [work_dir / f"{index:04d}_normalized.mp4" for index in range(3)])
+        commands = {call.args[0][-1]: call.args[0] for call in mock_run.call_args_list}
+        phone_command = commands[str(work_dir / "0001_normalized.mp4")]
+        self.assertIn("libx264", phone_command)
+        self.assertIn("90000", phone_command)
+        self.assertIn("aformat=sample_rates=48000:channel_layouts=stereo", phone_command)
+        camera_command = commands[str(work_dir / "0000_normalized.mp4")]
+        self.assertIn("libx264", camera_command)
+        self.assertEqual(camera_command[camera_command.index("-c:a") + 1], "copy")
+
+    def test_audio_only_mismatch_copies_video(self) -> None:
+        camera = ClipStreamProfile("h264", 1920, 1080, "yuv420p", "1/90000", "aac", "48000", "stereo")
+        dubbed = replace(camera, sample_rate="44100", channel_layout="mono")
+        clip_paths = [Path("/media/a.ts"), Path("/media/b.ts")]
+        work_dir = Path("/tmp/normalize")
+
+        with patch(
+            "video_merge.infrastructure.normalization.run_ffmpeg",
+            return_value=(0, StderrCollector().summary()),
+        ) as mock_run:
+            normalized = ClipNormalizer().normalize(clip_paths, [camera, dubbed], work_dir, target=camera)
+
+        self.assertEqual(normalized, [clip_paths[0], work_dir / "0001_normalized.mp4"])
+        mock_run.assert_called_once()
+        command = mock_run.call_args.args[0]
+        self.assertEqual(command[command.index("-c:v") + 1], "copy")
+        self.assertNotIn("libx264", command)
+        self.assertNotIn("-vf", command)
+        self.assertEqual(command[command.index("-c:a") + 1], "aac")
+        self.assertIn("aformat=sample_rates=48000:channel_layouts=stereo", command)
+
+
+class MergeProgressTests(TestCase):
+    def test_parses_progress_blocks_against_total_duration(self) -> None:
+        parser = FFmpegProgressParser(total_duration_seconds=200.0)
+
+        lines = ["frame=10", "out_time=00:00:50.000000", "speed=2.0x", "progress=continue"]
+        results = [parser.feed(line) for line in lines]
+
+        self.assertEqual(results[:3], [None, None, None])
+        self.assertEqual(results[3], MergeProgress(out_time_seconds=50.0, percent=25.0, speed=2.0, eta_seconds=75.0))
+        final = parser.feed("progress=end")
+        self.assertEqual(final.percent, 100.0)
+
+    def test_throttle_drops_intermediate_events_but_keeps_completion(self) -> None:
+        received: list[MergeProgress] = []
+        reporter = ThrottledProgressReporter(received.append, min_interval_seconds=60)
+
+        reporter(MergeProgress(out_time_seconds=1.0, percent=1.0))
+        reporter(MergeProgress(out_time_seconds=2.0, percent=2.0))
+        reporter(MergeProgress(out_time_seconds=3.0, percent=100.0))
+
+        self.assertEqual([progress.percent for progress in received], [1.0, 100.0])
+
+
+class MergeOutputCacheTests(TestCase):
+    def setUp(self) -> None:
+        self._temp_media_root = tempfile.mkdtemp(prefix="video-merge-tests-")
+        self._override = override_settings(MEDIA_ROOT=self._temp_media_root)
+        self._override.enable()
+        self.user = get_user_model().objects.create_user(username="cache-user", password="secret123")
+        self.repository = DjangoMergeJobRepository()
+        self.merger = RecordingVideoMerger()
+        self.media_root = Path(self._temp_media_root)
+        self.use_case = ProcessMergeJobUseCase(
+            repository=self.repository,
+            merger=self.merger,
+            media_root=self.media_root,
+            output_cache=FileSystemMergeOutputCache(self.media_root / "merged_outputs" / "cache", max_bytes=10),
+        )
+
+    def tearDown(self) -> None:
+        self._override.disable()
+        shutil.rmtree(self._temp_media_root, ignore_errors=True)
+
+    def _create_job(self, *contents: bytes):
+        files = [
+            SimpleUploadedFile(f"{index:03d}.mp4", content, content_type="video/mp4")
+            for index, content in enumerate(contents, start=1)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            return CreateMergeJobUseCase(self.repository).execute(self.user.id, "Cache", files)
+
+    def test_same_ordered_clips_reuse_cached_output(self) -> None:
+        first = self.use_case.execute(self.user.id, self._create_job(b"aa", b"bb").id)
+        second = self.use_case.execute(self.user.id, self._create_job(b"aa", b"bb").id)
+        reordered = self.use_case.execute(self.user.id, self._create_job(b"bb", b"aa").id)
+
+        self.assertEqual(len(self.merger.calls), 2)
+        self.assertEqual(second.status, JobStatus.COMPLETED)
+        self.assertEqual((self.media_root / second.output_file_name).read_bytes(), b"aabb")
+        self.assertEqual((self.media_root / reordered.output_file_name).read_bytes(), b"bbaa")
+        self.assertNotEqual(first.output_file_name, second.output_file_name)
+
+    def test_evicts_least_recently_used_entries_over_size_limit(self) -> None:
+        outputs = [
+            self.media_root / self.use_case.execute(self.user.id, self._create_job(content).id).output_file_name
+            for content in (b"11111", b"22222", b"33333")
+        ]
+        cache_root = self.media_root / "merged_outputs" / "cache"
+        # Entries shared with a job output free nothing when removed, so they are never evicted.
+        self.assertEqual(len(list(cache_root.glob("*/*"))), 3)
+
+        for output in outputs:
+            output.unlink()
+        self.use_case.execute(self.user.id, self._create_job(b"44444").id)
+
+        cached = sorted(path.read_bytes() for path in cache_root.glob("*/*"))
+        self.assertEqual(cached, [b"22222", b"33333", b"44444"])
+
+    def test_cache_hit_still_claims_the_task(self) -> None:
+        self.use_case.execute(self.user.id, self._create_job(b"aa", b"bb").id)
+        job = self._create_job(b"aa", b"bb")
+        MergeJob.objects.filter(id=job.id).update(task_id="task-1")
+
+        completed = self.use_case.execute(self.user.id, job.id, task_id="task-1")
+
+        self.assertEqual(completed.status, JobStatus.COMPLETED)
+        with self.assertRaises(StaleTaskError):
+            self.use_case.execute(self.user.id, job.id, task_id="task-1")
+        self.assertEqual(len(self.merger.calls), 1)
+
+
+class RecordingMergeJobQueue(MergeJobQueue):
+    def __init__(self) -> None:
+        self.lanes: dict = {}
+        self.task_ids: list[str] = []
+        self.split_ranges: list = []
+
+    def enqueue_process_job(self, owner_id, queued) -> str:
+        self.lanes[queued.job_id] = queued.lane
+        self.task_ids.append(queued.task_id)
+        return queued.task_id
+
+    def enqueue_split_merge(self, owner_id, job_id, task_id, ranges, lane=JobLane.FAST, target="") -> str:
+        self.split_ranges.append(list(ranges))
+        return task_id
+
+
+class AppendClipsTests(TestCase):
+    def setUp(self) -> None:
+        self._temp_media_root = tempfile.mkdtemp(prefix="video-merge-tests-")
+        self._override = override_settings(MEDIA_ROOT=self._temp_media_root)
+        self._override.enable()
+        self.user = get_user_model().objects.create_user(username="append-user", password="secret123")
+        self.repository = DjangoMergeJobRepository()
+        self.merger = RecordingVideoMerger()
+        self.media_root = Path(self._temp_media_root)
+        self.process = ProcessMergeJobUseCase(self.repository, self.merger, self.media_root)
+
+    def tearDown(self) -> None:
+        self._override.disable()
+        shutil.rmtree(self._temp_media_root, ignore_errors=True)
+
+    def test_appends_only_new_clips_to_existing_output(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            job = CreateMergeJobUseCase(self.repository).execute(
+                self.user.id,
+                "Gun",
+                [
+                    SimpleUploadedFile("001.ts", b"aa", content_type="video/mp2t"),
+                    SimpleUploadedFile("002.ts", b"bb", content_type="video/mp2t"),
+                ],
+            )
+        self.process.execute(self.user.id, job.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            appended = AppendClipsUseCase(self.repository).execute(
+                self.user.id,
+                job.id,
+                [SimpleUploadedFile("003.ts", b"cc", content_type="video/mp2t")],
+            )
+        self.assertEqual(appended.status, JobStatus.PENDING)
+        self.assertEqual([clip.order for clip in appended.clips], [1, 2, 3])
+
+        completed = self.process.execute(self.user.id, job.id)
+
+        self.assertEqual(len(self.merger.calls), 1)
+        self.assertEqual([[path.read_bytes() for path in call] for call in self.merger.append_calls], [[b"cc"]])
+        self.assertEqual((self.media_root / completed.output_file_name).read_bytes(), b"aabbcc")
+        self.assertEqual(completed.merged_through_order, 3)
+
+    def test_failed_append_leaves_no_clip_link(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            job = CreateMergeJobUseCase(self.repository).execute(
+                self.user.id,
+                "Gun",
+                [SimpleUploadedFile("001.ts", b"aa", content_type="video/mp2t")],
+            )
+        clips_dir = job.clips[0].file_path.parent
+
+        with (
+            patch.object(MergeClip.objects, "bulk_create", side_effect=RuntimeError("db down")),
+            self.captureOnCommitCallbacks(execute=True),
+            self.assertRaises(RuntimeError),
+        ):
+            AppendClipsUseCase(self.repository).execute(
+                self.user.id,
+                job.id,
+                [SimpleUploadedFile("002.ts", b"bb", content_type="video/mp2t")],
+            )
+
+        self.assertEqual([path.name for path in clips_dir.iterdir()], [job.clips[0].file_path.name])
+
+
+class JobBatchApiTests(TestCase):
+    def setUp(self) -> None:
+        self._temp_media_root = tempfile.mkdtemp(prefix="video-merge-tests-")
+        self._override = override_settings(MEDIA_ROOT=self._temp_media_root)
+        self._override.enable()
+        self.user = get_user_model().objects.create_user(username="batch-user", password="secret123")
+        self.client.login(username="batch-user", password="secret123")
+        with self.captureOnCommitCallbacks(execute=True):
+            source = CreateMergeJobUseCase(DjangoMergeJobRepository()).execute(
+                self.user.id,
+                "Kaynak",
+                [
+                    SimpleUploadedFile("cam1.mp4", b"one", content_type="video/mp4"),
+                    SimpleUploadedFile("cam2.mp4", b"two", content_type="video/mp4"),
+                ],
+            )
+        self.hashes = [clip.content_hash for clip in source.clips]
+        self.url = reverse("video_merge:job_batch_create")
+
+    def tearDown(self) -> None:
+        self._override.disable()
+        shutil.rmtree(self._temp_media_root, ignore_errors=True)
+
+    def test_anonymous_client_gets_json_401_instead_of_login_redirect(self) -> None:
+        self.client.logout()
+        payload = {"jobs": [{"name": "Sabah", "clips": self.hashes}]}
+
+        response = self.client.post(self.url, data=payload, content_type="application/json")
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertIn("error", response.json())
+
+    def test_api_client_posts_with_csrf_token_from_login_page(self) -> None:
+        client = Client(enforce_csrf_checks=True)
+        client.get(reverse("login"))
+        client.post(
+            reverse("login"),
+            {
+                "username": "batch-user",
+                "password": "secret123",
+                "csrfmiddlewaretoken": client.cookies["csrftoken"].value,
+            },
+        )
+        payload = {"jobs": [{"name": "Sabah", "clips": self.hashes}]}
+
+        rejected = client.post(self.url, data=payload, content_type="application/json")
+        with patch("video_merge.tasks.build_use_case_bundle"):
+            accepted = client.post(
+                self.url,
+                data=payload,
+                content_type="application/json",
+                HTTP_X_CSRFTOKEN=client.cookies["csrftoken"].value,
+            )
+
+        self.assertEqual(rejected.status_code, 403)
+        self.assertEqual(accepted.status_code, 201)
+
+    def test_creates_and_enqueues_all_jobs_in_one_request(self) -> None:
+        payload = {
+            "jobs": [
+                {"name": "Sabah", "clips": self.hashes},
+                {"name": "Aksam", "clips": list(reversed(self.hashes)), "output_mode": "hls"},
+            ]
+        }
+
+        with (
+            patch("video_merge.tasks.build_use_case_bundle") as mock_bundle_builder,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.post(self.url, data=payload, content_type="application/json")
+
+        self.assertEqual(response.status_code, 201)
+        jobs = response.json()["jobs"]
+        self.assertEqual(len(jobs), 2)
+        self.assertTrue(all(item["task_id"] for item in jobs))
+        self.assertEqual(mock_bundle_builder.return_value.process_job.execute.call_count, 2)
+        for clip in MergeClip.objects.filter(job_id__in=[item["job_id"] for item in jobs]):
+            self.assertTrue(Path(clip.file.path).exists())
+
+        evening = MergeJob.objects.get(id=jobs[1]["job_id"])
+        self.assertEqual(evening.output_mode, MergeJob.OutputMode.HLS)
+        self.assertEqual(
+            list(evening.clips.order_by("order").values_list("original_name", flat=True)),
+            ["cam2.mp4", "cam1.mp4"],
+        )
+
+    def test_rejects_hashes_the_user_did_not_upload(self) -> None:
+        other = get_user_model().objects.create_user(username="batch-other", password="secret123")
+        with self.captureOnCommitCallbacks(execute=True):
+            foreign = CreateMergeJobUseCase(DjangoMergeJobRepository()).execute(
+                other.id,
+                "Baska",
+                [SimpleUploadedFile("secret.mp4", b"secret", content_type="video/mp4")],
+            )
+        payload = {"jobs": [{"name": "X", "clips": [self.hashes[0], foreign.clips[0].content_hash]}]}
+
+        response = self.client.post(self.url, data=payload, content_type="application/json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(MergeJob.objects.filter(owner=self.user).count(), 1)
+
+    def test_failure_before_enqueue_leaves_no_jobs_or_clip_links(self) -> None:
+        payload = {"jobs": [{"name": "Yarim", "clips": self.hashes}]}
+
+        with (
+            patch.object(DjangoMergeJobRepository, "mark_enqueued", side_effect=RuntimeError("db down")),
+            self.captureOnCommitCallbacks(execute=True),
+            self.assertRaises(RuntimeError),
+        ):
+            self.client.post(self.url, data=payload, content_type="application/json")
+
+        self.assertEqual(MergeJob.objects.filter(owner=self.user).count(), 1)
+        job_dirs = list((Path(self._temp_media_root) / "uploads" / f"user_{self.user.id}").iterdir())
+        self.assertEqual(len(job_dirs), 1)
+
+
+class QueueLaneTests(TestCase):
+    def setUp(self) -> None:
+        self._temp_media_root = tempfile.mkdtemp(prefix="video-merge-tests-")
+        self._override = override_settings(MEDIA_ROOT=self._temp_media_root)
+        self._override.enable()
+        self.user = get_user_model().objects.create_user(username="lane-user", password="secret123")
+        self.repository = DjangoMergeJobRepository()
+        self.create = CreateMergeJobUseCase(self.repository)
+
+    def tearDown(self) -> None:
+        self._override.disable()
+        shutil.rmtree(self._temp_media_root, ignore_errors=True)
+
+    def _job(self, name: str, *contents: bytes):
+        uploads = [
+            SimpleUploadedFile(f"{index:03d}.ts", content, content_type="video/mp2t")
+            for index, content in enumerate(contents, start=1)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.create.execute(self.user.id, name, uploads)
+
+    def test_large_jobs_are_routed_to_the_bulk_lane(self) -> None:
+        small = self._job("Kisa", b"aa")
+        large = self._job("Uzun", b"aaaa", b"bbbb")
+        queue = RecordingMergeJobQueue()
+        enqueue = EnqueueMergeJobUseCase(self.repository, queue, bulk_threshold_bytes=8)
+
+        enqueue.execute(self.user.id, small.id)
+        enqueue.execute(self.user.id, large.id)
+
+        self.assertEqual(queue.lanes, {small.id: JobLane.FAST, large.id: JobLane.BULK})
+        stored = MergeJob.objects.get(id=large.id)
+        self.assertEqual(stored.lane, MergeJob.Lane.BULK)
+        self.assertIsNotNone(stored.enqueued_at)
+        self.assertIsNone(stored.started_at)
+
+    def test_job_waits_while_owner_is_at_running_limit(self) -> None:
+        busy = self._job("Calisan", b"aa")
+        waiting = self._job("Bekleyen", b"bb")
+        MergeJob.objects.filter(id=busy.id).update(status=MergeJob.Status.RUNNING)
+        EnqueueMergeJobUseCase(self.repository, RecordingMergeJobQueue()).execute(self.user.id, waiting.id)
+        process = ProcessMergeJobUseCase(
+            self.repository,
+            RecordingVideoMerger(),
+            Path(self._temp_media_root),
+            max_running_per_user=1,
+        )
+
+        with self.assertRaises(UserConcurrencyLimitError):
+            process.execute(self.user.id, waiting.id)
+        self.assertEqual(MergeJob.objects.get(id=waiting.id).status, MergeJob.Status.PENDING)
+
+        MergeJob.objects.filter(id=busy.id).update(status=MergeJob.Status.COMPLETED)
+        completed = process.execute(self.user.id, waiting.id)
+
+        self.assertEqual(completed.status, JobStatus.COMPLETED)
+        self.assertIsNotNone(completed.started_at)
+        self.assertGreaterEqual(completed.queue_wait_seconds, 0)
+
+    def test_running_job_older_than_task_time_limit_does_not_hold_a_slot(self) -> None:
+        abandoned = self._job("Olu worker", b"aa")
+        waiting = self._job("Bekleyen", b"bb")
+        MergeJob.objects.filter(id=abandoned.id).update(
+            status=MergeJob.Status.RUNNING,
+            started_at=timezone.now() - timedelta(hours=3),
+        )
+        EnqueueMergeJobUseCase(self.repository, RecordingMergeJobQueue()).execute(self.user.id, waiting.id)
+        process = ProcessMergeJobUseCase(
+            self.repository,
+            RecordingVideoMerger(),
+            Path(self._temp_media_root),
+            max_running_per_user=1,
+            running_stale_seconds=2 * 3600,
+        )
+
+        completed = process.execute(self.user.id, waiting.id)
+
+        self.assertEqual(completed.status, JobStatus.COMPLETED)
+        MergeJob.objects.filter(id=abandoned.id).update(started_at=timezone.now())
+        other = self._job("Sonraki", b"cc")
+        EnqueueMergeJobUseCase(self.repository, RecordingMergeJobQueue()).execute(self.user.id, other.id)
+        with self.assertRaises(UserConcurrencyLimitError):
+            process.execute(self.user.id, other.id)
+
+    def test_task_fails_job_after_last_slot_retry(self) -> None:
+        job = self._job("Sabirsiz", b"aa")
+        task_id = EnqueueMergeJobUseCase(self.repository, RecordingMergeJobQueue()).execute(self.user.id, job.id)
+        use_cases = SimpleNamespace(
+            process_job=SimpleNamespace(execute=Mock(side_effect=UserConcurrencyLimitError("Limit dolu."))),
+            abandon_waiting_job=AbandonWaitingJobUseCase(self.repository),
+        )
+
+        with (
+            patch("video_merge.tasks.build_use_case_bundle", return_value=use_cases),
+            self.assertRaises(UserConcurrencyLimitError),
+        ):
+            process_merge_job_task.apply(
+                args=(self.user.id, str(job.id)),
+                task_id=task_id,
+                retries=process_merge_job_task.max_retries,
+                throw=True,
+            )
+
+        stored = MergeJob.objects.get(id=job.id)
+        self.assertEqual(stored.status, MergeJob.Status.FAILED)
+        self.assertIn("denemede bosalmadi", stored.error_message)
+
+    def test_superseded_task_does_not_run(self) -> None:
+        job = self._job("Tekrar", b"aa")
+        queue = RecordingMergeJobQueue()
+        enqueue = EnqueueMergeJobUseCase(self.repository, queue)
+        merger = RecordingVideoMerger()
+        process = ProcessMergeJobUseCase(self.repository, merger, Path(self._temp_media_root))
+
+        first_task = enqueue.execute(self.user.id, job.id)
+        second_task = enqueue.execute(self.user.id, job.id)
+
+        self.assertNotEqual(first_task, second_task)
+        self.assertEqual(MergeJob.objects.get(id=job.id).task_id, second_task)
+        with self.assertRaises(StaleTaskError):
+            process.execute(self.user.id, job.id, task_id=first_task)
+        self.assertEqual(merger.calls, [])
+
+        completed = process.execute(self.user.id, job.id, task_id=second_task)
+        self.assertEqual(completed.status, JobStatus.COMPLETED)
+        with self.assertRaises(StaleTaskError):
+            process.execute(self.user.id, job.id, task_id=second_task)
+        self.assertEqual(len(merger.calls), 1)
+
+    def test_only_one_of_two_concurrent_enqueues_wins(self) -> None:
+        job = self._job("Cift Tik", b"aa")
+        read_task_id = MergeJob.objects.get(id=job.id).task_id
+
+        first = self.repository.mark_enqueued([QueuedJob(job.id, "task-a", previous_task_id=read_task_id)])
+        second = self.repository.mark_enqueued([QueuedJob(job.id, "task-b", previous_task_id=read_task_id)])
+
+        self.assertEqual(first, {job.id})
+        self.assertEqual(second, set())
+        self.assertEqual(MergeJob.objects.get(id=job.id).task_id, "task-a")
+
+
+class JobStageMetricsTests(TestCase):
+    def setUp(self) -> None:
+        self._temp_media_root = tempfile.mkdtemp(prefix="video-merge-tests-")
+        self._override = override_settings(MEDIA_ROOT=self._temp_media_root, METRICS_BEARER_TOKEN="")
+        self._override.enable()
+        self.user = get_user_model().objects.create_user(username="metrics-user", password="secret123")
+        self.repository = DjangoMergeJobRepository()
+        self.enqueue = EnqueueMergeJobUseCase(self.repository, RecordingMergeJobQueue())
+        self.process = ProcessMergeJobUseCase(self.repository, RecordingVideoMerger(), Path(self._temp_media_root))
+
+    def tearDown(self) -> None:
+        self._override.disable()
+        shutil.rmtree(self._temp_media_root, ignore_errors=True)
+
+    def _queued_job(self, name: str, *contents: bytes):
+        uploads = [
+            SimpleUploadedFile(f"{index:03d}.ts", content, content_type="video/mp2t")
+            for index, content in enumerate(contents, start=1)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            job = CreateMergeJobUseCase(self.repository).execute(self.user.id, name, uploads)
+        self.enqueue.execute(self.user.id, job.id)
+        return job
+
+    def test_completed_job_records_every_stage_and_byte_counts(self) -> None:
+        job = self._queued_job("Asamalar", b"aaa", b"bbbbb")
+
+        completed = self.process.execute(self.user.id, job.id)
+
+        self.assertEqual(set(completed.stage_durations), {stage for stage, _, _ in JOB_STAGES})
+        self.assertEqual(completed.input_bytes, 8)
+        self.assertEqual(completed.output_bytes, 8)
+        self.assertLessEqual(completed.merge_started_at, completed.merge_finished_at)
+        self.assertLessEqual(completed.merge_finished_at, completed.finished_at)
+
+    def test_appended_job_starts_its_stages_over(self) -> None:
+        job = self._queued_job("Tekrar", b"aa")
+        self.process.execute(self.user.id, job.id)
+
+        extra = SimpleUploadedFile("002.ts", b"cc", content_type="video/mp2t")
+        with self.captureOnCommitCallbacks(execute=True):
+            AppendClipsUseCase(self.repository).execute(self.user.id, job.id, [extra])
+        self.enqueue.execute(self.user.id, job.id)
+
+        stored = self.repository.get_user_job(self.user.id, job.id)
+        self.assertEqual(set(stored.stage_durations), {"upload", "enqueue"})
+        self.assertEqual(stored.input_bytes, 4)
+
+    def test_metrics_endpoint_exposes_histograms_and_queue_depth(self) -> None:
+        self.process.execute(self.user.id, self._queued_job("Biten", b"aaaa").id)
+        self._queued_job("Bekleyen", b"bb")
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn("# TYPE merge_job_stage_duration_seconds histogram", body)
+        self.assertIn('merge_job_stage_duration_seconds_count{stage="merge",lane="fast"} 1', body)
+        self.assertIn('merge_job_stage_duration_seconds_bucket{stage="merge",lane="fast",le="+Inf"} 1', body)
+        self.assertIn('merge_job_output_bytes_bucket{lane="fast",le="1048576"} 1', body)
+        self.assertIn('merge_job_output_bytes_sum{lane="fast"} 4.0', body)
+        self.assertIn('merge_jobs_queued{lane="fast"} 1', body)
+        self.assertIn('merge_jobs_queued{lane="bulk"} 0', body)
+
+    def test_metrics_endpoint_checks_configured_bearer_token(self) -> None:
+        with override_settings(METRICS_BEARER_TOKEN="scrape-secret"):
+            denied = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong")
+            allowed = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret")
+
+        self.assertEqual(denied.status_code, 401)
+        self.assertEqual(allowed.status_code, 200)
+
+
+class InlineSplitMergeQueue(RecordingMergeJobQueue):
+    """Runs a split job's ranges and its final concat in place of a Celery chord."""
+
+    def __init__(self, merge_range: MergeClipRangeUseCase, complete: CompleteSplitMergeUseCase) -> None:
+        super().__init__()
+        self.merge_range = merge_range
+        self.complete = complete
+
+    def enqueue_split_merge(self, owner_id, job_id, task_id, ranges, lane=JobLane.FAST, target="") -> str:
+        super().enqueue_split_merge(owner_id, job_id, task_id, ranges, lane, target)
+        parts = [self.merge_range.execute(owner_id, job_id, task_id, clip_range, target) for clip_range in ranges]
+        self.complete.execute(owner_id, job_id, task_id, parts)
+        return "chord"
+
+
+class FailingOnceVideoMerger(RecordingVideoMerger):
+    def __init__(self, failing_content: bytes) -> None:
+        super().__init__()
+        self.failing_content = failing_content
+
+    def merge(self, clip_paths, output_path, progress_callback=None, target="") -> None:
+        clip_paths = list(clip_paths)
+        if any(path.read_bytes() == self.failing_content for path in clip_paths):
+            self.failing_content = None
+            raise MergeExecutionError("bozuk klip")
+        super().merge(clip_paths, output_path, progress_callback, target)
+
+
+class SplitMergeTests(TestCase):
+    def setUp(self) -> None:
+        self._temp_media_root = tempfile.mkdtemp(prefix="video-merge-tests-")
+        self._override = override_settings(MEDIA_ROOT=self._temp_media_root)
+        self._override.enable()
+        self.user = get_user_model().objects.create_user(username="split-user", password="secret123")
+        self.repository = DjangoMergeJobRepository()
+        self.media_root = Path(self._temp_media_root)
+
+    def tearDown(self) -> None:
+        self._override.disable()
+        shutil.rmtree(self._temp_media_root, ignore_errors=True)
+
+    def _setup_pipeline(self, merger: RecordingVideoMerger) -> None:
+        self.merger = merger
+        self.queue = InlineSplitMergeQueue(
+            MergeClipRangeUseCase(self.repository, merger, self.media_root),
+            CompleteSplitMergeUseCase(self.repository, merger, self.media_root),
+        )
+        self.enqueue = EnqueueMergeJobUseCase(self.repository, self.queue)
+        self.process = ProcessMergeJobUseCase(
+            self.repository,
+            merger,
+            self.media_root,
+            queue=self.queue,
+            split_range_clips=2,
+        )
+
+    def _job(self):
+        uploads = [
+            SimpleUploadedFile(f"{index:03d}.ts", content, content_type="video/mp2t")
+            for index, content in enumerate([b"a1", b"b2", b"c3", b"d4", b"e5"], start=1)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            return CreateMergeJobUseCase(self.repository).execute(self.user.id, "Uzun Gun", uploads)
+
+    def test_large_job_is_merged_in_ranges_then_concatenated(self) -> None:
+        self._setup_pipeline(RecordingVideoMerger())
+        job = self._job()
+
+        task_id = self.enqueue.execute(self.user.id, job.id)
+        self.process.execute(self.user.id, job.id, task_id=task_id)
+
+        self.assertEqual(
+            [(item.first_order, item.last_order) for item in self.queue.split_ranges[0]],
+            [(1, 2), (3, 4), (5, 5)],
+        )
+        stored = MergeJob.objects.get(id=job.id)
+        self.assertEqual(stored.status, MergeJob.Status.COMPLETED)
+        self.assertEqual(Path(stored.output_file.path).read_bytes(), b"a1b2c3d4e5")
+        self.assertEqual(len(self.merger.calls), 4)
+        # Every range is rendered to the format planned over all five clips; the final concat needs none.
+        self.assertEqual(self.merger.targets, ["hedef-5", "hedef-5", "hedef-5", ""])
+        self.assertFalse(self._parts_dir(job).exists())
+
+    def _parts_dir(self, job) -> Path:
+        return self.media_root / "merged_outputs" / f"user_{self.user.id}" / f"{job.id}_parts"
+
+    def test_retry_after_a_failed_range_merges_only_that_range(self) -> None:
+        self._setup_pipeline(FailingOnceVideoMerger(b"e5"))
+        job = self._job()
+
+        with self.assertRaises(MergeExecutionError):
+            self.process.execute(self.user.id, job.id, task_id=self.enqueue.execute(self.user.id, job.id))
+        failed = MergeJob.objects.get(id=job.id)
+        self.assertEqual(failed.status, MergeJob.Status.FAILED)
+        self.assertIn("5-5", failed.error_message)
+        self.assertEqual(len(list(self._parts_dir(job).iterdir())), 2)
+        first_attempt_calls = len(self.merger.calls)
+
+        self.process.execute(self.user.id, job.id, task_id=self.enqueue.execute(self.user.id, job.id))
+
+        self.assertEqual(MergeJob.objects.get(id=job.id).status, MergeJob.Status.COMPLETED)
+        retry_calls = self.merger.calls[first_attempt_calls:]
+        # Ranges 1-2 and 3-4 are reused; the retry renders range 5, then the final concat of three parts.
+        self.assertEqual([[path.read_bytes() for path in call] for call in retry_calls[:1]], [[b"e5"]])
+        self.assertEqual(len(retry_calls), 2)
+        self.assertEqual(len(retry_calls[1]), 3)
+        self.assertEqual(Path(MergeJob.objects.get(id=job.id).output_file.path).read_bytes(), b"a1b2c3d4e5")
+        self.assertFalse(self._parts_dir(job).exists())
+
+    def test_stale_range_failure_keeps_the_current_runs_parts(self) -> None:
+        self._setup_pipeline(FailingOnceVideoMerger(b"a1"))
+        job = self._job()
+        stale_task = self.enqueue.execute(self.user.id, job.id)
+        MergeJob.objects.filter(id=job.id).update(status=MergeJob.Status.RUNNING)
+        current_part = self._parts_dir(job) / "current.mp4"
+        current_part.parent.mkdir(parents=True)
+        current_part.write_bytes(b"part")
+        # The range passed its task check, then the job was re-enqueued while it was merging.
+        MergeJob.objects.filter(id=job.id).update(task_id="newer")
+
+        with (
+            patch("video_merge.application.use_cases._require_current_task"),
+            self.assertRaises(MergeExecutionError),
+        ):
+            self.queue.merge_range.execute(self.user.id, job.id, stale_task, ClipRange(1, 2))
+
+        stored = MergeJob.objects.get(id=job.id)
+        self.assertEqual(stored.status, MergeJob.Status.RUNNING)
+        self.assertTrue(current_part.exists())
+
+    def test_superseded_split_does_not_complete(self) -> None:
+        self._setup_pipeline(RecordingVideoMerger())
+        job = self._job()
+        stale_task = self.enqueue.execute(self.user.id, job.id)
+        self.enqueue.execute(self.user.id, job.id)
+        MergeJob.objects.filter(id=job.id).update(status=MergeJob.Status.RUNNING)
+
+        with self.assertRaises(StaleTaskError):
+            self.queue.merge_range.execute(self.user.id, job.id, stale_task, ClipRange(1, 2))
+        self.assertEqual(self.merger.calls, [])
+
+
+class HlsOutputTests(TestCase):
+    def setUp(self) -> None:
+        self._temp_media_root = tempfile.mkdtemp(prefix="video-merge-tests-")
+        self._override = override_settings(MEDIA_ROOT=self._temp_media_root)
+        self._override.enable()
+        self.user = get_user_model().objects.create_user(username="hls-user", password="secret123")
+        # The view streams an async iterator, which only the async client can consume.
+        self.async_client.login(username="hls-user", password="secret123")
+        self.repository = DjangoMergeJobRepository()
+        self.merger = RecordingVideoMerger()
+        self.process = ProcessMergeJobUseCase(self.repository, self.merger, Path(self._temp_media_root))
+
+    def tearDown(self) -> None:
+        self._override.disable()
+        shutil.rmtree(self._temp_media_root, ignore_errors=True)
+
+    def _merge_segmented_job(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = CreateMergeJobUseCase(self.repository).execute(
+                self.user.id,
+                "Canli",
+                [
+                    SimpleUploadedFile("001.ts", b"aa", content_type="video/mp2t"),
+                    SimpleUploadedFile("002.ts", b"bb", content_type="video/mp2t"),
+                ],
+                output_mode=OutputMode.HLS,
+            )
+        return job, self.process.execute(self.user.id, job.id)
+
+    async def test_segmented_job_serves_playlist_and_segments(self) -> None:
+        job, completed = await sync_to_async(self._merge_segmented_job)()
+
+        self.assertEqual(self.merger.calls, [])
+        self.assertEqual(len(self.merger.segmented_calls), 1)
+        self.assertTrue(completed.output_file_name.endswith(f"{job.id}_hls/index.m3u8"))
+
+        playlist = await self.async_client.get(
+            reverse("video_merge:job_hls_file", kwargs={"job_id": job.id, "file_name": "index.m3u8"})
+        )
+        self.assertEqual(playlist.status_code, 200)
+        self.assertTrue(playlist.is_async)
+        self.assertEqual(playlist["Content-Type"], "application/vnd.apple.mpegurl")
+        self.assertEqual(playlist["Cache-Control"], "no-cache")
+        self.assertNotIn("attachment", playlist["Content-Disposition"])
+        self.assertIn(b"segment_00001.m4s", b"".join([chunk async for chunk in playlist.streaming_content]))
+
+        segment = await self.async_client.get(
+            reverse("video_merge:job_hls_file", kwargs={"job_id": job.id, "file_name": "segment_00001.m4s"}),
+            headers={"Range": "bytes=1-"},
+        )
+        self.assertEqual(segment.status_code, 206)
+        self.assertEqual(b"".join([chunk async for chunk in segment.streaming_content]), b"b")
+
+        escaped = await self.async_client.get(
+            reverse("video_merge:job_hls_file", kwargs={"job_id": job.id, "file_name": "..%2Findex.m3u8"})
+        )
+        self.assertEqual(escaped.status_code, 404)
+
+
+class StreamedMergeTests(TestCase):
+    def setUp(self) -> None:
+        self._temp_media_root = tempfile.mkdtemp(prefix="video-merge-tests-")
+        self._override = override_settings(MEDIA_ROOT=self._temp_media_root)
+        self._override.enable()
+        self.user = get_user_model().objects.create_user(username="stream-user", password="secret123")
+        # The view streams an async iterator, which only the async client can consume.
+        self.async_client.login(username="stream-user", password="secret123")
+        self.repository = DjangoMergeJobRepository()
+
+    def tearDown(self) -> None:
+        self._override.disable()
+        shutil.rmtree(self._temp_media_root, ignore_errors=True)
+
+    async def test_streams_clips_in_job_order_without_output_file(self) -> None:
+        def create_job():
+            with self.captureOnCommitCallbacks(execute=True):
+                return CreateMergeJobUseCase(self.repository).execute(
+                    self.user.id,
+                    "Izle",
+                    [
+                        SimpleUploadedFile("001.ts", b"aa", content_type="video/mp2t"),
+                        SimpleUploadedFile("002.ts", b"bb", content_type="video/mp2t"),
+                    ],
+                )
+
+        job = await sync_to_async(create_job)()
+        use_cases = SimpleNamespace(stream_job=StreamMergedJobUseCase(self.repository, RecordingVideoMerger()))
+
+        with patch("video_merge.presentation.views.build_use_case_bundle", return_value=use_cases):
+            response = await self.async_client.get(reverse("video_merge:job_stream", kwargs={"job_id": job.id}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        self.assertEqual(response["Content-Type"], "video/mp4")
+        self.assertEqual(b"".join([chunk async for chunk in response.streaming_content]), b"aabb")
+        self.assertFalse((await MergeJob.objects.aget(id=job.id)).output_file)
+
+    async def test_pipe_reader_yields_bounded_chunks_and_exit_status(self) -> None:
+        script = "import sys; sys.stdout.buffer.write(b'x' * 1000); sys.stderr.write('[error] boom\\n'); sys.exit(3)"
+        exits = []
+
+        chunks = [
+            chunk
+            async for chunk in astream_ffmpeg(
+                [sys.executable, "-c", script],
+                chunk_size=300,
+                on_exit=lambda returncode, summary: exits.append((returncode, summary)),
+            )
+        ]
+
+        self.assertTrue(all(len(chunk) <= 300 for chunk in chunks))
+        self.assertEqual(b"".join(chunks), b"x" * 1000)
+        self.assertEqual(exits[0][0], 3)
+        self.assertEqual(exits[0][1].error_count, 1)
+
+    async def test_closing_or_cancelling_the_pipe_reader_kills_ffmpeg(self) -> None:
+        script = "import sys, time; sys.stdout.buffer.write(b'x'); sys.stdout.flush(); time.sleep(60)"
+        exits = []
+
+        stream = astream_ffmpeg([sys.executable, "-c", script], on_exit=lambda *status: exits.append(status))
+        self.assertEqual(await anext(stream), b"x")
+        await asyncio.wait_for(stream.aclose(), timeout=10)
+
+        async def consume() -> None:
+            async for _chunk in astream_ffmpeg([sys.executable, "-c", script]):
+                pass
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=10)
+        # Killed, not finished: the exit hook only runs once ffmpeg ends on its own.
+        self.assertEqual(exits, [])
+
+
+class StderrCollectorTests(TestCase):
+    def test_keeps_bounded_tail_and_counts_severities(self) -> None:
+        log_file = io.StringIO()
+        collector = StderrCollector(max_lines=3, log_file=log_file)
+
+        for index in range(10):
+            collector.feed(f"[mpegts @ 0x1] [warning] Non-monotonic DTS {index}\n")
+        collector.feed("[error] Invalid data found when processing input\n")
+        summary = collector.summary()
+
+        self.assertEqual(len(summary.tail), 3)
+        self.assertEqual(summary.total_lines, 11)
+        self.assertEqual(summary.warning_count, 10)
+        self.assertEqual(summary.error_count, 1)
+        self.assertIn("8 satir kisaltildi", summary.format())
+        self.assertEqual(log_file.getvalue().count("\n"), 11)
+
+
+class MergeBenchmarkTests(TestCase):
+    def test_scenarios_cover_every_axis_plus_mixed_resolutions(self) -> None:
+        scenarios = build_scenarios(["h264"], ["640x360", "1280x720"], [3], [2.0])
+
+        self.assertEqual(
+            [scenario.name for scenario in scenarios],
+            ["h264-640x360-3x2s", "h264-1280x720-3x2s", "h264-mixed-3x2s"],
+        )
+        mixed = scenarios[-1]
+        self.assertEqual([clip.resolution for clip in mixed.clips], ["640x360", "1280x720", "640x360"])
+        self.assertEqual(len({clip.file_name for clip in mixed.clips}), 3)
+        self.assertEqual(mixed.total_seconds, 6.0)
+
+    def test_comparison_flags_only_regressions_beyond_tolerance(self) -> None:
+        baseline = {"summary": {"a/merger": {"wall_seconds": 10.0, "cpu_seconds": 8.0, "peak_child_rss_bytes": 100}}}
+        current = {"summary": {"a/merger": {"wall_seconds": 12.0, "cpu_seconds": 8.4, "peak_child_rss_bytes": 90}}}
+
+        lines, regressions = compare_reports(current, baseline, tolerance=0.1)
+
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(regressions, ["a/merger wall_seconds: 10.000 -> 12.000 (+20.0%)"])
+
+    def test_isolated_measurement_counts_child_process_cpu(self) -> None:
+        command = [sys.executable, "-c", "sum(range(2_000_000))"]
+
+        measurement, result = measure_isolated(lambda: lambda: subprocess.run(command, check=True).returncode)
+
+        self.assertEqual(result, 0)
+        self.assertGreater(measurement.cpu_user_seconds + measurement.cpu_system_seconds, 0)
+        self.assertGreater(measurement.peak_child_rss_bytes, 0)
+
+
+class RecordingChannelLayer:
+    def __init__(self) -> None:
+        self.sent: list[tuple[str, dict]] = []
+
+    async def group_send(self, group, event) -> None:
+        self.sent.append((group, event))
+
+
+class JobEventPublishingTests(TestCase):
+    def test_set_status_updates_and_reads_back_in_one_query(self) -> None:
+        user = get_user_model().objects.create_user(username="events-user", password="secret123")
+        job = MergeJob.objects.create(owner=user, name="Olay")
+
+        with (
+            override_settings(REALTIME_UPDATES_ENABLED=True),
+            patch("video_merge.infrastructure.repositories.get_event_publisher") as mock_publisher,
+            self.assertNumQueries(1),
+        ):
+            DjangoMergeJobRepository().set_status(job.id, JobStatus.FAILED, error_message="Bozuk klip")
+
+        group, job_id, event = mock_publisher.return_value.publish.call_args.args
+        self.assertEqual((group, job_id), (f"user_jobs_{user.id}", job.id))
+        self.assertEqual(event["payload"]["status"], "failed")
+        self.assertEqual(event["payload"]["error_message"], "Bozuk klip")
+        self.assertEqual(MergeJob.objects.get(id=job.id).status, MergeJob.Status.FAILED)
+
+    def test_stale_task_cannot_fail_a_reenqueued_job(self) -> None:
+        user = get_user_model().objects.create_user(username="stale-status-user", password="secret123")
+        job = MergeJob.objects.create(owner=user, name="Yeni", status=MergeJob.Status.RUNNING, task_id="new")
+
+        for returning in (True, False):
+            with patch("video_merge.infrastructure.repositories._supports_update_returning", return_value=returning):
+                DjangoMergeJobRepository().set_status(job.id, JobStatus.FAILED, error_message="eski", task_id="old")
+            self.assertEqual(MergeJob.objects.get(id=job.id).status, MergeJob.Status.RUNNING)
+
+        DjangoMergeJobRepository().set_status(job.id, JobStatus.FAILED, error_message="guncel", task_id="new")
+        self.assertEqual(MergeJob.objects.get(id=job.id).status, MergeJob.Status.FAILED)
+
+    def test_publisher_keeps_only_the_latest_event_per_job(self) -> None:
+        layer = RecordingChannelLayer()
+        # A long interval keeps the background thread out of the way; the test flushes by hand.
+        publisher = CoalescingEventPublisher(flush_interval_seconds=60, channel_layer=layer)
+        first, second = uuid4(), uuid4()
+
+        def event(event_type: str, marker: str) -> dict:
+            return {"type": event_type, "payload": {"marker": marker}}
+
+        publisher.publish("g", first, event("job.status.event", "running"))
+        publisher.publish("g", first, event("job.progress.event", "10"))
+        publisher.publish("g", second, event("job.progress.event", "b-50"))
+        publisher.publish("g", first, event("job.progress.event", "40"))
+        publisher.publish("g", first, event("job.status.event", "completed"))
+
+        self.assertEqual(publisher.flush(), 2)
+        self.assertEqual([sent["payload"]["marker"] for _group, sent in layer.sent], ["b-50", "completed"])
+        self.assertEqual(publisher.flush(), 0)
+        publisher.close()
+
+
+class WebSocketFanoutBenchmarkTests(TestCase):
+    def test_every_subscriber_of_the_owner_receives_each_event(self) -> None:
+        # 7 sockets over 3 users: user 1 has three subscribers, users 2 and 3 two each.
+        [result] = run_fanout_benchmark([7], users=3, rates=[50], duration_seconds=0.2, flush_interval_seconds=0.02)
+
+        self.assertEqual(result.publishes, 10)
+        self.assertEqual(result.expected_deliveries, 4 * 3 + 3 * 2 + 3 * 2)
+        self.assertEqual(result.deliveries, result.expected_deliveries)
+        self.assertEqual(result.lost, 0)
+        self.assertLessEqual(result.latency_p50_ms, result.latency_p99_ms)
+        self.assertGreater(result.python_bytes_per_connection, 0)
+
+    def test_percentile_uses_nearest_rank(self) -> None:
+        values = [float(value) for value in range(1, 101)]
+
+        self.assertEqual(percentile(values, 0.50), 50.0)
+        self.assertEqual(percentile(values, 0.99), 99.0)
+        self.assertEqual(percentile([3.0], 0.99), 3.0)
+        self.assertIsNone(percentile([], 0.5))
+
+
+class TracePropagationTests(TestCase):
+    def setUp(self) -> None:
+        self._temp_media_root = tempfile.mkdtemp(prefix="video-merge-tests-")
+        self._override = override_settings(MEDIA_ROOT=self._temp_media_root)
+        self._override.enable()
+        self.trace_path = Path(self._temp_media_root) / "traces" / "spans.jsonl"
+        configure_tracing(self.trace_path)
+        self.user = get_user_model().objects.create_user(username="trace-user", password="secret123")
+        self.client.login(username="trace-user", password="secret123")
+
+    def tearDown(self) -> None:
+        configure_tracing(None)
+        self._override.disable()
+        shutil.rmtree(self._temp_media_root, ignore_errors=True)
+
+    def _spans(self) -> list[dict]:
+        flush_spans()
+        spans = []
+        for line in self.trace_path.read_text().splitlines():
+            for resource_spans in json.loads(line)["resourceSpans"]:
+                for scope_spans in resource_spans["scopeSpans"]:
+                    spans.extend(scope_spans["spans"])
+        return spans
+
+    def test_retry_request_trace_reaches_the_task_and_its_repository_calls(self) -> None:
+        repository = DjangoMergeJobRepository()
+        uploads = [SimpleUploadedFile("001.ts", b"aa", content_type="video/mp2t")]
+        with self.captureOnCommitCallbacks(execute=True):
+            job = CreateMergeJobUseCase(repository).execute(self.user.id, "Iz", uploads)
+        repository.set_status(job.id, JobStatus.FAILED, error_message="Onceki hata")
+        self.trace_path.unlink(missing_ok=True)
+        bundle = SimpleNamespace(
+            process_job=ProcessMergeJobUseCase(repository, RecordingVideoMerger(), Path(self._temp_media_root))
+        )
+        caller = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+        with patch("video_merge.tasks.build_use_case_bundle", return_value=bundle):
+            self.client.post(reverse("video_merge:job_retry", kwargs={"job_id": job.id}), HTTP_TRACEPARENT=caller)
+
+        spans = self._spans()
+        by_name = {span["name"]: span for span in spans}
+        self.assertEqual({span["traceId"] for span in spans}, {"0af7651916cd43dd8448eb211c80319c"})
+        server = by_name["POST /jobs/<uuid:job_id>/retry/"]
+        self.assertEqual(server["parentSpanId"], "b7ad6b7169203331")
+        producer = by_name["queue.enqueue_process_job"]
+        task = by_name["video_merge.process_merge_job"]
+        self.assertEqual(task["parentSpanId"], producer["spanId"])
+        self.assertEqual(by_name["repository.start_job"]["parentSpanId"], task["spanId"])
+        self.assertEqual(by_name["repository.mark_enqueued"]["kind"], SpanKind.INTERNAL)
+        self.assertEqual(MergeJob.objects.get(id=job.id).status, MergeJob.Status.COMPLETED)
+
+    def test_task_publish_hook_injects_current_span_as_header(self) -> None:
+        headers: dict[str, str] = {}
+
+        with start_span("yayinla") as span:
+            inject_trace_context(headers=headers)
+
+        self.assertEqual(headers["traceparent"], span.context.traceparent)
+        self.assertEqual(parse_traceparent(headers["traceparent"]), span.context)
+
+    def test_delayed_channel_send_joins_the_publishing_trace(self) -> None:
+        layer = RecordingChannelLayer()
+        publisher = CoalescingEventPublisher(flush_interval_seconds=60, channel_layer=layer)
+
+        with start_span("durum") as span:
+            publisher.publish("g", uuid4(), {"type": "job.status.event", "payload": {}})
+        publisher.flush()
+        publisher.close()
+
+        send = next(item for item in self._spans() if item["name"] == "channel.group_send")
+        self.assertEqual((send["traceId"], send["parentSpanId"]), (span.context.trace_id, span.context.span_id))
+
+    def test_failed_ffmpeg_run_is_an_error_span(self) -> None:
+        returncode, _summary = run_ffmpeg([sys.executable, "-c", "import sys; sys.exit(3)"])
+
+        span = next(item for item in self._spans() if item["name"] == "ffmpeg")
+        self.assertEqual(returncode, 3)
+        self.assertEqual(span["status"]["code"], 2)
+        self.assertIn({"key": "process.exit_code", "value": {"intValue": "3"}}, span["attributes"])
+
+
+class MultipartUploadLimitTests(TestCase):
+    def _scope(self, content_length: int | None) -> dict:
+        headers = [(b"content-type", b"multipart/form-data; boundary=x")]
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode()))
+        return {"type": "http", "method": "POST", "path": reverse("video_merge:dashboard"), "headers": headers}
+
+    async def _call(self, app, scope: dict) -> list[dict]:
+        communicator = ApplicationCommunicator(app, scope)
+        await communicator.send_input({"type": "http.request", "body": b"", "more_body": False})
+        start = await communicator.receive_output(timeout=5)
+        body = await communicator.receive_output(timeout=5)
+        await communicator.wait(timeout=5)
+        return [start, body]
+
+    @override_settings(MULTIPART_UPLOAD_MAX_BYTES=1024)
+    async def test_asgi_application_rejects_oversized_multipart_before_reading_body(self) -> None:
+        from pars_vid_bir.asgi import application
+
+        start, body = await self._call(application, self._scope(4096))
+
+        self.assertEqual(start["status"], 413)
+        self.assertIn("parcali yukleme", body["body"].decode())
+
+    @override_settings(MULTIPART_UPLOAD_MAX_BYTES=1024)
+    async def test_multipart_without_content_length_is_rejected(self) -> None:
+        start, _ = await self._call(MultipartUploadLimit(self._unreachable_app), self._scope(None))
+
+        self.assertEqual(start["status"], 411)
+
+    @override_settings(MULTIPART_UPLOAD_MAX_BYTES=1024)
+    async def test_multipart_within_limit_reaches_django(self) -> None:
+        seen: list[dict] = []
+
+        async def inner(scope, receive, send) -> None:
+            seen.append(scope)
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        start, _ = await self._call(MultipartUploadLimit(inner), self._scope(512))
+
+        self.assertEqual(start["status"], 200)
+        self.assertEqual(len(seen), 1)
+
+    async def _unreachable_app(self, scope, receive, send) -> None:
+        raise AssertionError("Limit asilan istek Django'ya ulasmamali.")
+
+
+class ResumableUploadTests(TestCase):
+    def setUp(self) -> None:
+        self._temp_media_root = tempfile.mkdtemp(prefix="video-merge-tests-")
+        self._override = override_settings(MEDIA_ROOT=self._temp_media_root)
+        self._override.enable()
+        self.user = get_user_model().objects.create_user(username="upload-user", password="secret123")
+        self.client.login(username="upload-user", password="secret123")
+
+    def tearDown(self) -> None:
+        self._override.disable()
+        shutil.rmtree(self._temp_media_root, ignore_errors=True)
+
+    def _metadata(self, **values: str) -> str:
+        return ",".join(f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in values.items())
+
+    def test_chunked_upload_resumes_and_finalizes_job(self) -> None:
+        job_response = self.client.post(reverse("video_merge:upload_job_create"), data={"name": "Parcali"})
+        self.assertEqual(job_response.status_code, 201)
+        job_id = job_response.json()["job_id"]
+
+        create_response = self.client.post(
+            reverse("video_merge:upload_create"),
+            HTTP_UPLOAD_LENGTH="10",
+            HTTP_UPLOAD_METADATA=self._metadata(job_id=job_id, order="1", filename="cam 1.ts"),
+        )
+        self.assertEqual(create_response.status_code, 201)
+        upload_url = create_response["Location"]
+
+        first = self.client.generic(
+            "PATCH",
+            upload_url,
+            b"01234",
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET="0",
+        )
+        self.assertEqual(first.status_code, 204)
+        stale = self.client.generic(
+            "PATCH",
+            upload_url,
+            b"01234",
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET="0",
+        )
+        self.assertEqual(stale.status_code, 409)
+        self.assertEqual(self.client.head(upload_url)["Upload-Offset"], "5")
+
+        early = self.client.post(reverse("video_merge:upload_job_finalize", kwargs={"job_id": job_id}))
+        self.assertEqual(early.status_code, 400)
+
+        last = self.client.generic(
+            "PATCH",
+            upload_url,
+            b"56789",
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET="5",
+        )
+        self.assertEqual(last["Upload-Offset"], "10")
+
+        clip = MergeClip.objects.get(job_id=job_id)
+        self.assertTrue(clip.file.name.endswith("clips/0001_cam_1.ts"))
+        self.assertEqual(Path(clip.file.path).read_bytes(), b"0123456789")
+        self.assertIsNotNone(clip.blob_id)
+
+        with patch("video_merge.tasks.process_merge_job_task.apply_async", return_value=SimpleNamespace(id="task-3")):
+            finalized = self.client.post(reverse("video_merge:upload_job_finalize", kwargs={"job_id": job_id}))
+
+        self.assertEqual(finalized.status_code, 200)
+        self.assertEqual(finalized.json()["task_id"], "task-3")
+
+    def test_second_patch_at_same_offset_is_refused_while_first_is_writing(self) -> None:
+        store = DjangoClipUploadStore()
+        job = MergeJob.objects.create(owner=self.user, name="Yaris")
+        upload = store.create_upload(job.id, order=1, original_name="cam.ts", length=10)
+        rejected = []
+
+        def first_request_chunks():
+            yield b"01234"
+            try:
+                store.write_chunk(upload.id, 0, iter([b"abcde"]))
+            except UploadOffsetMismatchError:
+                rejected.append(True)
+
+        result = store.write_chunk(upload.id, 0, first_request_chunks())
+
+        self.assertEqual(rejected, [True])
+        self.assertEqual(result.offset, 5)
+        self.assertEqual(ClipUpload.objects.get(id=upload.id).write_token, "")
+        stored = Path(self._temp_media_root) / (ClipUpload.objects.get(id=upload.id).file_name + ".part")
+        self.assertEqual(stored.read_bytes()[:5], b"01234")
+
+    def test_sweep_removes_idle_unfinished_uploads(self) -> None:
+        store = DjangoClipUploadStore()
+        job = MergeJob.objects.create(owner=self.user, name="Terk")
+        idle = store.create_upload(job.id, order=1, original_name="idle.ts", length=10)
+        fresh = store.create_upload(job.id, order=2, original_name="fresh.ts", length=10)
+        ClipUpload.objects.filter(id=idle.id).update(last_activity_at=timezone.now() - timedelta(days=2))
+        idle_part = Path(self._temp_media_root) / (ClipUpload.objects.get(id=idle.id).file_name + ".part")
+
+        removed = store.sweep_expired(timezone.now() - timedelta(days=1))
+
+        self.assertEqual(removed, 1)
+        self.assertFalse(ClipUpload.objects.filter(id=idle.id).exists())
+        self.assertFalse(idle_part.exists())
+        self.assertTrue(ClipUpload.objects.filter(id=fresh.id).exists())
+
+
+class JobOutputDownloadTests(TestCase):
+    def setUp(self) -> None:
+        self._temp_media_root = tempfile.mkdtemp(prefix="video-merge-tests-")
+        self._override = override_settings(MEDIA_ROOT=self._temp_media_root)
+        self._override.enable()
+        self.user = get_user_model().objects.create_user(username="download-user", password="secret123")
+        # The view streams an async iterator, which only the async client can consume.
+        self.async_client.login(username="download-user", password="secret123")
+        output_name = "merged_outputs/user_1/output.mp4"
+        output_path = Path(self._temp_media_root) / output_name
+        output_path.parent.mkdir(parents=True)
+        output_path.write_bytes(b"0123456789")
+        self.job = MergeJob.objects.create(
+            owner=self.user,
+            name="Indir",
+            status=MergeJob.Status.COMPLETED,
+            output_file=output_name,
+        )
+        self.url = reverse("video_merge:job_download", kwargs={"job_id": self.job.id})
+
+    def tearDown(self) -> None:
+        self._override.disable()
+        shutil.rmtree(self._temp_media_root, ignore_errors=True)
+
+    @staticmethod
+    async def _body(response) -> bytes:
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    async def test_streams_whole_file_asynchronously(self) -> None:
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        self.assertEqual(await self._body(response), b"0123456789")
+        self.assertEqual(response["Content-Length"], "10")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="Indir.mp4"')
+
+    async def test_serves_partial_content_for_range_request(self) -> None:
+        response = await self.async_client.get(self.url, headers={"Range": "bytes=2-5"})
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(await self._body(response), b"2345")
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(response["Content-Length"], "4")
+
+    async def test_stale_if_range_returns_full_file(self) -> None:
+        etag = (await self.async_client.get(self.url))["ETag"]
+
+        matching = await self.async_client.get(self.url, headers={"Range": "bytes=-3", "If-Range": etag})
+        stale = await self.async_client.get(self.url, headers={"Range": "bytes=-3", "If-Range": '"other"'})
+
+        self.assertEqual(await self._body(matching), b"789")
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(await self._body(stale), b"0123456789")
+
+    async def test_foreign_job_is_not_found(self) -> None:
+        other = await get_user_model().objects.acreate_user(username="other-download-user", password="secret123")
+        await self.async_client.aforce_login(other)
+
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+
+    async def test_unsatisfiable_range(self) -> None:
+        response = await self.async_client.get(self.url, headers={"Range": "bytes=50-"})
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+
+    @override_settings(DOWNLOAD_OFFLOAD_MODE="x-accel-redirect", DOWNLOAD_ACCEL_REDIRECT_PREFIX="/protected-media/")
+    async def test_offloads_transfer_to_proxy(self) -> None:
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/merged_outputs/user_1/output.mp4")
+        self.assertEqual(response.content, b"")
@@ -1,11 +1,20 @@
 from django.urls import path
 
 from video_merge.presentation.views import (
+    AppendClipsView,
+    ClipUploadCreateView,
+    ClipUploadView,
     DashboardView,
+    JobBatchCreateView,
     JobDetailView,
+    JobHlsFileView,
     JobOutputDownloadView,
+    JobStreamView,
+    MetricsView,
     RetryJobView,
     SignUpView,
+    UploadJobCreateView,
+    UploadJobFinalizeView,
 )
 
 app_name = "video_merge"
@@ -13,7 +22,20 @@ app_name = "video_merge"
 urlpatterns = [
     path("", DashboardView.as_view(), name="dashboard"),
     path("signup/", SignUpView.as_view(), name="signup"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
     path("jobs/<uuid:job_id>/", JobDetailView.as_view(), name="job_detail"),
     path("jobs/<uuid:job_id>/download/", JobOutputDownloadView.as_view(), name="job_download"),
+    path("jobs/<uuid:job_id>/stream/", JobStreamView.as_view(), name="job_stream"),
+    path("jobs/<uuid:job_id>/hls/<str:file_name>", JobHlsFileView.as_view(), name="job_hls_file"),
     path("jobs/<uuid:job_id>/retry/", RetryJobView.as_view(), name="job_retry"),
+    path("jobs/<uuid:job_id>/append/", AppendClipsView.as_view(), name="job_append"),
+    path("api/jobs/batch/", JobBatchCreateView.as_view(), name="job_batch_create"),
+    path("uploads/jobs/", UploadJobCreateView.as_view(), name="upload_job_create"),
+    path(
+        "uploads/jobs/<uuid:job_id>/finalize/",
+        UploadJobFinalizeView.as_view(),
+        name="upload_job_finalize",
+    ),
+    path("uploads/", ClipUploadCreateView.as_view(), name="upload_create"),
+    path("uploads/<uuid:upload_id>/", ClipUploadView.as_view(), name="upload_detail"),
 ]
@@ -1,7 +1,16 @@
 from video_merge.presentation.views import (  # noqa: F401
+    AppendClipsView,
+    ClipUploadCreateView,
+    ClipUploadView,
     DashboardView,
+    JobBatchCreateView,
     JobDetailView,
+    JobHlsFileView,
     JobOutputDownloadView,
+    JobStreamView,
+    MetricsView,
     RetryJobView,
     SignUpView,
+    UploadJobCreateView,
+    UploadJobFinalizeView,
 )